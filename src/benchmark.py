@@ -0,0 +1,468 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+from collections.abc import Callable
+
+# Benchmarks run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+from tileset import Tileset
+from board import Board
+from grid import Grid, Renderer
+from camera import Camera
+from utility import calculate_neighbors, count_all_neighbors
+
+# Grid sizes to compare, from a default game up to very large boards
+NEIGHBOR_COUNT_SIZES = [(100, 100), (1000, 1000), (4000, 4000)]
+BOMB_DENSITY = 0.15
+SEED = 0xABCDEF1234
+CLICK_SEED = (
+    SEED + 1
+)  # must differ from SEED, or the clicks land on the same cells the bombs were placed on
+
+# Rendering, 16x16 tiles so that large numbers of tiles fit in view
+TILE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "assets", "asperite_files", "basic-tileset.png"
+)
+RENDER_TILE_SIZE = (16, 16)
+RENDER_GRID_SIZE = (400, 400)
+RENDER_VIEW_SIZES = [(96, 96), (480, 480), (1600, 1600), (3200, 3200)]
+RENDER_FRAMES = 50
+
+# Suite, every benchmark runs across each grid size and bomb density
+SUITE_GRID_SIZES = [(6, 6), (100, 100), (1000, 1000), (4000, 4000)]
+SUITE_DENSITIES = {"sparse": 0.01, "normal": 0.15, "dense": 0.5}
+SUITE_MIN_SECONDS = (
+    0.2  # each benchmark repeats until it has run for at least this long
+)
+SUITE_MAX_REPEATS = 1000
+SUITE_CLICKS = 1000  # clicks per repeat of the click benchmarks
+SUITE_VIEW_SIZE = (800, 800)
+SUITE_TILE_SCALE = 4
+REGRESSION_THRESHOLD = 1.25  # slower than the baseline by this factor is a regression
+
+
+def random_bomb_mask(
+    grid_size: tuple[int, int], density: float, rng: random.Random
+) -> bytearray:
+    """
+    Creates a flat bomb mask, with roughly `density` of the cells having a bomb.
+    """
+
+    grid_cols, grid_rows = grid_size
+    num_cells = grid_cols * grid_rows
+    bombs = bytearray(num_cells)
+    for index in rng.sample(range(num_cells), int(num_cells * density)):
+        bombs[index] = 1
+
+    return bombs
+
+
+def count_neighbors_per_tile(
+    bombs: bytearray, grid_cols: int, grid_rows: int
+) -> bytearray:
+    """
+    Counts the neighbors of every tile by calling `calculate_neighbors` once per tile.
+    """
+
+    neighbors = bytearray(grid_cols * grid_rows)
+    for row in range(grid_rows):
+        for col in range(grid_cols):
+            neighbors[row * grid_cols + col] = calculate_neighbors(
+                (col, row), grid_cols, grid_rows, bombs
+            )
+
+    return neighbors
+
+
+def compare_neighbor_counting(sizes: list[tuple[int, int]]):
+    """
+    Times counting the neighbors of every tile, per tile and batched, and checks that both give the same counts.
+    """
+
+    rng = random.Random(SEED)
+    for grid_size in sizes:
+        grid_cols, grid_rows = grid_size
+        bombs = random_bomb_mask(grid_size, BOMB_DENSITY, rng)
+
+        start = time.perf_counter()
+        per_tile = count_neighbors_per_tile(bombs, grid_cols, grid_rows)
+        per_tile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = count_all_neighbors(bombs, grid_cols, grid_rows)
+        batched_time = time.perf_counter() - start
+
+        if per_tile != batched:
+            raise ValueError(f"Neighbor counts differ for grid of {grid_size}")
+
+        print(
+            f"{grid_cols}x{grid_rows}: per tile {per_tile_time:.4f}s, batched {batched_time:.4f}s "
+            f"({per_tile_time / batched_time:.0f}x)"
+        )
+
+
+def compare_renderers(view_sizes: list[tuple[int, int]]):
+    """
+    Times drawing a full frame with each renderer, for an increasing number of tiles within view.
+    """
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+    tileset = Tileset(TILE_PATH, RENDER_TILE_SIZE, 1)
+
+    for view_size in view_sizes:
+        screen = pg.Surface(view_size)
+        for renderer in Renderer:
+            grid = Grid(
+                tileset,
+                RENDER_TILE_SIZE,
+                screen,
+                int(RENDER_GRID_SIZE[0] * RENDER_GRID_SIZE[1] * BOMB_DENSITY),
+                random.Random(SEED),
+                None,
+                RENDER_GRID_SIZE,
+                (0, 0),
+                renderer=renderer,
+            )
+            camera = Camera(view_size, grid.world_rect())
+
+            # Reveal some of the board, so the frame is a mix of tile types
+            reveal_rng = random.Random(CLICK_SEED)
+            for _ in range(200):
+                grid.reveal_click(
+                    (
+                        reveal_rng.randrange(RENDER_GRID_SIZE[0]),
+                        reveal_rng.randrange(RENDER_GRID_SIZE[1]),
+                    )
+                )
+
+            # First frame creates the sprites, so is not timed
+            grid.draw(screen, camera)
+
+            start = time.perf_counter()
+            for _ in range(RENDER_FRAMES):
+                grid.draw(screen, camera)
+            frame_time = (time.perf_counter() - start) / RENDER_FRAMES
+
+            visible_cols, visible_rows = camera.visible_tile_range(
+                (0, 0), RENDER_TILE_SIZE, RENDER_GRID_SIZE
+            )
+            print(
+                f"{len(visible_cols) * len(visible_rows)} tiles, {renderer.value}: "
+                f"{frame_time * 1000:.3f}ms per frame"
+            )
+
+    pg.quit()
+
+
+def repeat_timed(
+    setup: Callable[[], object], timed: Callable[[object], object]
+) -> tuple[float, int, object]:
+    """
+    Call `setup` then time `timed` with its result, repeating until enough time has passed to give a stable result.
+    The time spent in `setup` counts towards that, so large grids with slow setups are not repeated many times.
+
+    Returns the fastest time of a single repeat, the number of repeats, and what the last `timed` call returned.
+    """
+
+    best_time = float("inf")
+    began_at = time.perf_counter()
+    repeats = 0
+    result = None
+    while (
+        time.perf_counter() - began_at < SUITE_MIN_SECONDS
+        and repeats < SUITE_MAX_REPEATS
+    ):
+        state = setup()
+
+        start = time.perf_counter()
+        result = timed(state)
+        elapsed = time.perf_counter() - start
+
+        best_time = min(best_time, elapsed)
+        repeats += 1
+
+    return best_time, repeats, result
+
+
+def bench_generation(grid_size: tuple[int, int], num_of_bombs: int) -> dict:
+    """
+    Time creating a board, which places the bombs and counts the neighbors of every cell.
+    """
+
+    seconds, repeats, _ = repeat_timed(
+        lambda: random.Random(SEED),
+        lambda rng: Board(grid_size, num_of_bombs, rng),
+    )
+    return {"seconds": seconds, "repeats": repeats}
+
+
+def bench_reveal_flood(grid_size: tuple[int, int], num_of_bombs: int) -> dict:
+    """
+    Time revealing the first empty cell of a board, which floods the region around it.
+    """
+
+    def setup() -> tuple[Board, tuple[int, int] | None]:
+        board = Board(grid_size, num_of_bombs, random.Random(SEED))
+        first_empty = next(
+            (
+                index
+                for index in range(board.num_cells)
+                if board.neighbors[index] == 0 and not board.bombs[index]
+            ),
+            None,
+        )
+        if first_empty is None:
+            return board, None
+        return board, board.col_row(first_empty)
+
+    def timed(state: tuple[Board, tuple[int, int] | None]) -> int:
+        board, col_row = state
+        if col_row is None:
+            return 0
+        board.reveal_click(col_row)
+        return len(board.last_changed)
+
+    seconds, repeats, cells_revealed = repeat_timed(setup, timed)
+    return {"seconds": seconds, "repeats": repeats, "cells_revealed": cells_revealed}
+
+
+def bench_reveal_clicks(grid_size: tuple[int, int], num_of_bombs: int) -> dict:
+    """
+    Time revealing many random cells without bombs, one click at a time.
+    """
+
+    def setup() -> tuple[Board, list[tuple[int, int]]]:
+        board = Board(grid_size, num_of_bombs, random.Random(SEED))
+        click_rng = random.Random(CLICK_SEED)
+        safe_cells = [
+            board.col_row(index)
+            for index in (
+                click_rng.randrange(board.num_cells) for _ in range(SUITE_CLICKS)
+            )
+            if not board.bombs[index]
+        ]
+        return board, safe_cells
+
+    def timed(state: tuple[Board, list[tuple[int, int]]]) -> int:
+        board, safe_cells = state
+        for col_row in safe_cells:
+            board.reveal_click(col_row)
+        return len(safe_cells)
+
+    seconds, repeats, clicks = repeat_timed(setup, timed)
+    return {
+        "seconds": seconds,
+        "repeats": repeats,
+        "clicks": clicks,
+        "seconds_per_click": seconds / clicks if clicks else 0.0,
+    }
+
+
+def bench_flag_storm(grid_size: tuple[int, int], num_of_bombs: int) -> dict:
+    """
+    Time many flag clicks on random cells, cycling the flags through every state.
+    """
+
+    def setup() -> tuple[Board, list[tuple[int, int]]]:
+        board = Board(grid_size, num_of_bombs, random.Random(SEED))
+        click_rng = random.Random(CLICK_SEED)
+        cells = [
+            board.col_row(click_rng.randrange(board.num_cells))
+            for _ in range(SUITE_CLICKS)
+        ]
+        return board, cells
+
+    def timed(state: tuple[Board, list[tuple[int, int]]]) -> int:
+        board, cells = state
+        for col_row in cells:
+            board.flag_click(col_row)
+        return len(cells)
+
+    seconds, repeats, clicks = repeat_timed(setup, timed)
+    return {
+        "seconds": seconds,
+        "repeats": repeats,
+        "clicks": clicks,
+        "seconds_per_click": seconds / clicks,
+    }
+
+
+def bench_render(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    tileset: Tileset,
+    renderer: Renderer,
+) -> dict:
+    """
+    Time drawing a full frame of the window, with part of the board revealed.
+    """
+
+    screen = pg.Surface(SUITE_VIEW_SIZE)
+    tile_render_size = (
+        RENDER_TILE_SIZE[0] * SUITE_TILE_SCALE,
+        RENDER_TILE_SIZE[1] * SUITE_TILE_SCALE,
+    )
+    grid = Grid(
+        tileset,
+        tile_render_size,
+        screen,
+        num_of_bombs,
+        random.Random(SEED),
+        None,
+        grid_size,
+        (0, 0),
+        renderer=renderer,
+    )
+    camera = Camera(SUITE_VIEW_SIZE, grid.world_rect())
+
+    click_rng = random.Random(CLICK_SEED)
+    for _ in range(SUITE_CLICKS):
+        col_row = (click_rng.randrange(grid_size[0]), click_rng.randrange(grid_size[1]))
+        if not grid.board.has_bomb(col_row):
+            grid.reveal_click(col_row)
+
+    # First frame creates the sprites, so is not timed
+    grid.draw(screen, camera)
+
+    seconds, repeats, _ = repeat_timed(
+        lambda: None, lambda _: grid.draw(screen, camera)
+    )
+    return {"seconds": seconds, "repeats": repeats}
+
+
+def run_suite(grid_sizes: list[tuple[int, int]], densities: dict[str, float]) -> dict:
+    """
+    Run every benchmark across each grid size and bomb density, printing each result as it finishes.
+
+    Returns the results in a form that can be written to JSON.
+    """
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+    tileset = Tileset(TILE_PATH, RENDER_TILE_SIZE, SUITE_TILE_SCALE)
+
+    results = []
+    for grid_size in grid_sizes:
+        for density_name, density in densities.items():
+            num_cells = grid_size[0] * grid_size[1]
+            num_of_bombs = max(1, int(num_cells * density))
+
+            benchmarks: dict[str, Callable[[], dict]] = {
+                "generation": lambda: bench_generation(grid_size, num_of_bombs),
+                "reveal_flood": lambda: bench_reveal_flood(grid_size, num_of_bombs),
+                "reveal_clicks": lambda: bench_reveal_clicks(grid_size, num_of_bombs),
+                "flag_storm": lambda: bench_flag_storm(grid_size, num_of_bombs),
+            }
+            for renderer in Renderer:
+                benchmarks[f"render_{renderer.value}"] = (
+                    lambda renderer=renderer: bench_render(
+                        grid_size, num_of_bombs, tileset, renderer
+                    )
+                )
+
+            for name, benchmark in benchmarks.items():
+                result = {
+                    "benchmark": name,
+                    "grid_size": list(grid_size),
+                    "density": density_name,
+                    "bombs": num_of_bombs,
+                    **benchmark(),
+                }
+                results.append(result)
+                print(
+                    f"{name:>14} {grid_size[0]}x{grid_size[1]} {density_name:>6}: "
+                    f"{result['seconds'] * 1000:.3f}ms"
+                )
+
+    pg.quit()
+
+    return {
+        "python": platform.python_version(),
+        "pygame": pg.version.ver,
+        "platform": platform.platform(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+def compare_to_baseline(suite: dict, baseline: dict) -> bool:
+    """
+    Compare a suite run to an earlier one, printing how much slower or faster each benchmark was.
+
+    Returns whether any benchmark was slower than the baseline by more than the regression threshold.
+    """
+
+    def key(result: dict) -> tuple:
+        return (result["benchmark"], tuple(result["grid_size"]), result["density"])
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+
+    found_regression = False
+    for result in suite["results"]:
+        baseline_result = baseline_results.get(key(result))
+        if baseline_result is None or baseline_result["seconds"] == 0:
+            continue
+
+        ratio = result["seconds"] / baseline_result["seconds"]
+        is_regression = ratio > REGRESSION_THRESHOLD
+        found_regression = found_regression or is_regression
+        print(
+            f"{'REGRESSION' if is_regression else '':>10} {result['benchmark']:>14} "
+            f"{result['grid_size'][0]}x{result['grid_size'][1]} {result['density']:>6}: {ratio:.2f}x"
+        )
+
+    return found_regression
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bomb Finder benchmarks")
+    parser.add_argument(
+        "benchmark",
+        choices=["neighbors", "render", "suite"],
+        help="neighbors: per tile vs batched neighbor counting, render: frame time of each renderer, "
+        "suite: generation, reveal, flag and render benchmarks across grid sizes and densities",
+    )
+    parser.add_argument(
+        "--max-size",
+        type=int,
+        default=None,
+        help="suite: skip grid sizes with more columns or rows than this",
+    )
+    parser.add_argument(
+        "--output", default=None, help="suite: write the results to this JSON file"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="suite: compare to the results of an earlier run, exiting with 1 on a regression",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark == "neighbors":
+        compare_neighbor_counting(NEIGHBOR_COUNT_SIZES)
+    elif args.benchmark == "render":
+        compare_renderers(RENDER_VIEW_SIZES)
+    elif args.benchmark == "suite":
+        grid_sizes = [
+            grid_size
+            for grid_size in SUITE_GRID_SIZES
+            if args.max_size is None or max(grid_size) <= args.max_size
+        ]
+        suite = run_suite(grid_sizes, SUITE_DENSITIES)
+
+        if args.output is not None:
+            with open(args.output, "w") as output_file:
+                json.dump(suite, output_file, indent=2)
+
+        if args.baseline is not None:
+            with open(args.baseline) as baseline_file:
+                baseline = json.load(baseline_file)
+            if compare_to_baseline(suite, baseline):
+                sys.exit(1)
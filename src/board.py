@@ -0,0 +1,758 @@
+import re
+import time
+import random
+from enum import Enum
+from collections.abc import Callable, Sequence
+from tile_type import TileType
+from utility import count_all_neighbors
+
+# Flag states stored per cell in `Board.flags`
+NO_FLAG = 0
+CERTAIN_FLAG = 1
+UNCERTAIN_FLAG = 2
+
+# Runs of zero bytes, such as the cells of a row not yet revealed or without neighboring bombs
+ZERO_RUNS = re.compile(rb"\x00+")
+# TileType value of a revealed cell from its neighbor count, an empty tile is CLICKED_EMPTY (1) and every number follows
+REVEALED_TILE_TYPES = bytes(min(value + 1, 255) for value in range(256))
+
+
+def restored_cell_tables() -> tuple[bytes, bytes]:
+    """
+    Lookup tables from a restored cell key, `neighbors + 9 * revealed + 18 * bomb + 36 * flag`, to the TileType value
+    of the cell, and to whether a flood has spread out from it.
+    """
+
+    flag_tiles = (
+        TileType.UNCLICKED.value,
+        TileType.UNCLICKED_CERTAIN.value,
+        TileType.UNCLICKED_UNCERTAIN.value,
+    )
+    tile_types, flooded = bytearray(256), bytearray(256)
+    for key in range(3 * 36):
+        flag, rest = divmod(key, 36)
+        bomb, rest = divmod(rest, 18)
+        revealed, neighbors = divmod(rest, 9)
+
+        if not revealed:
+            tile_types[key] = flag_tiles[flag]
+        elif bomb:
+            tile_types[key] = TileType.BOMB_A.value
+        else:
+            tile_types[key] = neighbors + 1
+            flooded[key] = neighbors == 0
+
+    return bytes(tile_types), bytes(flooded)
+
+
+RESTORED_TILE_TYPES, RESTORED_FLOODED = restored_cell_tables()
+
+# Cells combined into keys at a time when restoring, which bounds the memory the keys take on large boards
+RESTORE_CHUNK_CELLS = 512 * 1024
+
+
+class PlacementMode(Enum):
+    # Samples exactly the number of bombs from the cells, with no retries
+    SAMPLE = "sample"
+    # Original placement, draws random cells and retries on collisions. Reproduces boards from older seeds.
+    LEGACY = "legacy"
+
+
+class FirstClickMode(Enum):
+    # Bombs are placed up front, the first click can hit a bomb
+    NONE = "none"
+    # Bombs are placed on the first reveal, away from the clicked cell and the cells around it
+    DEFER = "defer"
+    # Bombs are placed up front, then moved out from around the first reveal
+    RELOCATE = "relocate"
+
+
+class Action(Enum):
+    # Actions a player can take on the board
+    REVEAL = 0
+    FLAG = 1
+
+
+class Board:
+    """
+    Board holds all of the game state for a grid, and performs the game logic against it.
+
+    The state is stored in flat `bytearray`s with one byte per cell, indexed as `row * cols + col`, rather
+    than on a Python object per tile. Board does not import pygame, so it can be used headless; the Grid
+    class is a view over a Board that handles rendering.
+    """
+
+    def __init__(
+        self,
+        grid_size: tuple[int, int],
+        num_of_bombs: int,
+        rng: random.Random,
+        debug_mode: bool = False,
+        placement: PlacementMode = PlacementMode.SAMPLE,
+        first_click: FirstClickMode = FirstClickMode.NONE,
+        progress: Callable[[str], None] | None = None,
+    ):
+        """
+        `progress` is called with the step of generation the board is on, such as to show it while generating on
+        another thread.
+        """
+
+        if debug_mode:
+            print("DEBUG: Creating instance of Board")
+
+        self.__setup(grid_size, num_of_bombs, rng, debug_mode, placement)
+        self.__first_click_mode = first_click
+        self.__safe_click_pending = first_click != FirstClickMode.NONE
+
+        # Initialization methods, deferred boards are generated on the first reveal instead
+        if first_click != FirstClickMode.DEFER:
+            if progress is not None:
+                progress("Placing bombs")
+            self.__place_bombs()
+            if progress is not None:
+                progress("Counting neighbors")
+            self.__count_bombs()
+
+    @classmethod
+    def restore(
+        cls,
+        grid_size: tuple[int, int],
+        num_of_bombs: int,
+        bombs: bytearray,
+        revealed: bytearray,
+        flags: bytearray,
+        neighbors: bytearray,
+        elapsed_time: float = 0.0,
+        debug_mode: bool = False,
+        first_click: FirstClickMode = FirstClickMode.NONE,
+        rng: random.Random | None = None,
+    ) -> "Board":
+        """
+        Create a board from saved cell state, rather than placing new bombs.
+
+        The rest of the state, such as the tiles to render and the tiles left to reveal, is worked out from the cells.
+        `elapsed_time` is how long the game had been played for, in seconds, so the timer carries on from it.
+        `first_click` is the `pending_first_click` of the saved board, a relocated first click moves bombs with `rng`.
+        """
+
+        if first_click == FirstClickMode.DEFER:
+            raise ValueError(
+                "A deferred board has no bombs to restore until the first reveal."
+            )
+        if first_click == FirstClickMode.RELOCATE and rng is None:
+            raise ValueError(
+                "Restoring a board with a first click to relocate needs an rng."
+            )
+
+        board = cls.__new__(cls)
+        board.__setup(
+            grid_size,
+            num_of_bombs,
+            rng,
+            debug_mode,
+            PlacementMode.SAMPLE,
+            (bombs, revealed, flags, neighbors),
+        )
+        board.__first_click_mode = first_click
+        board.__safe_click_pending = first_click != FirstClickMode.NONE
+
+        for name, cells in (
+            ("bombs", bombs),
+            ("revealed", revealed),
+            ("flags", flags),
+            ("neighbors", neighbors),
+        ):
+            if len(cells) != board.num_cells:
+                raise ValueError(
+                    f"Saved {name} has {len(cells)} cells, expected {board.num_cells}."
+                )
+        if bombs.count(1) != num_of_bombs:
+            raise ValueError(
+                f"Saved bombs has {bombs.count(1)} bombs, expected {num_of_bombs}."
+            )
+
+        board.bombs_placed = True
+        board.__restore_derived_state(elapsed_time)
+        return board
+
+    def __setup(
+        self,
+        grid_size: tuple[int, int],
+        num_of_bombs: int,
+        rng: random.Random | None,
+        debug_mode: bool,
+        placement: PlacementMode,
+        cells: tuple[bytearray, bytearray, bytearray, bytearray] | None = None,
+    ):
+        """
+        Set up the state of a board. `cells` are the bombs, revealed, flags and neighbors of a restored board, which
+        are used as they are, leaving the tiles to be worked out from them, rather than making empty cells.
+        """
+
+        # Properties
+        self.__num_of_bombs = num_of_bombs
+        self.__rng = rng
+        self.__debug_mode = debug_mode
+        self.__placement = placement
+
+        # Grid
+        self.grid_size = grid_size
+        self.cols, self.rows = grid_size
+        self.num_cells = self.cols * self.rows
+
+        if self.__num_of_bombs > self.num_cells:
+            raise ValueError(
+                f"Unable to place {self.__num_of_bombs} bombs in a grid of {self.num_cells} cells."
+            )
+
+        # Cell state
+        num_empty_cells = self.num_cells if cells is None else 0
+        if cells is None:
+            cells = tuple(bytearray(self.num_cells) for _ in range(4))
+        self.bombs, self.revealed, self.flags, self.neighbors = cells
+        self.bombs_placed: bool = False
+
+        # TileType value that each cell is rendered as, kept up to date so renderers can read it directly
+        self.tile_types = bytearray(num_empty_cells)
+
+        # Empty cells that a flood has already spread out from
+        self.__flooded = bytearray(num_empty_cells)
+
+        # Indexes of the cells changed by the last reveal or flag click, and the flag each had before it, which is
+        # empty if none of them had a flag
+        self.last_changed: list[int] = []
+        self.last_changed_flags = b""
+        self.__removed_flags: dict[int, int] = {}
+
+        # Win state
+        self.remaining_tiles_to_reveal = self.num_cells - self.__num_of_bombs
+        self.flags_remaining = self.__num_of_bombs
+        self.game_was_won: bool = False
+        self.game_was_lost: bool = False
+
+        # Game timer
+        self.__first_click_occured_at: float | None = None
+        self.__game_ended_at: float | None = None
+
+        self.__first_click_occured: bool = False
+
+    # == Public Methods ==
+    @property
+    def pending_first_click(self) -> FirstClickMode:
+        """
+        How the first reveal is still to be kept safe, or `FirstClickMode.NONE` once it has been made or if it is not.
+        """
+
+        if not self.__safe_click_pending:
+            return FirstClickMode.NONE
+
+        return self.__first_click_mode
+
+    def index(self, col_row: tuple[int, int]) -> int:
+        """
+        Converts a (col, row) coordinate into an index of the flat cell arrays.
+        """
+
+        col, row = col_row
+        return row * self.cols + col
+
+    def col_row(self, index: int) -> tuple[int, int]:
+        """
+        Converts an index of the flat cell arrays back into a (col, row) coordinate.
+        """
+
+        row, col = divmod(index, self.cols)
+        return (col, row)
+
+    def reveal_click(self, col_row_clicked: tuple[int, int]) -> bool:
+        """
+        Provided the column and row of the tile revealed, perform the reveal of the tile, flooding neighboring tiles if empty.
+
+        Returning `False` if the game is over due to revealing a bomb, or returning `True` if a bomb was **not** revealed
+        and the game can continue. The indexes of every cell that was revealed are stored in `self.last_changed`.
+        Once the game has been won or lost nothing is revealed.
+        """
+
+        self.last_changed = []
+        self.last_changed_flags = b""
+        if self.game_was_won or self.game_was_lost:
+            return not self.game_was_lost
+
+        if not self.__first_click_occured:
+            self.__first_click_occured = True
+            self.__first_click_occured_at = time.time()
+
+        index = self.index(col_row_clicked)
+        if self.flags[index] == CERTAIN_FLAG or self.revealed[index]:
+            # Unable to reveal due to flag blocking reveal
+            return True
+
+        if self.__safe_click_pending:
+            self.__make_first_reveal_safe(index)
+
+        if self.bombs[index]:
+            # Reveal the bomb and end the game
+            self.__reveal(index)
+            self.last_changed = [index]
+            self.__set_last_changed_flags()
+            self.__end_game(False)
+            return False
+
+        elif self.neighbors[index] == 0:
+            # Reveal many tiles
+            self.last_changed = self.__flood_tiles(index)
+
+        else:
+            # Reveal single tile
+            self.__reveal(index)
+            self.last_changed = [index]
+
+        self.__set_last_changed_flags()
+        self.remaining_tiles_to_reveal -= len(self.last_changed)
+
+        # Tile was revealed. Was it the last tile?
+        if self.remaining_tiles_to_reveal <= 0:
+            self.__end_game(True)
+
+        return True
+
+    def flag_click(self, col_row_clicked: tuple[int, int]):
+        """
+        Provided the column and row of the tile being flagged (or unflagged), cycle through the flag types on the tile.
+
+        Unflagged -> Certain Flag -> Uncertain Flag -> Unflagged, etc.
+        Once the game has ended, flags are left as they are.
+        """
+
+        index = self.index(col_row_clicked)
+        self.last_changed = []
+        self.last_changed_flags = b""
+        if self.revealed[index] or self.game_was_won or self.game_was_lost:
+            return
+
+        self.last_changed = [index]
+
+        flag = self.flags[index]
+        if flag != NO_FLAG:
+            self.last_changed_flags = bytes([flag])
+        if flag == NO_FLAG:
+            self.flags[index] = CERTAIN_FLAG
+            self.tile_types[index] = TileType.UNCLICKED_CERTAIN.value
+            self.flags_remaining -= 1
+
+        elif flag == CERTAIN_FLAG:
+            self.flags[index] = UNCERTAIN_FLAG
+            self.tile_types[index] = TileType.UNCLICKED_UNCERTAIN.value
+            self.flags_remaining += 1
+
+        else:
+            self.flags[index] = NO_FLAG
+            self.tile_types[index] = TileType.UNCLICKED.value
+
+    def revert_cells(
+        self,
+        indexes: Sequence[int],
+        flags: bytes,
+        remaining_tiles_to_reveal: int,
+        flags_remaining: int,
+    ):
+        """
+        Undo an action, by putting the cells it changed back to being unrevealed with the flags they had before it,
+        along with the counters from before it. `flags` holds the flag of each cell in order, or is empty if none of
+        them had a flag.
+
+        Every cell an action changes was unrevealed before it, so this is all it takes to undo any action, as long as
+        the actions after it were undone first. The cells are stored in `self.last_changed`.
+        """
+
+        flag_tiles = (
+            TileType.UNCLICKED.value,
+            TileType.UNCLICKED_CERTAIN.value,
+            TileType.UNCLICKED_UNCERTAIN.value,
+        )
+        revealed, cell_flags = self.revealed, self.flags
+        tile_types, flooded = self.tile_types, self.__flooded
+        for position, index in enumerate(indexes):
+            flag = flags[position] if flags else NO_FLAG
+            revealed[index] = 0
+            flooded[index] = 0
+            cell_flags[index] = flag
+            tile_types[index] = flag_tiles[flag]
+
+        self.remaining_tiles_to_reveal = remaining_tiles_to_reveal
+        self.flags_remaining = flags_remaining
+        self.last_changed = list(indexes)
+        self.last_changed_flags = b""
+
+        # Only the last action can have ended the game, so undoing any action carries the game on
+        if self.game_was_won or self.game_was_lost:
+            self.game_was_won = False
+            self.game_was_lost = False
+            self.__game_ended_at = None
+
+    def apply(self, action: Action, col_row: tuple[int, int]) -> bool:
+        """
+        Apply a player action to the tile at column and row.
+
+        Returning `False` if the game is over due to revealing a bomb, otherwise `True`.
+        """
+
+        if action == Action.REVEAL:
+            return self.reveal_click(col_row)
+
+        self.flag_click(col_row)
+        return True
+
+    def has_bomb(self, col_row: tuple[int, int]) -> bool:
+        return bool(self.bombs[self.index(col_row)])
+
+    def was_revealed(self, col_row: tuple[int, int]) -> bool:
+        return bool(self.revealed[self.index(col_row)])
+
+    def has_flag(self, col_row: tuple[int, int]) -> bool:
+        """
+        Whether the tile has a Certain Flag on it.
+        """
+
+        return self.flags[self.index(col_row)] == CERTAIN_FLAG
+
+    def flag_is_on_mine(self, col_row: tuple[int, int]) -> bool:
+        """
+        Whether the tile is correctly flagged or not.
+        """
+
+        index = self.index(col_row)
+        return self.flags[index] == CERTAIN_FLAG and bool(self.bombs[index])
+
+    def num_neighbors(self, col_row: tuple[int, int]) -> int:
+        return self.neighbors[self.index(col_row)]
+
+    def tile_type(self, col_row: tuple[int, int]) -> TileType:
+        """
+        The TileType that the tile at column and row should be rendered as.
+        """
+
+        return TileType(self.tile_types[self.index(col_row)])
+
+    def elapsed_time(self) -> float:
+        """
+        Seconds since the first click, stopping when the game ends.
+        """
+
+        if self.__first_click_occured_at is None:
+            return 0.0
+
+        if self.__game_ended_at is not None:
+            return self.__game_ended_at - self.__first_click_occured_at
+
+        return time.time() - self.__first_click_occured_at
+
+    # == Private Methods ==
+    def __reveal(self, index: int):
+        """
+        Reveal a single cell. Revealing a cell will remove any flags that were on it.
+        """
+
+        self.revealed[index] = 1
+        if self.flags[index]:
+            self.__remove_flag(index)
+
+        if self.bombs[index]:
+            # Only the first frame of the bomb, the explosion is animated by the grid
+            self.tile_types[index] = TileType.BOMB_A.value
+        else:
+            # An empty tile is CLICKED_EMPTY (1), and every number follows on from it
+            self.tile_types[index] = self.neighbors[index] + 1
+
+    def __remove_flag(self, index: int):
+        """
+        Remove the flag from a cell, giving back the flag if it was a Certain Flag.
+        """
+
+        if self.flags[index] == CERTAIN_FLAG:
+            self.flags_remaining += 1
+        self.__removed_flags[index] = self.flags[index]
+        self.flags[index] = NO_FLAG
+
+    def __set_last_changed_flags(self):
+        """
+        Store the flags removed by the last reveal against the cells it changed, in order, if it removed any.
+        """
+
+        removed_flags = self.__removed_flags
+        if removed_flags:
+            self.last_changed_flags = bytes(
+                removed_flags.get(index, NO_FLAG) for index in self.last_changed
+            )
+            self.__removed_flags = {}
+
+    def __place_bombs(self, excluded: list[int] | None = None):
+        """
+        Places bombs across the grid utilizing the provided `self.__rng` instance, shared across the entire game.
+        No bombs are placed in the `excluded` cells.
+        """
+
+        if self.__debug_mode:
+            print(
+                f"DEBUG: Placing {self.__num_of_bombs} bombs with {self.__placement.value} placement"
+            )
+
+        self.bombs_placed = True
+        excluded = sorted(excluded or [])
+        if self.__placement == PlacementMode.LEGACY:
+            self.__place_bombs_legacy(set(excluded))
+            return
+
+        # Picks distinct cells directly, so dense grids never need to retry a draw.
+        # When most cells have bombs, it is cheaper to pick the empty cells instead.
+        # The excluded cells are left out of the cells picked from, then put back in as empty cells.
+        num_open_cells = self.num_cells - len(excluded)
+        num_empty_cells = num_open_cells - self.__num_of_bombs
+        if self.__num_of_bombs <= num_empty_cells:
+            bombs = bytearray(num_open_cells)
+            for index in self.__rng.sample(range(num_open_cells), self.__num_of_bombs):
+                bombs[index] = 1
+        else:
+            bombs = bytearray(b"\x01") * num_open_cells
+            for index in self.__rng.sample(range(num_open_cells), num_empty_cells):
+                bombs[index] = 0
+
+        for index in excluded:
+            bombs[index:index] = b"\x00"
+        self.bombs = bombs
+
+    def __place_bombs_legacy(self, excluded: set[int]):
+        """
+        Places bombs by drawing a random column and row, retrying if the cell already has a bomb.
+
+        The number of draws grows quickly on dense grids, but it is kept so that older seeds create the same boards.
+        """
+
+        placed_bombs = 0
+        while placed_bombs < self.__num_of_bombs:
+            # should never calculate outside of grid
+            bomb_col, bomb_row = (
+                self.__rng.randint(0, self.cols - 1),
+                self.__rng.randint(0, self.rows - 1),
+            )
+
+            index = self.index((bomb_col, bomb_row))
+            if not self.bombs[index] and index not in excluded:
+                self.bombs[index] = 1
+                placed_bombs += 1
+
+    def __make_first_reveal_safe(self, index: int):
+        """
+        Keep bombs out of the first cell revealed and the cells around it, by placing the bombs now if they were
+        deferred, or by moving the bombs that are there.
+
+        If the board is too full of bombs to keep all of those cells clear, only the revealed cell is kept clear.
+        """
+
+        self.__safe_click_pending = False
+
+        row, col = divmod(index, self.cols)
+        safe_area = [
+            check_row * self.cols + check_col
+            for check_row in range(max(row - 1, 0), min(row + 2, self.rows))
+            for check_col in range(max(col - 1, 0), min(col + 2, self.cols))
+        ]
+        if self.__num_of_bombs > self.num_cells - len(safe_area):
+            safe_area = [index] if self.__num_of_bombs < self.num_cells else []
+
+        if self.__first_click_mode == FirstClickMode.DEFER:
+            self.__place_bombs(safe_area)
+            self.__count_bombs()
+        else:
+            self.__relocate_bombs(safe_area)
+
+    def __relocate_bombs(self, safe_area: list[int]):
+        """
+        Move every bomb in the safe area to a random cell outside of it, updating only the neighbor counts around
+        the cells that changed, rather than counting the whole board again.
+        """
+
+        safe_cells = set(safe_area)
+        for index in safe_area:
+            if not self.bombs[index]:
+                continue
+
+            while True:
+                new_index = self.__rng.randrange(self.num_cells)
+                if not self.bombs[new_index] and new_index not in safe_cells:
+                    break
+
+            self.bombs[index] = 0
+            self.bombs[new_index] = 1
+            self.__change_neighbor_counts(index, -1)
+            self.__change_neighbor_counts(new_index, 1)
+
+    def __change_neighbor_counts(self, index: int, change: int):
+        """
+        Add the change to the neighbor counts of every cell around a cell, after a bomb was added to or removed from it.
+        """
+
+        row, col = divmod(index, self.cols)
+        for check_row in range(max(row - 1, 0), min(row + 2, self.rows)):
+            for check_col in range(max(col - 1, 0), min(col + 2, self.cols)):
+                if check_row != row or check_col != col:
+                    self.neighbors[check_row * self.cols + check_col] += change
+
+    def __count_bombs(self):
+        """
+        Count the neighboring bombs of every cell in the grid, in one pass over the bomb mask.
+        """
+
+        self.neighbors = count_all_neighbors(self.bombs, self.cols, self.rows)
+
+    def __flood_tiles(self, first_index: int) -> list[int]:
+        """
+        Starting at the first cell, that will not have any neighbors, this algorithm will reveal the connected empty
+        cells, and every cell neighboring them.
+
+        The flood works a row at a time. Each empty cell taken off the stack is stretched left and right into a span
+        of empty cells, then the span and the rows above and below it are revealed. Empty cells found in those rows
+        are pushed as new spans. `self.__flooded` marks the spans already spread from, so every cell is looked at a
+        fixed number of times, no matter how large the region is.
+
+        Rows are revealed a run of cells at a time, with slice assignments, and only the edges of the runs are looked
+        at in Python. A run of empty cells is either flooded as a whole or not at all, since a span always stretches
+        across the whole run, so only the first cell of a run is checked.
+
+        Return the indexes of the cells that were revealed
+        """
+
+        cols, rows = self.cols, self.rows
+        neighbors, revealed, flags = self.neighbors, self.revealed, self.flags
+        tile_types, flooded = self.tile_types, self.__flooded
+        revealed_cells: list[int] = []
+
+        to_visit_list: list[int] = [first_index]
+        while to_visit_list:
+            index = to_visit_list.pop()
+            if flooded[index]:
+                continue
+
+            # 1. Stretch the span across the run of empty cells the cell is in, cells were pushed from the start of
+            # their run unless the run carried on past the cells looked at, so stretching left is rarely far
+            row, col = divmod(index, cols)
+            row_start = row * cols
+            left = col
+            while left > 0 and neighbors[row_start + left - 1] == 0:
+                left -= 1
+            right = (
+                ZERO_RUNS.match(neighbors, index, row_start + cols).end()
+                - row_start
+                - 1
+            )
+            flooded[row_start + left : row_start + right + 1] = b"\x01" * (
+                right - left + 1
+            )
+
+            # 2. Reveal the span, and the cells around it, one row above and below
+            span_left, span_right = max(left - 1, 0), min(right + 1, cols - 1)
+            for check_row in (row - 1, row, row + 1):
+                # A. Don't look outside of the grid
+                if check_row < 0 or check_row >= rows:
+                    continue
+
+                check_start = check_row * cols + span_left
+                check_end = check_row * cols + span_right + 1
+
+                # B. Reveal the runs of cells not already revealed
+                for run in ZERO_RUNS.finditer(revealed, check_start, check_end):
+                    run_start, run_end = run.span()
+                    revealed[run_start:run_end] = b"\x01" * (run_end - run_start)
+                    tile_types[run_start:run_end] = neighbors[
+                        run_start:run_end
+                    ].translate(REVEALED_TILE_TYPES)
+                    revealed_cells.extend(range(run_start, run_end))
+                    if flags.count(NO_FLAG, run_start, run_end) != run_end - run_start:
+                        for flag_index in range(run_start, run_end):
+                            if flags[flag_index]:
+                                self.__remove_flag(flag_index)
+
+                # C. Add the first cell of every new run of empty cells above or below
+                if check_row != row:
+                    for run in ZERO_RUNS.finditer(neighbors, check_start, check_end):
+                        if not flooded[run.start()]:
+                            to_visit_list.append(run.start())
+
+        return revealed_cells
+
+    def __restore_derived_state(self, elapsed_time: float):
+        """
+        Work out the state that follows from the cells, after they have been restored.
+
+        Cells are looked at in bulk rather than one at a time: the cell arrays are combined into a single key per
+        cell, `neighbors + 9 * revealed + 18 * bomb + 36 * flag`, by adding them as large integers. No key is larger
+        than a byte, so the additions never carry into the next cell, and the tiles are then one lookup of the keys.
+        The keys are made for `RESTORE_CHUNK_CELLS` cells at a time, so they never take a copy of the whole board.
+        """
+
+        scaled_cells = [
+            (cells, bytes(min(value * scale, 255) for value in range(256)))
+            for cells, scale in (
+                (self.neighbors, 1),
+                (self.revealed, 9),
+                (self.bombs, 18),
+                (self.flags, 36),
+            )
+        ]
+
+        self.tile_types = bytearray(self.num_cells)
+        self.__flooded = bytearray(self.num_cells)
+        for start in range(0, self.num_cells, RESTORE_CHUNK_CELLS):
+            end = min(start + RESTORE_CHUNK_CELLS, self.num_cells)
+            keys = sum(
+                int.from_bytes(cells[start:end].translate(scale), "big")
+                for cells, scale in scaled_cells
+            ).to_bytes(end - start, "big")
+            self.tile_types[start:end] = keys.translate(RESTORED_TILE_TYPES)
+            self.__flooded[start:end] = keys.translate(RESTORED_FLOODED)
+
+        # Win state
+        num_revealed = self.revealed.count(1)
+        revealed_bombs = self.tile_types.count(TileType.BOMB_A.value)
+        self.remaining_tiles_to_reveal = (
+            self.num_cells - self.__num_of_bombs - (num_revealed - revealed_bombs)
+        )
+        self.flags_remaining = self.__num_of_bombs - self.flags.count(CERTAIN_FLAG)
+        self.game_was_lost = revealed_bombs > 0
+        self.game_was_won = (
+            # A game is only won by a reveal, even if every cell is a bomb
+            num_revealed > 0
+            and not self.game_was_lost
+            and self.remaining_tiles_to_reveal <= 0
+        )
+
+        # Game timer, carrying on from the time already played
+        if elapsed_time > 0 or num_revealed:
+            now = time.time()
+            self.__first_click_occured = True
+            self.__first_click_occured_at = now - elapsed_time
+            if self.game_was_won or self.game_was_lost:
+                self.__game_ended_at = now
+
+    def __end_game(self, player_won: bool) -> float:
+        """
+        End the game by calculating the time to clear the level.
+        """
+
+        self.__game_ended_at = time.time()
+        if player_won:
+            self.game_was_won = True
+        else:
+            self.game_was_lost = True
+            return 0.0
+
+        # Type guarding
+        if type(self.__first_click_occured_at) is not float:
+            raise TypeError("Time of first click was not saved.")
+
+        # calcluate and return game time
+        game_time = self.__game_ended_at - self.__first_click_occured_at
+
+        if self.__debug_mode:
+            print(f"DEBUG: Game Won!\nDEBUG: Grid took {game_time:.2f}s to complete.")
+        return game_time
@@ -0,0 +1,235 @@
+import random
+import signal
+import threading
+import multiprocessing
+from collections.abc import Callable
+from multiprocessing.pool import Pool
+import time
+from board import Board, FirstClickMode, PlacementMode
+from board_save import load_board
+from generator import generate_no_guess_board
+
+
+def build_board(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    seed: int,
+    debug_mode: bool,
+    placement: PlacementMode,
+    first_click: FirstClickMode,
+) -> Board:
+    """
+    Create a board from a seed, in a worker process.
+    """
+
+    return Board(
+        grid_size, num_of_bombs, random.Random(seed), debug_mode, placement, first_click
+    )
+
+
+def start_worker():
+    """
+    Set up a worker process. Forked from the game, it inherits pygame's SIGTERM handler, which only posts a quit
+    event, so the default is put back for `close` to be able to terminate it.
+    """
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+class BoardJob:
+    """
+    BoardJob generates or loads a board on a background thread, so the window keeps drawing while it is made.
+
+    Making a board does not touch pygame, so it is safe off the main thread. `status` holds the step the
+    generation is on, to be shown while waiting. The thread is a daemon, so quitting never waits for a board that
+    will not be played.
+    """
+
+    def __init__(
+        self, build: Callable[[Callable[[str], None]], tuple[Board, int | None]]
+    ):
+        self.status = "Starting"
+        self.__result: tuple[Board, int | None] | None = None
+        self.__error: BaseException | None = None
+        self.__finished = threading.Event()
+
+        self.__thread = threading.Thread(
+            target=self.__run, args=(build,), name="board-builder", daemon=True
+        )
+        self.__thread.start()
+
+    def done(self) -> bool:
+        return self.__finished.is_set()
+
+    def result(self) -> tuple[Board, int | None]:
+        """
+        Wait for the board, returning it and the seed it was generated from if it is a no-guess board.
+        Raises the error the generation failed with, if it did.
+        """
+
+        self.__finished.wait()
+        if self.__error is not None:
+            raise self.__error
+
+        # Type guarding
+        if self.__result is None:
+            raise RuntimeError("Board job finished without a board.")
+
+        return self.__result
+
+    def __run(self, build: Callable[[Callable[[str], None]], tuple[Board, int | None]]):
+        try:
+            self.__result = build(self.__set_status)
+        except BaseException as error:
+            self.__error = error
+        finally:
+            self.__finished.set()
+
+    def __set_status(self, status: str):
+        self.status = status
+
+
+class BoardBuilder:
+    """
+    BoardBuilder starts BoardJobs for a game config, for the board being played and the next one to be played.
+
+    The board being waited for is generated on the job's thread, where it can report its progress. The next board is
+    generated while the game is played, so it is made in a worker process instead, where generating it never holds
+    the GIL the game loop needs. A no-guess board being waited for is searched for across every core, but the next
+    one is searched for in the worker alone, so that it never takes the cores the game is played on.
+    """
+
+    def __init__(
+        self,
+        grid_size: tuple[int, int],
+        num_of_bombs: int,
+        debug_mode: bool = False,
+        placement: PlacementMode = PlacementMode.SAMPLE,
+        first_click: FirstClickMode = FirstClickMode.NONE,
+        no_guess: bool = False,
+    ):
+        self.grid_size = grid_size
+        self.num_of_bombs = num_of_bombs
+        self.__debug_mode = debug_mode
+        self.__placement = placement
+        self.__first_click = first_click
+        self.__no_guess = no_guess
+
+        # Started with the first board built in a worker, and kept for the boards after it
+        self.__pool: Pool | None = None
+
+    def build(self, rng: random.Random) -> BoardJob:
+        """
+        Start generating a board from `rng`. The job owns `rng` until it is done, it must not be used meanwhile.
+
+        No-guess boards are generated to be solvable from a first click in the center, searching from a seed drawn
+        from `rng` before the job starts.
+        """
+
+        if self.__no_guess:
+            seed = rng.getrandbits(64)
+            return BoardJob(
+                lambda progress: generate_no_guess_board(
+                    self.grid_size,
+                    self.num_of_bombs,
+                    seed,
+                    self.__no_guess_first_click(),
+                    progress=progress,
+                )
+            )
+
+        return BoardJob(
+            lambda progress: (
+                Board(
+                    self.grid_size,
+                    self.num_of_bombs,
+                    rng,
+                    self.__debug_mode,
+                    self.__placement,
+                    self.__first_click,
+                    progress,
+                ),
+                None,
+            )
+        )
+
+    def load(self, path: str) -> BoardJob:
+        """
+        Start loading a board saved by `save_board`, on the job's thread like a board being generated.
+        """
+
+        def load_saved_board(
+            progress: Callable[[str], None],
+        ) -> tuple[Board, int | None]:
+            progress("Loading the save")
+            load_began_at = time.perf_counter()
+            board, _ = load_board(path, self.__debug_mode)
+            if self.__debug_mode:
+                print(
+                    f"DEBUG: Save loaded in {(time.perf_counter() - load_began_at) * 1000:.1f}ms"
+                )
+            return board, None
+
+        return BoardJob(load_saved_board)
+
+    def build_in_worker(self, seed: int) -> BoardJob:
+        """
+        Start generating a board from `random.Random(seed)` in a worker process, for the same board as `build` would.
+        """
+
+        if self.__pool is None:
+            self.__pool = multiprocessing.Pool(1, start_worker)
+
+        if self.__no_guess:
+            # The same search seed `build` would draw, searched for with the worker as the only process
+            no_guess_result = self.__pool.apply_async(
+                generate_no_guess_board,
+                (
+                    self.grid_size,
+                    self.num_of_bombs,
+                    random.Random(seed).getrandbits(64),
+                    self.__no_guess_first_click(),
+                    1,
+                ),
+            )
+
+            def wait_for_no_guess_board(
+                progress: Callable[[str], None],
+            ) -> tuple[Board, int | None]:
+                progress("Searching in a worker process")
+                return no_guess_result.get()
+
+            return BoardJob(wait_for_no_guess_board)
+
+        result = self.__pool.apply_async(
+            build_board,
+            (
+                self.grid_size,
+                self.num_of_bombs,
+                seed,
+                self.__debug_mode,
+                self.__placement,
+                self.__first_click,
+            ),
+        )
+
+        def wait_for_board(
+            progress: Callable[[str], None],
+        ) -> tuple[Board, int | None]:
+            progress("Generating in a worker process")
+            return result.get(), None
+
+        return BoardJob(wait_for_board)
+
+    def close(self):
+        """
+        Terminate the worker process, even in the middle of a board, so that quitting never waits for it. Jobs
+        waiting for a board from the worker never finish.
+        """
+
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool = None
+
+    def __no_guess_first_click(self) -> tuple[int, int]:
+        return (self.grid_size[0] // 2, self.grid_size[1] // 2)
@@ -0,0 +1,245 @@
+import os
+import mmap
+import random
+import struct
+from collections.abc import Iterator
+from board import Board, FirstClickMode, CERTAIN_FLAG, UNCERTAIN_FLAG
+
+SAVE_MAGIC = b"BFSV"
+SAVE_VERSION = 1
+
+# magic, version, game state, first click, cols, rows, seed, number of bombs, milliseconds played
+SAVE_HEADER = struct.Struct("<4sHBBIIQIQ")
+GAME_WON = 1
+GAME_LOST = 2
+# How the first reveal is still to be kept safe, stored as its position here. Saves from before it was stored hold 0.
+FIRST_CLICK_MODES = (FirstClickMode.NONE, FirstClickMode.DEFER, FirstClickMode.RELOCATE)
+
+# Cells are packed through text, so converting between cells and bits is done by bytes.translate and int, in C
+HEX_DIGITS = b"0123456789abcdef"
+NIBBLE_TO_HEX = HEX_DIGITS + b"0" * 240
+HEX_TO_NIBBLE = bytes.maketrans(HEX_DIGITS, bytes(range(16)))
+# Packed bytes unpacked at a time, which bounds the memory used while loading on top of the cells themselves
+UNPACK_CHUNK_BYTES = 64 * 1024
+
+
+def pack_bits(cells: bytes, ones: int = 1) -> bytes:
+    """
+    Pack one bit per cell, set where the cell is `ones`, 8 cells to a byte with the first cell in the highest bit.
+    """
+
+    if not cells:
+        return b""
+
+    to_digit = bytearray(b"0" * 256)
+    to_digit[ones] = ord("1")
+    bits = cells.translate(to_digit) + b"0" * (-len(cells) % 8)
+    return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+
+def iter_unpacked_bits(
+    packed: memoryview, num_cells: int, one: int = 1
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Unpack cells packed by `pack_bits` a chunk at a time, yielding the first cell of each chunk and its cells, with the
+    cells whose bit is set as `one`.
+    """
+
+    to_cells = bytes.maketrans(b"01", bytes([0, one]))
+    for start in range(0, len(packed), UNPACK_CHUNK_BYTES):
+        chunk = packed[start : start + UNPACK_CHUNK_BYTES]
+        first_cell = start * 8
+        bits = format(int.from_bytes(chunk, "big"), f"0{len(chunk) * 8}b").encode()
+        yield first_cell, bits[: num_cells - first_cell].translate(to_cells)
+
+
+def unpack_bits(packed: memoryview, num_cells: int, one: int = 1) -> bytearray:
+    """
+    Unpack cells packed by `pack_bits`, setting the cells whose bit is set to `one`.
+    """
+
+    cells = bytearray(num_cells)
+    for first_cell, chunk in iter_unpacked_bits(packed, num_cells, one):
+        cells[first_cell : first_cell + len(chunk)] = chunk
+
+    return cells
+
+
+def pack_nibbles(cells: bytes) -> bytes:
+    """
+    Pack 4 bits per cell, two cells to a byte with the first cell in the high bits.
+    """
+
+    digits = cells.translate(NIBBLE_TO_HEX) + b"0" * (len(cells) % 2)
+    return bytes.fromhex(digits.decode())
+
+
+def unpack_nibbles(packed: memoryview, num_cells: int) -> bytearray:
+    """
+    Unpack cells packed by `pack_nibbles`.
+    """
+
+    cells = bytearray(num_cells)
+    for start in range(0, len(packed), UNPACK_CHUNK_BYTES):
+        first_cell = start * 2
+        digits = packed[start : start + UNPACK_CHUNK_BYTES].hex().encode()
+        chunk = digits[: num_cells - first_cell].translate(HEX_TO_NIBBLE)
+        cells[first_cell : first_cell + len(chunk)] = chunk
+
+    return cells
+
+
+def plane_sizes(num_cells: int) -> list[int]:
+    """
+    The bytes taken by each plane after the header: bombs, revealed, certain flags, uncertain flags and neighbors.
+    """
+
+    bits_size = (num_cells + 7) // 8
+    return [bits_size, bits_size, bits_size, bits_size, (num_cells + 1) // 2]
+
+
+def save_board(path: str, board: Board, seed: int = 0):
+    """
+    Save a board to a compact binary file.
+
+    A board saved before its first reveal keeps how that reveal is made safe, so it is still safe once loaded.
+
+    After the header, the cells are stored as planes: one bit per cell for bombs, revealed cells, certain flags and
+    uncertain flags, then 4 bits per cell for the neighbor counts. The file is written next to `path` first and then
+    moved over it, so an existing save is never left half written.
+    """
+
+    if not board.bombs_placed:
+        raise ValueError("Board has no bombs placed yet, there is nothing to save.")
+
+    state = GAME_WON if board.game_was_won else GAME_LOST if board.game_was_lost else 0
+    header = SAVE_HEADER.pack(
+        SAVE_MAGIC,
+        SAVE_VERSION,
+        state,
+        FIRST_CLICK_MODES.index(board.pending_first_click),
+        board.cols,
+        board.rows,
+        seed,
+        board.bombs.count(1),
+        round(board.elapsed_time() * 1000),
+    )
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as save_file:
+        save_file.write(header)
+        save_file.write(pack_bits(board.bombs))
+        save_file.write(pack_bits(board.revealed))
+        save_file.write(pack_bits(board.flags, CERTAIN_FLAG))
+        save_file.write(pack_bits(board.flags, UNCERTAIN_FLAG))
+        save_file.write(pack_nibbles(board.neighbors))
+    os.replace(temporary_path, path)
+
+
+def parse_header(data: bytes | mmap.mmap) -> dict:
+    """
+    Read the header at the start of a save.
+    """
+
+    if len(data) < SAVE_HEADER.size:
+        raise ValueError("Save is too short to hold a header.")
+
+    magic, version, state, first_click, cols, rows, seed, num_of_bombs, elapsed_ms = (
+        SAVE_HEADER.unpack_from(data)
+    )
+    if magic != SAVE_MAGIC:
+        raise ValueError("Not a Bomb Finder save.")
+    if version != SAVE_VERSION:
+        raise ValueError(f"Save is version {version}, expected {SAVE_VERSION}.")
+    if first_click >= len(FIRST_CLICK_MODES):
+        raise ValueError(f"Save has an unknown first click mode {first_click}.")
+
+    return {
+        "grid_size": (cols, rows),
+        "seed": seed,
+        "num_of_bombs": num_of_bombs,
+        "elapsed_time": elapsed_ms / 1000,
+        "game_was_won": state == GAME_WON,
+        "game_was_lost": state == GAME_LOST,
+        "first_click": FIRST_CLICK_MODES[first_click],
+    }
+
+
+def read_header(path: str) -> dict:
+    """
+    Read only the header of a save, without the cells, such as to list saved games.
+    """
+
+    with open(path, "rb") as save_file:
+        return parse_header(save_file.read(SAVE_HEADER.size))
+
+
+def load_board(path: str, debug_mode: bool = False) -> tuple[Board, int]:
+    """
+    Load a board saved by `save_board`, ready to carry on playing. Returns the board and the seed it was saved with.
+
+    The file is memory mapped and each plane is unpacked from the mapping a chunk at a time, so besides the cells of
+    the board only a chunk of the file is held in memory at once.
+    """
+
+    with (
+        open(path, "rb") as save_file,
+        mmap.mmap(save_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+    ):
+        header = parse_header(mapped)
+        cols, rows = header["grid_size"]
+        num_cells = cols * rows
+
+        sizes = plane_sizes(num_cells)
+        if len(mapped) != SAVE_HEADER.size + sum(sizes):
+            raise ValueError(
+                f"Save is {len(mapped)} bytes, expected {SAVE_HEADER.size + sum(sizes)} for a {cols}x{rows} grid."
+            )
+
+        with memoryview(mapped) as view:
+            planes = []
+            offset = SAVE_HEADER.size
+            for size in sizes:
+                planes.append(view[offset : offset + size])
+                offset += size
+            (
+                bombs_plane,
+                revealed_plane,
+                certain_plane,
+                uncertain_plane,
+                neighbors_plane,
+            ) = planes
+
+            bombs = unpack_bits(bombs_plane, num_cells)
+            revealed = unpack_bits(revealed_plane, num_cells)
+            neighbors = unpack_nibbles(neighbors_plane, num_cells)
+
+            # A cell only ever has one kind of flag, so the uncertain flags can be added to the certain ones
+            flags = unpack_bits(certain_plane, num_cells, CERTAIN_FLAG)
+            for first_cell, uncertain_flags in iter_unpacked_bits(
+                uncertain_plane, num_cells, UNCERTAIN_FLAG
+            ):
+                if uncertain_flags.count(0) == len(uncertain_flags):
+                    continue
+                last_cell = first_cell + len(uncertain_flags)
+                flags[first_cell:last_cell] = (
+                    int.from_bytes(flags[first_cell:last_cell], "big")
+                    + int.from_bytes(uncertain_flags, "big")
+                ).to_bytes(len(uncertain_flags), "big")
+
+            for plane in planes:
+                plane.release()
+
+    board = Board.restore(
+        header["grid_size"],
+        header["num_of_bombs"],
+        bombs,
+        revealed,
+        flags,
+        neighbors,
+        header["elapsed_time"],
+        debug_mode,
+        header["first_click"],
+        random.Random(header["seed"]),
+    )
+    return board, header["seed"]
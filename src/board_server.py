@@ -0,0 +1,543 @@
+import time
+import random
+import struct
+import asyncio
+import argparse
+from collections.abc import Callable
+from board import Action, Board, FirstClickMode
+from board_save import GAME_LOST, GAME_WON
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Messages waiting to be sent to a client, past this many the client is sent a snapshot once it catches up instead
+CLIENT_QUEUE_SIZE = 64
+# Actions waiting to be applied, clients are not read from while it is full
+ACTION_QUEUE_SIZE = 1024
+# Connections waiting to be accepted, so that hundreds of clients can join at once
+CONNECTION_BACKLOG = 1024
+# Bytes buffered for a client before waiting for it to read them
+CLIENT_WRITE_BUFFER = 256 * 1024
+
+# Every message from the server is a payload length, then the payload
+MESSAGE_LENGTH = struct.Struct("<I")
+MESSAGE_SNAPSHOT = 0
+MESSAGE_DELTA = 1
+
+# type, sequence, game state, flags remaining, then cols, rows and number of bombs, then a tile type per cell
+SNAPSHOT_HEADER = struct.Struct("<BIBiIII")
+# type, sequence, game state, flags remaining, number of runs
+DELTA_HEADER = struct.Struct("<BIBiI")
+# first cell of a run of consecutive cells, number of cells, then a tile type per cell
+DELTA_RUN = struct.Struct("<IH")
+MAX_RUN_LENGTH = 0xFFFF
+
+# Sent by clients: action, col, row
+CLIENT_ACTION = struct.Struct("<BII")
+# Sent by clients in place of an action to start a new game, with any col and row
+CLIENT_NEW_GAME = 2
+
+# Random cells a load test player tries before deciding no safe cell is left and the game is over
+SAFE_CELL_TRIES = 1000
+
+
+def game_state(board: Board) -> int:
+    return GAME_WON if board.game_was_won else GAME_LOST if board.game_was_lost else 0
+
+
+def encode_snapshot(board: Board, sequence: int) -> bytes:
+    """
+    Encode the whole board, sent to a client when it joins or has fallen too far behind.
+    """
+
+    header = SNAPSHOT_HEADER.pack(
+        MESSAGE_SNAPSHOT,
+        sequence,
+        game_state(board),
+        board.flags_remaining,
+        board.cols,
+        board.rows,
+        board.bombs.count(1) if board.bombs_placed else 0,
+    )
+    payload = header + board.tile_types
+    return MESSAGE_LENGTH.pack(len(payload)) + payload
+
+
+def encode_delta(board: Board, sequence: int, changed: list[int]) -> bytes:
+    """
+    Encode the cells changed by an action, as runs of consecutive cells with the tile type of each.
+
+    A flood reveals whole spans of rows, so most of a flood is sent as a byte per cell.
+    """
+
+    tile_types = board.tile_types
+    runs = []
+    indexes = sorted(set(changed))
+    run_start = 0
+    for position in range(1, len(indexes) + 1):
+        if (
+            position < len(indexes)
+            and indexes[position] == indexes[position - 1] + 1
+            and position - run_start < MAX_RUN_LENGTH
+        ):
+            continue
+
+        start, length = indexes[run_start], position - run_start
+        runs.append(DELTA_RUN.pack(start, length))
+        runs.append(tile_types[start : start + length])
+        run_start = position
+
+    header = DELTA_HEADER.pack(
+        MESSAGE_DELTA,
+        sequence,
+        game_state(board),
+        board.flags_remaining,
+        len(runs) // 2,
+    )
+    payload = b"".join([header, *runs])
+    return MESSAGE_LENGTH.pack(len(payload)) + payload
+
+
+class BoardServer:
+    """
+    BoardServer shares one headless Board between many clients, which can watch it or play on it together.
+
+    Actions from every client go through a single queue and are applied in the order they arrive. After each action,
+    only the cells it changed are broadcast, as a delta. A client that joins is sent a snapshot of the whole board.
+
+    Each client has a bounded queue of messages. A slow client that lets its queue fill has its queued deltas
+    dropped, and is sent a single fresh snapshot once it catches up, so it never holds up the other clients.
+
+    Any client can start a new game, on a board from `new_board`. Every client is then sent a snapshot of it.
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        client_queue_size: int = CLIENT_QUEUE_SIZE,
+        action_queue_size: int = ACTION_QUEUE_SIZE,
+        new_board: Callable[[], Board] | None = None,
+    ):
+        self.board = board
+        self.sequence = 0
+        self.actions_handled = 0
+        self.games_started = 1
+        self.__client_queue_size = client_queue_size
+        self.__new_board = new_board
+
+        # An action of `None` starts a new game
+        self.__actions: asyncio.Queue[tuple[Action | None, tuple[int, int]]] = (
+            asyncio.Queue(action_queue_size)
+        )
+        self.__clients: set[ServerClient] = set()
+        self.__server: asyncio.Server | None = None
+        self.__applier: asyncio.Task | None = None
+
+        # Snapshots are the same for every client at a sequence, so many clients joining at once only encode one
+        self.__snapshot: tuple[int, bytes] | None = None
+
+    @property
+    def num_clients(self) -> int:
+        return len(self.__clients)
+
+    @property
+    def port(self) -> int:
+        if self.__server is None:
+            raise RuntimeError("Server has not been started.")
+
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        """
+        Start accepting clients. Port 0 picks a free port, which can then be read from `port`.
+        """
+
+        self.__server = await asyncio.start_server(
+            self.__accept, host, port, backlog=CONNECTION_BACKLOG
+        )
+        self.__applier = asyncio.create_task(self.__apply_actions())
+
+    async def serve_forever(self):
+        if self.__server is None:
+            raise RuntimeError("Server has not been started.")
+
+        await self.__server.serve_forever()
+
+    async def close(self):
+        if self.__applier is not None:
+            self.__applier.cancel()
+        for client in list(self.__clients):
+            client.close()
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+
+    def snapshot(self) -> bytes:
+        if self.__snapshot is None or self.__snapshot[0] != self.sequence:
+            self.__snapshot = (
+                self.sequence,
+                encode_snapshot(self.board, self.sequence),
+            )
+
+        return self.__snapshot[1]
+
+    # == Private Methods ==
+    async def __accept(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        client = ServerClient(self, writer, self.__client_queue_size)
+        self.__clients.add(client)
+        try:
+            while True:
+                data = await reader.readexactly(CLIENT_ACTION.size)
+                action, col, row = CLIENT_ACTION.unpack(data)
+                if action == CLIENT_NEW_GAME:
+                    queued = None
+                elif action in (Action.REVEAL.value, Action.FLAG.value):
+                    queued = Action(action)
+                else:
+                    break
+
+                # Waiting here stops reading from the client while the queue is full
+                await self.__actions.put((queued, (col, row)))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.__clients.discard(client)
+            client.close()
+
+    async def __apply_actions(self):
+        """
+        Apply queued actions one at a time, in order, broadcasting what each changed.
+        """
+
+        while True:
+            action, (col, row) = await self.__actions.get()
+            self.actions_handled += 1
+            if action is None:
+                self.__start_new_game()
+                continue
+
+            board = self.board
+            if not (0 <= col < board.cols and 0 <= row < board.rows):
+                continue
+
+            board.apply(action, (col, row))
+            if not board.last_changed:
+                continue
+
+            self.sequence += 1
+            message = encode_delta(board, self.sequence, board.last_changed)
+            for client in self.__clients:
+                client.send(message)
+
+    def __start_new_game(self):
+        """
+        Replace the board with a new one, sending every client a snapshot of it in place of anything still queued.
+        """
+
+        if self.__new_board is None:
+            return
+
+        self.board = self.__new_board()
+        self.games_started += 1
+        # The snapshot is of a new sequence, so that one already encoded for the old board is not reused
+        self.sequence += 1
+        for client in self.__clients:
+            client.send_snapshot()
+
+
+class ServerClient:
+    """
+    ServerClient is the server's side of a connection, holding the messages waiting to be written to the client.
+    """
+
+    def __init__(
+        self, server: BoardServer, writer: asyncio.StreamWriter, queue_size: int
+    ):
+        self.__server = server
+        self.__writer = writer
+        writer.transport.set_write_buffer_limits(CLIENT_WRITE_BUFFER)
+
+        # `None` stands for a snapshot, built when it is written so it includes every delta dropped before it
+        self.__queue: asyncio.Queue[bytes | None] = asyncio.Queue(queue_size)
+        self.__queue.put_nowait(None)
+        self.__awaiting_snapshot = True
+        self.__sender = asyncio.create_task(self.__send_messages())
+
+    def send(self, message: bytes):
+        """
+        Queue a message without waiting. If the queue is full, it is emptied for a snapshot instead.
+        """
+
+        if self.__awaiting_snapshot:
+            return
+
+        try:
+            self.__queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.send_snapshot()
+
+    def send_snapshot(self):
+        """
+        Drop every queued message, sending a snapshot once the client catches up instead.
+        """
+
+        while not self.__queue.empty():
+            self.__queue.get_nowait()
+        self.__queue.put_nowait(None)
+        self.__awaiting_snapshot = True
+
+    def close(self):
+        self.__sender.cancel()
+        self.__writer.close()
+
+    async def __send_messages(self):
+        try:
+            while True:
+                message = await self.__queue.get()
+                if message is None:
+                    message = self.__server.snapshot()
+                    self.__awaiting_snapshot = False
+
+                self.__writer.write(message)
+                # Waits while the client is slow to read, while its queue fills instead of the write buffer
+                await self.__writer.drain()
+        except ConnectionError:
+            self.__writer.close()
+
+
+class BoardClient:
+    """
+    BoardClient connects to a BoardServer, keeping a copy of the tile types of the shared board up to date.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.__reader = reader
+        self.__writer = writer
+
+        self.cols = 0
+        self.rows = 0
+        self.num_of_bombs = 0
+        self.tile_types = bytearray()
+        self.sequence = 0
+        self.game_state = 0
+        self.flags_remaining = 0
+        self.snapshots_received = 0
+        self.deltas_received = 0
+
+    @classmethod
+    async def connect(
+        cls, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT
+    ) -> "BoardClient":
+        """
+        Connect to a server, waiting for the snapshot of the board.
+        """
+
+        client = cls(*await asyncio.open_connection(host, port))
+        await client.receive()
+        return client
+
+    async def send(self, action: Action, col_row: tuple[int, int]):
+        self.__writer.write(CLIENT_ACTION.pack(action.value, *col_row))
+        await self.__writer.drain()
+
+    async def new_game(self):
+        """
+        Ask the server for a new game, whose snapshot then comes like any other message.
+        """
+
+        self.__writer.write(CLIENT_ACTION.pack(CLIENT_NEW_GAME, 0, 0))
+        await self.__writer.drain()
+
+    async def receive(self) -> int:
+        """
+        Wait for the next message from the server and apply it to the board. Returns the sequence it brings the
+        board up to.
+        """
+
+        (length,) = MESSAGE_LENGTH.unpack(
+            await self.__reader.readexactly(MESSAGE_LENGTH.size)
+        )
+        payload = await self.__reader.readexactly(length)
+
+        if payload[0] == MESSAGE_SNAPSHOT:
+            (
+                _,
+                self.sequence,
+                self.game_state,
+                self.flags_remaining,
+                self.cols,
+                self.rows,
+                self.num_of_bombs,
+            ) = SNAPSHOT_HEADER.unpack_from(payload)
+            self.tile_types = bytearray(payload[SNAPSHOT_HEADER.size :])
+            self.snapshots_received += 1
+            return self.sequence
+
+        _, sequence, self.game_state, self.flags_remaining, num_runs = (
+            DELTA_HEADER.unpack_from(payload)
+        )
+        if sequence != self.sequence + 1:
+            raise ValueError(f"Delta {sequence} does not follow {self.sequence}.")
+
+        offset = DELTA_HEADER.size
+        for _ in range(num_runs):
+            start, length = DELTA_RUN.unpack_from(payload, offset)
+            offset += DELTA_RUN.size
+            self.tile_types[start : start + length] = payload[offset : offset + length]
+            offset += length
+
+        self.sequence = sequence
+        self.deltas_received += 1
+        return sequence
+
+    async def close(self):
+        self.__writer.close()
+        await self.__writer.wait_closed()
+
+
+async def load_test(
+    server: BoardServer, num_clients: int, num_players: int, num_actions: int
+) -> dict:
+    """
+    Connect clients to a running server over localhost, with some of them playing, then check that every client
+    ended on the same tiles as the server's board.
+
+    Players only reveal or flag cells the server's board knows to be safe, as a solver would, so that nearly every
+    action changes the board and is streamed as a delta rather than ending the game. Once a game has ended, the
+    first player to notice starts a new one, which every client is sent as a snapshot.
+    """
+
+    clients = await asyncio.gather(
+        *(BoardClient.connect(port=server.port) for _ in range(num_clients))
+    )
+    rng = random.Random(server.board.cols * server.board.rows)
+    num_sent = 0
+    # The last boards a first reveal was sent for and a new game was asked for, so that only one player sends each
+    opened_board: Board | None = None
+    ended_board: Board | None = None
+
+    async def follow(client: BoardClient):
+        while True:
+            await client.receive()
+
+    def safe_cell(board: Board) -> tuple[int, int] | None:
+        for _ in range(SAFE_CELL_TRIES):
+            index = rng.randrange(board.num_cells)
+            if not (board.bombs[index] or board.revealed[index] or board.flags[index]):
+                return board.col_row(index)
+
+        return None
+
+    async def play(client: BoardClient):
+        nonlocal num_sent, opened_board, ended_board
+        for _ in range(num_actions):
+            board = server.board
+            col_row = None
+            if not (board.game_was_won or board.game_was_lost):
+                col_row = safe_cell(board)
+
+            if col_row is not None:
+                # No cell is known to be safe until the first reveal has placed the bombs, so only flag until then
+                if board.bombs_placed:
+                    action = Action.REVEAL if rng.random() < 0.8 else Action.FLAG
+                elif opened_board is not board:
+                    action = Action.REVEAL
+                    opened_board = board
+                else:
+                    action = Action.FLAG
+                await client.send(action, col_row)
+                num_sent += 1
+            elif ended_board is not board:
+                ended_board = board
+                await client.new_game()
+                num_sent += 1
+            await asyncio.sleep(0)
+
+    started_at = time.perf_counter()
+    followers = [asyncio.create_task(follow(client)) for client in clients]
+    await asyncio.gather(*(play(client) for client in clients[:num_players]))
+
+    # Once the server has handled every action and every client has caught up, nothing more is sent, so the
+    # clients can stop waiting for messages
+    while server.actions_handled < num_sent or any(
+        client.sequence != server.sequence for client in clients
+    ):
+        await asyncio.sleep(0.001)
+    elapsed = time.perf_counter() - started_at
+    for follower in followers:
+        follower.cancel()
+
+    matching = sum(client.tile_types == server.board.tile_types for client in clients)
+    # Besides the one it joined with, each client is sent a snapshot of each new game
+    snapshots = sum(
+        max(client.snapshots_received - server.games_started, 0) for client in clients
+    )
+    for client in clients:
+        await client.close()
+
+    return {
+        "clients": num_clients,
+        "actions": num_sent,
+        "deltas": server.sequence - (server.games_started - 1),
+        "games": server.games_started,
+        "min_client_deltas": min(client.deltas_received for client in clients),
+        "matching": matching,
+        "resync_snapshots": snapshots,
+        "seconds": elapsed,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Share a Bomb Finder board between many clients, broadcasting only the cells each action changes"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument(
+        "--size", type=int, nargs=2, default=(30, 16), metavar=("COLS", "ROWS")
+    )
+    parser.add_argument("--bombs", type=int, default=99)
+    parser.add_argument("--seed", type=lambda value: int(value, 0), default=0)
+    parser.add_argument(
+        "--load-test",
+        type=int,
+        metavar="CLIENTS",
+        help="connect this many clients over localhost and check they all end on the server's board, then exit",
+    )
+    parser.add_argument(
+        "--players", type=int, default=10, help="clients playing in the load test"
+    )
+    parser.add_argument(
+        "--actions", type=int, default=50, help="actions per player in the load test"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    def new_board() -> Board:
+        return Board(
+            tuple(args.size), args.bombs, rng, first_click=FirstClickMode.DEFER
+        )
+
+    server = BoardServer(new_board(), new_board=new_board)
+    await server.start(args.host, 0 if args.load_test else args.port)
+
+    if args.load_test:
+        result = await load_test(server, args.load_test, args.players, args.actions)
+        await server.close()
+        print(
+            f"{result['clients']} clients, {result['actions']} actions over {result['games']} games"
+            f" streamed as {result['deltas']} deltas in {result['seconds']:.2f}s,"
+            f" at least {result['min_client_deltas']} received by each client,"
+            f" {result['matching']} clients matching the board, {result['resync_snapshots']} resync snapshots"
+        )
+        return
+
+    print(f"Serving a {args.size[0]}x{args.size[1]} board on {args.host}:{server.port}")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
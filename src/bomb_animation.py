@@ -0,0 +1,116 @@
+from collections.abc import Iterable, Iterator
+from tile_type import TileType
+
+# The frames of a bomb exploding, in order. The last frame is held once the explosion ends.
+BOMB_FRAMES = [
+    TileType.BOMB_A,
+    TileType.BOMB_B,
+    TileType.BOMB_C,
+    TileType.BOMB_D,
+    TileType.BOMB_E,
+    TileType.BOMB_F,
+    TileType.BOMB_G,
+    TileType.BOMB_H,
+    TileType.BOMB_I,
+    TileType.BOMB_J,
+    TileType.BOMB_K,
+    TileType.BOMB_L,
+    TileType.BOMB_M,
+    TileType.BOMB_N,
+]
+BOMB_FRAME_MS = 60
+# Time between one bomb of a chain starting to explode and the next
+CHAIN_STAGGER_MS = 40
+
+
+class BombAnimator:
+    """
+    BombAnimator plays the explosion of bombs by clock time, so the animation runs at the same speed at any frame rate.
+
+    Only the tiles that are exploding are advanced. A chain of explosions is pulled from an iterator one bomb at a time,
+    as each is due to start, and a fixed stagger between bombs bounds how many are exploding at once. So neither
+    starting a chain nor a frame of it costs more as the number of bombs on the board grows.
+    """
+
+    def __init__(
+        self,
+        frame_ms: int = BOMB_FRAME_MS,
+        chain_stagger_ms: int = CHAIN_STAGGER_MS,
+    ):
+        self.__frame_ms = frame_ms
+        self.__chain_stagger_ms = chain_stagger_ms
+
+        # Tiles exploding, with the time they started, and the frame each started tile is showing
+        self.__exploding: dict[tuple[int, int], int] = {}
+        self.__frames: dict[tuple[int, int], TileType] = {}
+        # Tiles started since the last advance, which have changed from the tile on the board
+        self.__started: list[tuple[int, int]] = []
+
+        # Bombs of the chain yet to explode, the next one is taken out early to know if the chain has ended
+        self.__chain: Iterator[tuple[int, int]] = iter(())
+        self.__next_in_chain: tuple[int, int] | None = None
+        self.__next_chain_start_at = 0
+
+    @property
+    def is_animating(self) -> bool:
+        return bool(self.__exploding) or self.__next_in_chain is not None
+
+    @property
+    def has_exploded(self) -> bool:
+        return bool(self.__frames)
+
+    def exploded_tiles(self) -> list[tuple[int, int]]:
+        return list(self.__frames)
+
+    def frame(self, col_row: tuple[int, int]) -> TileType | None:
+        """
+        The frame a tile is showing, or `None` if it has not exploded.
+        """
+
+        return self.__frames.get(col_row)
+
+    def explode(
+        self,
+        col_row: tuple[int, int],
+        now_ms: int,
+        chain: Iterable[tuple[int, int]] = (),
+    ):
+        """
+        Start a bomb exploding, followed by the bombs of `chain` in order. The chain is only read as it is needed.
+        """
+
+        self.__start(col_row, now_ms)
+
+        self.__chain = iter(chain)
+        self.__next_in_chain = next(self.__chain, None)
+        self.__next_chain_start_at = now_ms + self.__chain_stagger_ms
+
+    def advance(self, now_ms: int) -> list[tuple[int, int]]:
+        """
+        Move the exploding tiles on to the frame for the current time, starting the bombs of the chain that are due.
+        Returns the tiles whose frame changed.
+        """
+
+        while self.__next_in_chain is not None and self.__next_chain_start_at <= now_ms:
+            if self.__next_in_chain not in self.__frames:
+                self.__start(self.__next_in_chain, self.__next_chain_start_at)
+                self.__next_chain_start_at += self.__chain_stagger_ms
+            self.__next_in_chain = next(self.__chain, None)
+
+        changed = set(self.__started)
+        self.__started = []
+        last_frame = len(BOMB_FRAMES) - 1
+        for col_row, started_at in list(self.__exploding.items()):
+            frame = min((now_ms - started_at) // self.__frame_ms, last_frame)
+            if BOMB_FRAMES[frame] != self.__frames[col_row]:
+                self.__frames[col_row] = BOMB_FRAMES[frame]
+                changed.add(col_row)
+            if frame == last_frame:
+                del self.__exploding[col_row]
+
+        return list(changed)
+
+    def __start(self, col_row: tuple[int, int], now_ms: int):
+        self.__exploding[col_row] = now_ms
+        self.__frames[col_row] = BOMB_FRAMES[0]
+        self.__started.append(col_row)
@@ -0,0 +1,94 @@
+import pygame as pg
+
+
+class Camera:
+    """
+    Camera is a scrollable view over the world, the area of the grid that is shown within the screen.
+
+    A point in the world is drawn on the screen at `world_point - offset`. The offset is kept within the bounds of
+    the world, so the grid can never be scrolled entirely out of view. A world without bounds can be scrolled freely.
+    """
+
+    def __init__(self, view_size: tuple[int, int], world_bounds: pg.Rect | None):
+        self.__view_width, self.__view_height = view_size
+        self.__world_bounds = world_bounds
+
+        # Camera state
+        self.offset: tuple[int, int] = (0, 0)
+        self.__clamp()
+
+    def pan(self, change: tuple[float, float]) -> bool:
+        """
+        Move the camera by the change in x and y.
+
+        Returns whether the camera moved, as everything on screen needs to be redrawn if it did.
+        """
+
+        previous_offset = self.offset
+        offset_x, offset_y = self.offset
+        change_x, change_y = change
+        self.offset = (int(offset_x + change_x), int(offset_y + change_y))
+        self.__clamp()
+
+        return self.offset != previous_offset
+
+    def set_world_bounds(self, world_bounds: pg.Rect | None):
+        """
+        Change the bounds of the world, such as when the grid is zoomed, keeping the offset within them.
+        """
+
+        self.__world_bounds = world_bounds
+        self.__clamp()
+
+    def visible_rect(self) -> pg.Rect:
+        """
+        The area of the world that is currently within view.
+        """
+
+        return pg.Rect(self.offset, (self.__view_width, self.__view_height))
+
+    def visible_tile_range(
+        self,
+        grid_topleft: tuple[int, int],
+        tile_render_size: tuple[int, int],
+        grid_size: tuple[int, int],
+    ) -> tuple[range, range]:
+        """
+        The columns and rows of the tiles that intersect the area within view.
+        """
+
+        # Unpacking tuples
+        view_left, view_top = self.offset
+        grid_left, grid_top = grid_topleft
+        tile_width, tile_height = tile_render_size
+        grid_cols, grid_rows = grid_size
+
+        first_col = max((view_left - grid_left) // tile_width, 0)
+        first_row = max((view_top - grid_top) // tile_height, 0)
+        last_col = min(
+            (view_left + self.__view_width - 1 - grid_left) // tile_width,
+            grid_cols - 1,
+        )
+        last_row = min(
+            (view_top + self.__view_height - 1 - grid_top) // tile_height,
+            grid_rows - 1,
+        )
+
+        return (range(first_col, last_col + 1), range(first_row, last_row + 1))
+
+    def __clamp(self):
+        """
+        Keep the offset within the world bounds. If the world is smaller than the view, it stays at the top left.
+        """
+
+        if self.__world_bounds is None:
+            return
+
+        offset_x, offset_y = self.offset
+        max_x = max(self.__world_bounds.right - self.__view_width, 0)
+        max_y = max(self.__world_bounds.bottom - self.__view_height, 0)
+
+        self.offset = (
+            min(max(offset_x, min(self.__world_bounds.left, 0)), max_x),
+            min(max(offset_y, min(self.__world_bounds.top, 0)), max_y),
+        )
@@ -0,0 +1,376 @@
+import time
+import random
+import hashlib
+from collections import OrderedDict
+from tile_type import TileType
+from board import NO_FLAG, CERTAIN_FLAG, UNCERTAIN_FLAG
+from utility import count_all_neighbors
+
+# Chunks are square, with CHUNK_SIZE cells along each side
+CHUNK_SIZE = 32
+CHUNK_CELLS = CHUNK_SIZE * CHUNK_SIZE
+
+# Chunks with nothing revealed or flagged can be created again from their seed, so only this many are kept
+MAX_COLD_CHUNKS = 256
+# Bomb masks of chunks are kept for counting the neighbors of the chunks next to them
+MAX_CACHED_BOMB_MASKS = 1024
+
+# Empty cells join up into an endless flood when more than about 40% of cells are empty (the site percolation
+# threshold of a square grid with diagonal neighbors), so the density has to keep them well below that
+MAX_EMPTY_CELL_FRACTION = 0.35
+
+# Every cell of a chunk that was never materialized is unclicked
+UNCLICKED_CHUNK = bytes([TileType.UNCLICKED.value]) * CHUNK_CELLS
+
+
+def chunk_seed(seed: int, chunk: tuple[int, int]) -> int:
+    """
+    The seed of the bombs in a chunk, derived from the board seed and the chunk's coordinates.
+    """
+
+    chunk_col, chunk_row = chunk
+    digest = hashlib.blake2b(
+        f"{seed}:{chunk_col}:{chunk_row}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little")
+
+
+class Chunk:
+    """
+    The cell state of one chunk of an endless board, stored the same way as a Board, in flat `bytearray`s indexed
+    as `row * CHUNK_SIZE + col`.
+    """
+
+    def __init__(self, bombs: bytes, neighbors: bytearray):
+        self.bombs = bombs
+        self.neighbors = neighbors
+        self.revealed = bytearray(CHUNK_CELLS)
+        self.flags = bytearray(CHUNK_CELLS)
+        self.tile_types = bytearray(UNCLICKED_CHUNK)
+
+        # A chunk the player has revealed or flagged a cell in can no longer be created again from its seed
+        self.touched = False
+
+
+class EndlessBoard:
+    """
+    EndlessBoard is a board without edges, split into chunks of CHUNK_SIZE x CHUNK_SIZE cells.
+
+    Each chunk has the same number of bombs, placed from a seed hashed from the board seed and the chunk's
+    coordinates, so any chunk can be created on its own, in any order. A chunk is only materialized when a reveal,
+    flag or query reaches it; until then every one of its cells is unclicked, which is all a renderer needs.
+    Neighbor counts along the edges of a chunk come from the bomb masks of the chunks around it.
+
+    Chunks the player has touched are kept, so memory grows with the area explored. Untouched chunks are evicted,
+    least recently used first, once there are more than MAX_COLD_CHUNKS of them.
+
+    Cells are addressed by global (col, row), which can be negative. There is no win, the game goes on until a bomb
+    is revealed.
+    """
+
+    def __init__(self, seed: int, bomb_density: float, debug_mode: bool = False):
+        self.__seed = seed
+        self.__debug_mode = debug_mode
+        self.bombs_per_chunk = round(bomb_density * CHUNK_CELLS)
+
+        if (1 - self.bombs_per_chunk / CHUNK_CELLS) ** 9 > MAX_EMPTY_CELL_FRACTION:
+            raise ValueError(
+                f"A bomb density of {bomb_density} leaves too many empty cells, reveals would flood forever."
+            )
+
+        # Chunk state
+        self.__chunks: dict[tuple[int, int], Chunk] = {}
+        self.__cold_chunks: OrderedDict[tuple[int, int], None] = OrderedDict()
+        self.__bomb_masks: OrderedDict[tuple[int, int], bytes] = OrderedDict()
+        self.__touched_chunks = 0
+
+        # Cells changed by the last reveal or flag click, as (col, row)
+        self.last_changed: list[tuple[int, int]] = []
+
+        # Game state
+        self.cells_revealed = 0
+        self.certain_flags = 0
+        self.game_was_won: bool = False
+        self.game_was_lost: bool = False
+        self.__first_click_occured_at: float | None = None
+        self.__game_ended_at: float | None = None
+
+    # == Public Methods ==
+    @property
+    def flags_remaining(self) -> int:
+        """
+        The bombs in the chunks explored so far, less the certain flags placed.
+        """
+
+        return self.__touched_chunks * self.bombs_per_chunk - self.certain_flags
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.__chunks)
+
+    def reveal_click(self, col_row_clicked: tuple[int, int]) -> bool:
+        """
+        Reveal the cell at column and row, flooding out from it if it is empty. The flood can cross into any chunk.
+
+        Returning `False` if a bomb was revealed, which ends the game, otherwise `True`.
+        """
+
+        self.last_changed = []
+        if self.game_was_lost:
+            return False
+
+        if self.__first_click_occured_at is None:
+            self.__first_click_occured_at = time.time()
+
+        chunk, index = self.__cell(col_row_clicked)
+        if chunk.flags[index] == CERTAIN_FLAG or chunk.revealed[index]:
+            return True
+
+        # Touched before the bomb check, so a chunk with a revealed bomb is kept
+        self.__touch(col_row_clicked, chunk)
+        if chunk.bombs[index]:
+            self.__reveal(chunk, index)
+            self.last_changed = [col_row_clicked]
+            self.game_was_lost = True
+            self.__game_ended_at = time.time()
+            return False
+
+        self.last_changed = self.__flood_tiles(col_row_clicked)
+        self.cells_revealed += len(self.last_changed)
+        return True
+
+    def flag_click(self, col_row_clicked: tuple[int, int]):
+        """
+        Cycle the flag on the cell at column and row, the same as `Board.flag_click`.
+        """
+
+        self.last_changed = []
+        if self.game_was_lost:
+            return
+
+        chunk, index = self.__cell(col_row_clicked)
+        if chunk.revealed[index]:
+            return
+
+        self.__touch(col_row_clicked, chunk)
+        self.last_changed = [col_row_clicked]
+
+        flag = chunk.flags[index]
+        if flag == NO_FLAG:
+            chunk.flags[index] = CERTAIN_FLAG
+            chunk.tile_types[index] = TileType.UNCLICKED_CERTAIN.value
+            self.certain_flags += 1
+
+        elif flag == CERTAIN_FLAG:
+            chunk.flags[index] = UNCERTAIN_FLAG
+            chunk.tile_types[index] = TileType.UNCLICKED_UNCERTAIN.value
+            self.certain_flags -= 1
+
+        else:
+            chunk.flags[index] = NO_FLAG
+            chunk.tile_types[index] = TileType.UNCLICKED.value
+
+    def has_bomb(self, col_row: tuple[int, int]) -> bool:
+        chunk, index = self.__cell(col_row)
+        return bool(chunk.bombs[index])
+
+    def was_revealed(self, col_row: tuple[int, int]) -> bool:
+        chunk, index = self.__cell(col_row)
+        return bool(chunk.revealed[index])
+
+    def has_flag(self, col_row: tuple[int, int]) -> bool:
+        chunk, index = self.__cell(col_row)
+        return chunk.flags[index] == CERTAIN_FLAG
+
+    def num_neighbors(self, col_row: tuple[int, int]) -> int:
+        chunk, index = self.__cell(col_row)
+        return chunk.neighbors[index]
+
+    def chunk_tile_types(self, chunk: tuple[int, int]) -> bytes | bytearray:
+        """
+        The TileType values of every cell in a chunk, for rendering. A chunk that is not materialized is not created.
+        """
+
+        materialized = self.__chunks.get(chunk)
+        if materialized is None:
+            return UNCLICKED_CHUNK
+
+        return materialized.tile_types
+
+    def tile_type(self, col_row: tuple[int, int]) -> TileType:
+        col, row = col_row
+        chunk_col, local_col = divmod(col, CHUNK_SIZE)
+        chunk_row, local_row = divmod(row, CHUNK_SIZE)
+        tile_types = self.chunk_tile_types((chunk_col, chunk_row))
+        return TileType(tile_types[local_row * CHUNK_SIZE + local_col])
+
+    def elapsed_time(self) -> float:
+        """
+        Seconds since the first click, stopping when the game ends.
+        """
+
+        if self.__first_click_occured_at is None:
+            return 0.0
+
+        if self.__game_ended_at is not None:
+            return self.__game_ended_at - self.__first_click_occured_at
+
+        return time.time() - self.__first_click_occured_at
+
+    # == Private Methods ==
+    def __cell(self, col_row: tuple[int, int]) -> tuple[Chunk, int]:
+        """
+        The chunk a cell is in, materializing it if needed, and the cell's index within the chunk.
+        """
+
+        col, row = col_row
+        chunk_col, local_col = divmod(col, CHUNK_SIZE)
+        chunk_row, local_row = divmod(row, CHUNK_SIZE)
+        return self.__chunk((chunk_col, chunk_row)), local_row * CHUNK_SIZE + local_col
+
+    def __chunk(self, chunk: tuple[int, int]) -> Chunk:
+        """
+        The chunk at chunk coordinates, materializing it from its seed if it does not exist.
+        """
+
+        materialized = self.__chunks.get(chunk)
+        if materialized is not None:
+            if chunk in self.__cold_chunks:
+                self.__cold_chunks.move_to_end(chunk)
+            return materialized
+
+        materialized = Chunk(self.__bomb_mask(chunk), self.__count_bombs(chunk))
+        self.__chunks[chunk] = materialized
+        self.__cold_chunks[chunk] = None
+
+        # Untouched chunks can be created again from their seed, so the coldest are dropped
+        if len(self.__cold_chunks) > MAX_COLD_CHUNKS:
+            evicted, _ = self.__cold_chunks.popitem(last=False)
+            del self.__chunks[evicted]
+
+        if self.__debug_mode:
+            print(f"DEBUG: Materialized chunk {chunk}, {len(self.__chunks)} in memory")
+
+        return materialized
+
+    def __touch(self, col_row: tuple[int, int], chunk: Chunk):
+        """
+        Mark a chunk as changed by the player, so it is never evicted.
+        """
+
+        if chunk.touched:
+            return
+
+        chunk.touched = True
+        self.__touched_chunks += 1
+        col, row = col_row
+        self.__cold_chunks.pop((col // CHUNK_SIZE, row // CHUNK_SIZE), None)
+
+    def __bomb_mask(self, chunk: tuple[int, int]) -> bytes:
+        """
+        The bombs of a chunk, one byte per cell, placed from the chunk's seed.
+        """
+
+        bombs = self.__bomb_masks.get(chunk)
+        if bombs is not None:
+            self.__bomb_masks.move_to_end(chunk)
+            return bombs
+
+        materialized = self.__chunks.get(chunk)
+        if materialized is not None:
+            return materialized.bombs
+
+        mask = bytearray(CHUNK_CELLS)
+        rng = random.Random(chunk_seed(self.__seed, chunk))
+        for index in rng.sample(range(CHUNK_CELLS), self.bombs_per_chunk):
+            mask[index] = 1
+        bombs = bytes(mask)
+
+        self.__bomb_masks[chunk] = bombs
+        if len(self.__bomb_masks) > MAX_CACHED_BOMB_MASKS:
+            self.__bomb_masks.popitem(last=False)
+
+        return bombs
+
+    def __count_bombs(self, chunk: tuple[int, int]) -> bytearray:
+        """
+        Count the neighboring bombs of every cell in a chunk, including the bombs just over its edges.
+
+        The chunk's bombs are copied into a mask one cell larger on every side, with the edge rows and columns of the
+        8 chunks around it filled in, then counted in one pass.
+        """
+
+        chunk_col, chunk_row = chunk
+        size, padded_size = CHUNK_SIZE, CHUNK_SIZE + 2
+        padded = bytearray(padded_size * padded_size)
+
+        def around(col_change: int, row_change: int) -> bytes:
+            return self.__bomb_mask((chunk_col + col_change, chunk_row + row_change))
+
+        bombs = around(0, 0)
+        above, below = around(0, -1), around(0, 1)
+        left, right = around(-1, 0), around(1, 0)
+        for row in range(size):
+            start = (row + 1) * padded_size
+            padded[start + 1 : start + 1 + size] = bombs[row * size : (row + 1) * size]
+            padded[start] = left[row * size + size - 1]
+            padded[start + size + 1] = right[row * size]
+
+        bottom_start = (size + 1) * padded_size
+        padded[1 : 1 + size] = above[(size - 1) * size :]
+        padded[bottom_start + 1 : bottom_start + 1 + size] = below[:size]
+
+        # Corners
+        padded[0] = around(-1, -1)[CHUNK_CELLS - 1]
+        padded[size + 1] = around(1, -1)[(size - 1) * size]
+        padded[bottom_start] = around(-1, 1)[size - 1]
+        padded[bottom_start + size + 1] = around(1, 1)[0]
+
+        counts = count_all_neighbors(padded, padded_size, padded_size)
+        neighbors = bytearray()
+        for row in range(size):
+            start = (row + 1) * padded_size + 1
+            neighbors += counts[start : start + size]
+
+        return neighbors
+
+    def __reveal(self, chunk: Chunk, index: int):
+        """
+        Reveal a single cell. Revealing a cell will remove any flags that were on it.
+        """
+
+        chunk.revealed[index] = 1
+        if chunk.flags[index] == CERTAIN_FLAG:
+            self.certain_flags -= 1
+        chunk.flags[index] = NO_FLAG
+
+        if chunk.bombs[index]:
+            chunk.tile_types[index] = TileType.BOMB_A.value
+        else:
+            chunk.tile_types[index] = chunk.neighbors[index] + 1
+
+    def __flood_tiles(self, first_cell: tuple[int, int]) -> list[tuple[int, int]]:
+        """
+        Reveal the first cell and, if it is empty, flood out through the connected empty cells and every cell
+        neighboring them, across chunks. Returns the cells that were revealed.
+        """
+
+        revealed_cells: list[tuple[int, int]] = []
+        to_visit_list = [first_cell]
+        while to_visit_list:
+            col_row = to_visit_list.pop()
+            chunk, index = self.__cell(col_row)
+            if chunk.revealed[index]:
+                continue
+
+            self.__touch(col_row, chunk)
+            self.__reveal(chunk, index)
+            revealed_cells.append(col_row)
+
+            if chunk.neighbors[index] == 0:
+                col, row = col_row
+                for check_row in (row - 1, row, row + 1):
+                    for check_col in (col - 1, col, col + 1):
+                        to_visit_list.append((check_col, check_row))
+
+        return revealed_cells
@@ -0,0 +1,232 @@
+from itertools import chain, repeat
+from collections.abc import Iterable
+import pygame as pg
+from tileset import TileType, Tileset
+from camera import Camera
+from endless_board import CHUNK_SIZE, EndlessBoard
+from grid import MAX_DIRTY_RECTS
+from bomb_animation import BombAnimator
+
+
+class EndlessGrid:
+    """
+    EndlessGrid is the view over an EndlessBoard, drawing the tiles within view of the camera straight from the tile
+    types of each chunk, the same way as the atlas renderer of Grid.
+
+    It has the same methods as Grid that the game uses, so the game can be played on either.
+    """
+
+    def __init__(
+        self,
+        tileset: Tileset,
+        tile_render_size: tuple[int, int],
+        board: EndlessBoard,
+        grid_topleft: tuple[int, int],
+    ):
+        self.__tileset = tileset
+        self.__tile_render_width, self.__tile_render_height = tile_render_size
+        self.__grid_left, self.__grid_top = grid_topleft
+        self.board = board
+
+        # Rendering state
+        self.__pressed_tile: tuple[int, int] | None = None
+        self.__dirty_tiles: set[tuple[int, int]] = set()
+        self.__visible_tiles: tuple[range, range] = (range(0), range(0))
+        self.__positions: list[tuple[int, int]] = []
+        self.__camera_offset: tuple[int, int] | None = None
+
+        # The board has no end, so only the bomb that was clicked explodes
+        self.__bomb_animator = BombAnimator()
+
+    # == Win state ==
+    @property
+    def flags_remaining(self) -> int:
+        return self.board.flags_remaining
+
+    @property
+    def game_was_won(self) -> bool:
+        return self.board.game_was_won
+
+    @property
+    def game_was_lost(self) -> bool:
+        return self.board.game_was_lost
+
+    # == Public Methods ==
+    def contains(self, col_row: tuple[int, int]) -> bool:
+        # The board has no edges
+        return True
+
+    def reveal_click(self, col_row_clicked: tuple[int, int]) -> bool:
+        bomb_not_clicked = self.board.reveal_click(col_row_clicked)
+        self.__dirty_tiles.update(self.board.last_changed)
+        if not bomb_not_clicked:
+            self.__bomb_animator.explode(col_row_clicked, pg.time.get_ticks())
+        return bomb_not_clicked
+
+    def flag_click(self, col_row_clicked: tuple[int, int]):
+        self.board.flag_click(col_row_clicked)
+        self.__dirty_tiles.update(self.board.last_changed)
+
+    def undo(self) -> bool:
+        # No history is kept for endless boards
+        return False
+
+    def redo(self) -> bool:
+        return False
+
+    def set_pressed_tile(self, col_row: tuple[int, int] | None):
+        """
+        Show the tile at column and row as "pressed", or no tile if `None`.
+        """
+
+        if col_row == self.__pressed_tile:
+            return
+
+        if self.__pressed_tile is not None:
+            self.__dirty_tiles.add(self.__pressed_tile)
+
+        self.__pressed_tile = None
+        if col_row is not None and self.board.tile_type(col_row) == TileType.UNCLICKED:
+            self.__pressed_tile = col_row
+            self.__dirty_tiles.add(col_row)
+
+    @property
+    def is_animating(self) -> bool:
+        return self.__bomb_animator.is_animating
+
+    def update_animations(self, now_ms: int):
+        if self.__bomb_animator.is_animating:
+            self.__dirty_tiles.update(self.__bomb_animator.advance(now_ms))
+
+    def set_tile_render_size(self, tile_render_size: tuple[int, int]):
+        self.__tile_render_width, self.__tile_render_height = tile_render_size
+        self.__camera_offset = None
+
+    def world_rect(self) -> None:
+        # There is no edge for the camera to stop at
+        return None
+
+    def draw(self, screen: pg.Surface, camera: Camera):
+        """
+        Draw every tile within view of the camera, with a single batched blit.
+        """
+
+        self.__dirty_tiles.clear()
+        self.__update_positions(camera)
+        visible_cols, visible_rows = self.__visible_tiles
+
+        tile_types = chain.from_iterable(
+            self.__row_tile_types(row, visible_cols) for row in visible_rows
+        )
+        tiles = map(self.__tileset.get_tiles().__getitem__, tile_types)
+        screen.fblits(zip(tiles, self.__positions))
+
+        for col_row in self.__bomb_animator.exploded_tiles():
+            col, row = col_row
+            if col in visible_cols and row in visible_rows:
+                self.__draw_tile(screen, camera, col_row)
+
+        if self.__pressed_tile is not None:
+            self.__draw_tile(screen, camera, self.__pressed_tile)
+
+    def draw_dirty(self, screen: pg.Surface, camera: Camera) -> list[pg.Rect]:
+        """
+        Draw only the tiles within view that changed since the last draw.
+
+        Returns the rects that were drawn to, to be passed to `pg.display.update`.
+        """
+
+        self.__update_positions(camera)
+        visible_cols, visible_rows = self.__visible_tiles
+
+        # When more tiles changed than can be seen, it is cheaper to draw everything in view
+        if len(self.__dirty_tiles) > len(self.__positions):
+            self.draw(screen, camera)
+            return [screen.get_rect()]
+
+        dirty_rects: list[pg.Rect] = []
+        for col_row in self.__dirty_tiles:
+            col, row = col_row
+            if col in visible_cols and row in visible_rows:
+                dirty_rects.append(self.__draw_tile(screen, camera, col_row))
+        self.__dirty_tiles.clear()
+
+        if len(dirty_rects) > MAX_DIRTY_RECTS:
+            return [dirty_rects[0].unionall(dirty_rects)]
+
+        return dirty_rects
+
+    # == Private Methods ==
+    def __row_tile_types(self, row: int, cols: range) -> Iterable[int]:
+        """
+        The tile types of a row of cells, sliced out of every chunk the columns cross.
+        """
+
+        chunk_row, local_row = divmod(row, CHUNK_SIZE)
+        row_start = local_row * CHUNK_SIZE
+
+        slices = []
+        col = cols.start
+        while col < cols.stop:
+            chunk_col, local_col = divmod(col, CHUNK_SIZE)
+            span = min(CHUNK_SIZE - local_col, cols.stop - col)
+            tile_types = self.board.chunk_tile_types((chunk_col, chunk_row))
+            slices.append(
+                tile_types[row_start + local_col : row_start + local_col + span]
+            )
+            col += span
+
+        return chain.from_iterable(slices)
+
+    def __draw_tile(
+        self, screen: pg.Surface, camera: Camera, col_row: tuple[int, int]
+    ) -> pg.Rect:
+        bomb_frame = self.__bomb_animator.frame(col_row)
+        if col_row == self.__pressed_tile:
+            tile = self.__tileset.get_tile(TileType.CLICKED_EMPTY)
+        elif bomb_frame is not None:
+            tile = self.__tileset.get_tile(bomb_frame)
+        else:
+            tile = self.__tileset.get_tile(self.board.tile_type(col_row))
+
+        col, row = col_row
+        offset_x, offset_y = camera.offset
+        tile_x = self.__grid_left + (col * self.__tile_render_width) - offset_x
+        tile_y = self.__grid_top + (row * self.__tile_render_height) - offset_y
+        return screen.blit(tile, (tile_x, tile_y))
+
+    def __update_positions(self, camera: Camera):
+        """
+        Work out the columns and rows within view, and the screen position of each of their tiles in the order they
+        are drawn. Only done again once the camera moves.
+        """
+
+        if camera.offset == self.__camera_offset:
+            return
+        self.__camera_offset = camera.offset
+
+        view = camera.visible_rect()
+        first_col = (view.left - self.__grid_left) // self.__tile_render_width
+        first_row = (view.top - self.__grid_top) // self.__tile_render_height
+        last_col = (view.right - 1 - self.__grid_left) // self.__tile_render_width
+        last_row = (view.bottom - 1 - self.__grid_top) // self.__tile_render_height
+        visible_cols = range(first_col, last_col + 1)
+        visible_rows = range(first_row, last_row + 1)
+        self.__visible_tiles = (visible_cols, visible_rows)
+
+        offset_x, offset_y = camera.offset
+        tile_xs = [
+            self.__grid_left + (col * self.__tile_render_width) - offset_x
+            for col in visible_cols
+        ]
+        self.__positions = list(
+            chain.from_iterable(
+                zip(
+                    tile_xs,
+                    repeat(
+                        self.__grid_top + (row * self.__tile_render_height) - offset_y
+                    ),
+                )
+                for row in visible_rows
+            )
+        )
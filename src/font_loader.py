@@ -0,0 +1,25 @@
+import pygame as pg
+
+
+class LazyFont:
+    """
+    LazyFont holds onto the path and size of a font, and only loads it the first time text needs to be rendered.
+    This keeps loading the font file out of the time it takes to show the first frame.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.__path = path
+        self.__size = size
+        self.__font: pg.Font | None = None
+
+    def get(self) -> pg.Font:
+        """
+        The loaded font, loading it on the first call.
+        """
+
+        if self.__font is None:
+            if not pg.font.get_init():
+                pg.font.init()
+            self.__font = pg.font.Font(self.__path, self.__size)
+
+        return self.__font
@@ -0,0 +1,209 @@
+import csv
+import time
+from array import array
+import pygame as pg
+from font_loader import LazyFont
+
+# Frames kept in the ring buffer, the percentiles are worked out over these
+PROFILER_CAPACITY = 1024
+OVERLAY_REFRESH_MS = 250
+OVERLAY_PADDING = 4
+
+
+class FrameProfiler:
+    """
+    FrameProfiler times each stage of a frame with `perf_counter_ns`, keeping the last `capacity` frames in a
+    fixed-size ring buffer.
+
+    Stages are timed back to back: `begin_frame` starts the clock, and each `mark` records the time since the previous
+    mark against a stage. Nothing is allocated while recording, so it can run every frame.
+    """
+
+    def __init__(self, stages: list[str], capacity: int = PROFILER_CAPACITY):
+        self.stages = stages
+        self.capacity = capacity
+
+        # One row of stage times per frame, stored flat as `frame * len(stages) + stage`
+        self.__times = array("q", bytes(8 * capacity * len(stages)))
+        self.__frame = 0
+        self.__frames_recorded = 0
+        self.__row_start = 0
+        self.__last_mark_at = 0
+
+    # == Recording ==
+    def begin_frame(self):
+        self.__row_start = self.__frame * len(self.stages)
+        self.__last_mark_at = time.perf_counter_ns()
+
+    def mark(self, stage: int):
+        """
+        Record the time since the last mark, or the start of the frame, against a stage.
+        """
+
+        now = time.perf_counter_ns()
+        self.__times[self.__row_start + stage] = now - self.__last_mark_at
+        self.__last_mark_at = now
+
+    def end_frame(self):
+        self.__frame = (self.__frame + 1) % self.capacity
+        self.__frames_recorded = min(self.__frames_recorded + 1, self.capacity)
+
+    # == Reporting ==
+    def stage_times(self, stage: int) -> list[int]:
+        """
+        The recorded times of a stage in nanoseconds, oldest first.
+        """
+
+        num_stages = len(self.stages)
+        first_frame = (self.__frame - self.__frames_recorded) % self.capacity
+        return [
+            self.__times[((first_frame + frame) % self.capacity) * num_stages + stage]
+            for frame in range(self.__frames_recorded)
+        ]
+
+    def percentiles(
+        self, stage: int, points: tuple[int, ...] = (50, 95, 99)
+    ) -> list[int]:
+        """
+        The times of a stage at each percentile, in nanoseconds, by nearest rank.
+        """
+
+        times = sorted(self.stage_times(stage))
+        if not times:
+            return [0] * len(points)
+
+        return [
+            times[min(len(times) - 1, max(0, -(-point * len(times) // 100) - 1))]
+            for point in points
+        ]
+
+    def dump_csv(self, path: str):
+        """
+        Write every recorded frame to a CSV file, oldest first, with a column of nanoseconds per stage.
+        """
+
+        columns = [self.stage_times(stage) for stage in range(len(self.stages))]
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame", *self.stages])
+            for frame, row in enumerate(zip(*columns)):
+                writer.writerow([frame, *row])
+
+
+class ProfilerOverlay:
+    """
+    ProfilerOverlay draws the p50/p95/p99 of every stage of a FrameProfiler in the top left of the screen.
+
+    The numbers are worked out a few times a second, and a line of text is only rendered again when it changes.
+    """
+
+    def __init__(self, profiler: FrameProfiler, font: LazyFont):
+        self.profiler = profiler
+        self.__font = font
+
+        self.__lines: list[tuple[str, ...]] = []
+        self.__line_surfaces: list[list[pg.Surface]] = []
+        self.__panel: pg.Surface | None = None
+        self.__panel_changed = False
+        self.__refreshed_at: int | None = None
+
+    def rect(self) -> pg.Rect:
+        if self.__panel is None:
+            return pg.Rect(0, 0, 0, 0)
+
+        return self.__panel.get_rect()
+
+    def draw(self, screen: pg.Surface, redraw: bool) -> pg.Rect | None:
+        """
+        Draw the overlay if its text changed, or if `redraw` is set because what was under it was drawn over.
+        Returns the area drawn to, or `None` if nothing was drawn.
+        """
+
+        now = pg.time.get_ticks()
+        if (
+            self.__refreshed_at is None
+            or now - self.__refreshed_at >= OVERLAY_REFRESH_MS
+        ):
+            self.__refreshed_at = now
+            self.__update_lines()
+
+        if self.__panel is None or not (redraw or self.__panel_changed):
+            return None
+
+        self.__panel_changed = False
+        return screen.blit(self.__panel, (0, 0))
+
+    def __update_lines(self):
+        """
+        Work out the text of every line, rendering only the lines that changed, and rebuild the panel if any did.
+        """
+
+        profiler = self.profiler
+        lines = [("stage", "p50", "p95", "p99 (us)")]
+        for stage, name in enumerate(profiler.stages):
+            lines.append(
+                (
+                    name,
+                    *(
+                        f"{time_ns / 1000:.1f}"
+                        for time_ns in profiler.percentiles(stage)
+                    ),
+                )
+            )
+
+        font = self.__font.get()
+        changed = False
+        for line_number, line in enumerate(lines):
+            if line_number < len(self.__lines) and self.__lines[line_number] == line:
+                continue
+
+            # Each column is rendered on its own, so the columns line up with a proportional font
+            surfaces = [font.render(text, True, "white") for text in line]
+            if line_number < len(self.__lines):
+                self.__lines[line_number] = line
+                self.__line_surfaces[line_number] = surfaces
+            else:
+                self.__lines.append(line)
+                self.__line_surfaces.append(surfaces)
+            changed = True
+
+        if changed:
+            self.__build_panel()
+
+    def __build_panel(self):
+        """
+        Lay the rendered lines out in columns onto a background, which covers the old text when it is drawn again.
+        The panel only ever grows, so longer text from earlier frames is always covered.
+        """
+
+        column_widths = [
+            max(surfaces[column].get_width() for surfaces in self.__line_surfaces)
+            for column in range(len(self.__line_surfaces[0]))
+        ]
+        line_height = max(
+            surface.get_height()
+            for surfaces in self.__line_surfaces
+            for surface in surfaces
+        )
+
+        width = sum(column_widths) + OVERLAY_PADDING * (len(column_widths) * 2 + 1)
+        height = line_height * len(self.__line_surfaces) + OVERLAY_PADDING * 2
+        if self.__panel is not None:
+            width = max(width, self.__panel.get_width())
+            height = max(height, self.__panel.get_height())
+
+        panel = pg.Surface((width, height))
+        panel.fill("black")
+        for line_number, surfaces in enumerate(self.__line_surfaces):
+            y = OVERLAY_PADDING + line_number * line_height
+            x = OVERLAY_PADDING
+            for column, surface in enumerate(surfaces):
+                # The stage names are left aligned, the times right aligned
+                offset = (
+                    0 if column == 0 else column_widths[column] - surface.get_width()
+                )
+                panel.blit(surface, (x + offset, y))
+                x += column_widths[column] + OVERLAY_PADDING * 2
+
+        self.__panel = panel
+        self.__panel_changed = True
@@ -1,8 +1,67 @@
+import math
+import time
 import random
+from enum import Enum, IntEnum
 import pygame as pg
 from tileset import Tileset
-from grid import Grid
-from utility import click_to_tile_coord, click_was_inside_grid
+from grid import Grid, Renderer
+from camera import Camera
+from font_loader import LazyFont
+from board_builder import BoardBuilder, BoardJob
+from board import Board, FirstClickMode, PlacementMode
+from recording import InputAction, Recording
+from frame_profiler import FrameProfiler, ProfilerOverlay
+from memory_report import MemoryOverlay, memory_report
+from hud import GameState, Hud
+from endless_board import EndlessBoard
+from endless_grid import EndlessGrid
+from history import HISTORY_MAX_BYTES
+from utility import click_to_tile_coord
+
+# Camera
+LOADING_FPS = 30  # frame rate of the screen shown while a board is generated
+LOADING_SCREEN_DELAY_MS = 200  # boards ready sooner than this are waited for without showing the loading screen
+CAMERA_PAN_SPEED = 800  # pixels per second, while an arrow key is held
+ZOOM_IN_KEYS = (pg.K_EQUALS, pg.K_PLUS, pg.K_KP_PLUS)
+ZOOM_OUT_KEYS = (pg.K_MINUS, pg.K_KP_MINUS)
+
+# Idle mode
+IDLE_TIMEOUT_MS = 1000  # longest the loop sleeps waiting for input, so the debug caption still refreshes
+MAX_FRAME_TIME_MS = (
+    50  # frame time used for movement is capped, so waking from a sleep does not jump
+)
+INPUT_EVENTS = (
+    pg.MOUSEBUTTONDOWN,
+    pg.MOUSEBUTTONUP,
+    pg.MOUSEMOTION,
+    pg.MOUSEWHEEL,
+    pg.KEYDOWN,
+    pg.KEYUP,
+)
+
+
+class RenderMode(Enum):
+    # Clear and redraw every tile, every frame
+    FULL = "full"
+    # Redraw and present only the tiles that changed since the last frame
+    DIRTY = "dirty"
+
+
+class FrameStage(IntEnum):
+    # Stages of a frame in `Game.start_game`, in the order they run
+    DEBUG = 0  # A
+    MOUSE = 1  # B
+    HELD = 2  # C
+    EVENTS = 3  # D
+    PRESS = 4  # E
+    PRESSED_TILE = 5  # F
+    RENDER = 6  # G
+    OVERLAY = 7  # H
+    DISPLAY = 8  # I
+    TICK = 9  # J
+
+
+FRAME_STAGES = [stage.name.lower() for stage in FrameStage]
 
 
 class Game:
@@ -18,13 +77,43 @@ class Game:
         screen: pg.Surface,
         num_of_bombs: int,
         rng: random.Random,
-        font: pg.Font,
+        font: LazyFont,
         grid_size: tuple[int, int],
         grid_topleft: tuple[int, int] = (0, 0),
         debug_mode: bool = False,
+        bomb_placement: PlacementMode = PlacementMode.SAMPLE,
+        render_mode: RenderMode = RenderMode.FULL,
+        renderer: Renderer = Renderer.SPRITES,
+        no_guess: bool = False,
+        idle_mode: bool = False,
+        recording: Recording | None = None,
+        board: Board | None = None,
+        profiler: FrameProfiler | None = None,
+        profiler_overlay: ProfilerOverlay | None = None,
+        hud: Hud | None = None,
+        endless_bomb_density: float | None = None,
+        first_click: FirstClickMode = FirstClickMode.NONE,
+        zoom_levels: tuple[float, ...] = (),
+        history_max_bytes: int = HISTORY_MAX_BYTES,
+        memory_overlay: MemoryOverlay | None = None,
+        save_path: str | None = None,
     ):
         """
         A game instance should returned a fully setup game, ready to play.
+
+        If a `recording` is given, every action made on the grid is added to it, along with the board the game ended on.
+        A `board` is played on instead of creating a new one. So is the board saved at `save_path`, which is loaded on
+        the background thread while the window shows the progress, rather than before the window opens.
+        A `profiler` created with `FRAME_STAGES` times every stage of the game loop, and `profiler_overlay` shows it.
+        With a `hud`, the flags remaining, timer and game state are shown, and the game stays open once it ends.
+        With an `endless_bomb_density`, the game is played on an endless board with that fraction of bombs instead.
+        `first_click` sets how a new board keeps bombs away from the first cell revealed.
+        `zoom_levels` are the tileset scales the mouse wheel and +/- keys zoom between.
+        Moves can be undone with Ctrl+Z and redone with Ctrl+Y, keeping up to `history_max_bytes` of history.
+        With a `memory_overlay`, M shows a report of the memory used, while tracemalloc is tracing, and hides it.
+
+        Fixed size boards are generated on a background thread while the window shows the progress, and the next
+        board is generated while the current one is played, so N starts a new game straight away.
         """
 
         if debug_mode:
@@ -41,62 +130,249 @@ class Game:
         self.__grid_size = grid_size
         self.__grid_topleft = grid_topleft
         self.__debug_mode = debug_mode
+        self.__bomb_placement = bomb_placement
+        self.__render_mode = render_mode
+        self.__renderer = renderer
+        self.__no_guess = no_guess
+        self.__idle_mode = idle_mode
+        self.__recording = recording
+        self.__profiler = profiler
+        self.__profiler_overlay = profiler_overlay
+        self.__hud = hud
+        self.__first_click = first_click
+        self.__zoom_levels = sorted({*zoom_levels, tileset.scale})
+        self.__history_max_bytes = history_max_bytes
+        self.__memory_overlay = memory_overlay
         self.__pressed_tile: None | tuple[int, int] = None
 
-        # Bomb grid
-        self.__grid = Grid(
-            self.__tileset,
-            (self.__tile_render_width, self.__tile_render_height),
-            self.__screen,
-            self.__num_of_bombs,
-            self.__rng,
-            self.__font,
+        # Boards of a fixed size are generated on a background thread, the board being waited for and the next one
+        self.__builder = BoardBuilder(
             self.__grid_size,
-            self.__grid_topleft,
+            self.__num_of_bombs,
             self.__debug_mode,
+            self.__bomb_placement,
+            self.__first_click,
+            self.__no_guess,
         )
+        self.__board_job: BoardJob | None = None
+        self.__next_board_job: BoardJob | None = None
+
+        # The next boards are seeded from a copy of the rng, so generating them ahead never changes the current game
+        self.__next_board_rng = random.Random()
+        self.__next_board_rng.setstate(self.__rng.getstate())
+        # Seeds of the rngs the board being played and the next board were generated from, the first board is
+        # generated from `rng` so its seed is not known here
+        self.__board_seed: int | None = None
+        self.__next_board_seed: int | None = None
+
+        # Camera scrolling over the grid, bounded by the grid once there is one
+        self.__camera = Camera(self.__screen.get_size(), None)
+
+        # Bomb grid, either a fixed size grid or an endless one, or none until the board being generated is ready
+        self.__grid: Grid | EndlessGrid | None = None
+        if endless_bomb_density is not None:
+            endless_board = EndlessBoard(
+                self.__rng.getrandbits(64), endless_bomb_density, self.__debug_mode
+            )
+            self.__grid = EndlessGrid(
+                self.__tileset,
+                self.__tile_render_size,
+                endless_board,
+                self.__grid_topleft,
+            )
+            self.__camera.set_world_bounds(self.__grid.world_rect())
+        elif board is not None:
+            self.__set_grid(self.__create_grid(board, None))
+        elif save_path is not None:
+            self.__board_job = self.__builder.load(save_path)
+        else:
+            self.__board_job = self.__builder.build(self.__rng)
 
         # complete iniialization
         print("DEBUG: Game Initialized")
 
-    def start_game(self, clock: pg.time.Clock, fps: int):
+    @property
+    def board(self) -> Board | EndlessBoard | None:
+        if self.__grid is None:
+            return None
+
+        return self.__grid.board
+
+    @property
+    def board_seed(self) -> int | None:
+        """
+        The seed of the rng the board being played was generated from, once N has started a new game.
+        `None` while playing the board the game started with, which was generated from the `rng` it was given.
+        """
+
+        return self.__board_seed
+
+    def start_game(
+        self,
+        clock: pg.time.Clock,
+        fps: int,
+        startup_began_at: float | None = None,
+    ):
         """
         Start the main game loop.
 
         Since this function performs rendering, we are passing in a pygame clock, and an fps variable.
+        In debug mode, if `startup_began_at` is given, the time from it until the first frame is shown is printed.
+
+        In idle mode, when nothing is pressed or moving the loop sleeps until the next event instead of drawing
+        frames at `fps`, and wakes up as soon as there is input.
         """
+
+        if not self.__wait_for_board(clock):
+            self.__builder.close()
+            return
+
         continue_game = True
         debug_timer = 0
+        redraw_everything = True
+        draw_hud = False
+
+        # Events taken off the queue while waiting in idle mode, handled in the next frame
+        waited_events: list[pg.event.Event] = []
+        events_received_at = time.perf_counter()
+
+        # Debug measurements, CPU use over the caption interval and the latency from input to the frame showing it
+        cpu_began_at = time.process_time()
+        wall_began_at = time.perf_counter()
+        input_latency_ms = 0.0
+
+        # Without a profiler, marking a stage does nothing
+        profiler = self.__profiler
+        mark_stage = profiler.mark if profiler is not None else lambda stage: None
         while continue_game:
+            if profiler is not None:
+                profiler.begin_frame()
+
             # A: Debug mode operations
             if self.__debug_mode:
                 debug_timer += clock.get_time()
                 if debug_timer > 500:
+                    cpu_now, wall_now = time.process_time(), time.perf_counter()
+                    cpu_use = (cpu_now - cpu_began_at) / (wall_now - wall_began_at)
+                    cpu_began_at, wall_began_at = cpu_now, wall_now
+
                     pg.display.set_caption(
                         f"FPS {int(clock.get_fps())} | {clock.get_time()}"
+                        f" | CPU {cpu_use:.0%} | Input {input_latency_ms:.1f}ms"
                     )
                     debug_timer = 0
 
-                # print(
-                #     f"DEBUG:\n\tTiles remaining: {self.__grid.remaining_tiles_to_reveal}\n\tFlags remaining: {self.__grid.flags_remaining}"
-                # )
+            mark_stage(FrameStage.DEBUG)
+
+            # print(
+            #     f"DEBUG:\n\tTiles remaining: {self.__grid.remaining_tiles_to_reveal}\n\tFlags remaining: {self.__grid.flags_remaining}"
+            # )
 
             # B: Get mouse position
             mouse_pos = pg.mouse.get_pos()
             mouse_col_row = click_to_tile_coord(
-                mouse_pos, self.__grid_topleft, self.__tile_render_size
+                mouse_pos,
+                self.__grid_topleft,
+                self.__tile_render_size,
+                self.__camera.offset,
             )
-            is_inside_grid = click_was_inside_grid(mouse_col_row, self.__grid_size)
+            game_over = self.__grid.game_was_won or self.__grid.game_was_lost
+            is_inside_grid = self.__grid.contains(mouse_col_row) and not game_over
+            mark_stage(FrameStage.MOUSE)
 
             # C: Get continuous state
             left_click_held, _, _ = pg.mouse.get_pressed()
+            mark_stage(FrameStage.HELD)
 
             # D: Handle all events from during last tick
-            for event in pg.event.get():
+            events = waited_events + pg.event.get()
+            if not waited_events:
+                events_received_at = time.perf_counter()
+            waited_events = []
+            received_input = False
+            for event in events:
+                if event.type in INPUT_EVENTS:
+                    received_input = True
+
                 if event.type == pg.QUIT:
                     # TODO: Exit straight away, instead of showing game over screen
                     continue_game = False
 
+                # Dragging with the middle mouse button pans the camera
+                if event.type == pg.MOUSEMOTION and event.buttons[1]:
+                    rel_x, rel_y = event.rel
+                    if self.__camera.pan((-rel_x, -rel_y)):
+                        redraw_everything = True
+
+                # Scrolling the mouse wheel zooms around the mouse, the +/- keys zoom around the center of the screen
+                zoom_step = 0
+                if event.type == pg.MOUSEWHEEL and event.y:
+                    zoom_step, zoom_anchor = (1 if event.y > 0 else -1), mouse_pos
+                elif (
+                    event.type == pg.KEYDOWN
+                    and event.key in ZOOM_IN_KEYS + ZOOM_OUT_KEYS
+                ):
+                    zoom_step = 1 if event.key in ZOOM_IN_KEYS else -1
+                    zoom_anchor = self.__screen.get_rect().center
+                if zoom_step and self.__zoom(zoom_step, zoom_anchor):
+                    redraw_everything = True
+
+                    # Later events in this frame hit-test against the new tile size
+                    mouse_col_row = click_to_tile_coord(
+                        mouse_pos,
+                        self.__grid_topleft,
+                        self.__tile_render_size,
+                        self.__camera.offset,
+                    )
+                    is_inside_grid = (
+                        self.__grid.contains(mouse_col_row) and not game_over
+                    )
+
+                # Ctrl+Z undoes the last move, Ctrl+Y or Ctrl+Shift+Z redoes it, even once the game has ended
+                if event.type == pg.KEYDOWN and event.mod & pg.KMOD_CTRL:
+                    redo = event.key == pg.K_y or (
+                        event.key == pg.K_z and event.mod & pg.KMOD_SHIFT
+                    )
+                    if redo or event.key == pg.K_z:
+                        changed = self.__grid.redo() if redo else self.__grid.undo()
+                        if changed and self.__recording is not None:
+                            self.__recording.record(
+                                InputAction.REDO if redo else InputAction.UNDO
+                            )
+                        self.__pressed_tile = None
+
+                # N starts a new game, on the board generated while this one was played
+                if (
+                    event.type == pg.KEYDOWN
+                    and event.key == pg.K_n
+                    and not event.mod & pg.KMOD_CTRL
+                    and self.__next_board_job is not None
+                ):
+                    if not self.__start_next_game(clock):
+                        continue_game = False
+                        break
+                    redraw_everything = True
+                    self.__pressed_tile = None
+                    game_over = False
+
+                # M takes a memory report and shows it, or hides the one shown
+                if (
+                    event.type == pg.KEYDOWN
+                    and event.key == pg.K_m
+                    and self.__memory_overlay is not None
+                ):
+                    if self.__memory_overlay.is_shown:
+                        self.__memory_overlay.show(None)
+                        redraw_everything = True
+                    else:
+                        self.__memory_overlay.show(
+                            memory_report(self.__grid, self.__tileset)
+                        )
+
+                # Window contents were lost, the next frame cannot only draw changes
+                if event.type == pg.WINDOWEXPOSED:
+                    redraw_everything = True
+
                 # Click started from in grid
                 if (
                     event.type == pg.MOUSEBUTTONDOWN
@@ -109,60 +385,320 @@ class Game:
                 if event.type == pg.MOUSEBUTTONUP:
                     if event.button == 1:
                         if is_inside_grid:
+                            if self.__recording is not None:
+                                self.__recording.record(
+                                    InputAction.REVEAL, mouse_col_row
+                                )
                             bomb_not_clicked = self.__grid.reveal_click(mouse_col_row)
 
                             # Bomb was clicked!
                             if not bomb_not_clicked and not self.__grid.game_was_won:
                                 # TODO: Write game over menu
                                 print(f"GAME OVER: Bomb was clicked at {mouse_col_row}")
-                                continue_game = False
+                                continue_game = self.__hud is not None
 
                             elif bomb_not_clicked and self.__grid.game_was_won:
                                 # TODO: Write game won menu
                                 print("DEBUG: [game.py] Game Won!")
-                                continue_game = False
+                                continue_game = self.__hud is not None
 
-                            # Always reset if left mouse button was pressed
-                            self.__pressed_tile = None
-                            left_click_held = False
+                        # Always reset if left mouse button was pressed, wherever it was let go
+                        self.__pressed_tile = None
+                        left_click_held = False
 
                     # Flaging tiles
                     elif event.button == 3 and is_inside_grid:
+                        if self.__recording is not None:
+                            self.__recording.record(InputAction.FLAG, mouse_col_row)
                         self.__grid.flag_click(mouse_col_row)
 
+            # Holding the arrow keys pans the camera
+            keys = pg.key.get_pressed()
+            frame_time = min(clock.get_time(), MAX_FRAME_TIME_MS)
+            pan_distance = CAMERA_PAN_SPEED * frame_time / 1000
+            pan_x = (keys[pg.K_RIGHT] - keys[pg.K_LEFT]) * pan_distance
+            pan_y = (keys[pg.K_DOWN] - keys[pg.K_UP]) * pan_distance
+            is_panning = bool(pan_x or pan_y)
+            if is_panning and self.__camera.pan((pan_x, pan_y)):
+                redraw_everything = True
+            mark_stage(FrameStage.EVENTS)
+
             # E: Manage "held press" tile state
             if left_click_held and is_inside_grid:
                 self.__pressed_tile = mouse_col_row
+            mark_stage(FrameStage.PRESS)
 
             # F: Pass pressed_tile state to grid
             if self.__pressed_tile is not None and is_inside_grid:
-                self.__grid.press_tile(self.__pressed_tile)
+                shown_pressed_tile = self.__pressed_tile
+            else:
+                shown_pressed_tile = None
+            self.__grid.set_pressed_tile(shown_pressed_tile)
+            if self.__recording is not None:
+                self.__recording.record_pressed_tile(shown_pressed_tile)
 
-                # Reset pressed_tile if mouse is outside grid
-                if not is_inside_grid:
-                    self.__pressed_tile = None
+            # Exploding bombs are moved on by clock time, so they play at the same speed at any frame rate
+            self.__grid.update_animations(pg.time.get_ticks())
+            mark_stage(FrameStage.PRESSED_TILE)
 
             # TODO: Clear the screen with a tileset specified background color
             #
             # G: Render frame
-            self.__screen.fill("black")
-            self.__grid.all_tiles.update()
-            self.__grid.all_tiles.draw(self.__screen)
+            if self.__render_mode == RenderMode.DIRTY and not redraw_everything:
+                dirty_rects = self.__grid.draw_dirty(self.__screen, self.__camera)
+            else:
+                self.__screen.fill("black")
+                self.__grid.draw(self.__screen, self.__camera)
+                dirty_rects = None
+                redraw_everything = False
 
-            # H: Debug rendering
-            if self.__debug_mode:
-                # self.__render_debug_overlay()
-                pass
+            # The HUD is drawn again where its values changed, or where tiles were drawn over it
+            if draw_hud:
+                self.__hud.update(
+                    self.__grid.flags_remaining,
+                    self.__game_state(),
+                    int(self.__grid.board.elapsed_time()),
+                )
+                redraw_hud = (
+                    dirty_rects is None
+                    or self.__hud.rect.collidelist(dirty_rects) != -1
+                )
+                hud_rects = self.__hud.draw(self.__screen, redraw_hud)
+                if dirty_rects is not None:
+                    dirty_rects.extend(hud_rects)
+            mark_stage(FrameStage.RENDER)
+
+            # H: Debug rendering, the overlay is drawn again when its text changes or tiles were drawn over it
+            if self.__profiler_overlay is not None:
+                redraw_overlay = (
+                    dirty_rects is None
+                    or self.__profiler_overlay.rect().collidelist(dirty_rects) != -1
+                )
+                overlay_rect = self.__profiler_overlay.draw(
+                    self.__screen, redraw_overlay
+                )
+                if overlay_rect is not None and dirty_rects is not None:
+                    dirty_rects.append(overlay_rect)
+            if self.__memory_overlay is not None:
+                redraw_overlay = (
+                    dirty_rects is None
+                    or self.__memory_overlay.rect(self.__screen).collidelist(
+                        dirty_rects
+                    )
+                    != -1
+                )
+                overlay_rect = self.__memory_overlay.draw(self.__screen, redraw_overlay)
+                if overlay_rect is not None and dirty_rects is not None:
+                    dirty_rects.append(overlay_rect)
+            mark_stage(FrameStage.OVERLAY)
 
             # I: Update display
+            if dirty_rects is None:
+                pg.display.flip()
+            elif dirty_rects:
+                pg.display.update(dirty_rects)
+            mark_stage(FrameStage.DISPLAY)
+
+            # The HUD is first drawn on the frame after the first, so loading its font stays out of the startup time
+            hud_is_new = self.__hud is not None and not draw_hud
+            draw_hud = self.__hud is not None
+
+            if self.__debug_mode and startup_began_at is not None:
+                startup_time = time.perf_counter() - startup_began_at
+                print(f"DEBUG: Startup took {startup_time * 1000:.1f}ms")
+                startup_began_at = None
+
+            if received_input:
+                input_latency_ms = (time.perf_counter() - events_received_at) * 1000
+
+            # J. Limit the frame rate, or sleep until the next event when there is nothing to update
+            needs_frames = (
+                shown_pressed_tile is not None
+                or left_click_held
+                or is_panning
+                or pg.mouse.get_pressed()[1]
+                or self.__grid.is_animating
+                or hud_is_new
+            )
+            if self.__idle_mode and continue_game and not needs_frames:
+                event = pg.event.wait(self.__idle_timeout_ms())
+                events_received_at = time.perf_counter()
+                if event.type != pg.NOEVENT:
+                    waited_events.append(event)
+                clock.tick()
+            else:
+                clock.tick(fps)
+            mark_stage(FrameStage.TICK)
+
+            if profiler is not None:
+                profiler.end_frame()
+
+        if self.__recording is not None:
+            self.__recording.finish(self.__grid.board)
+
+        # The next board will not be played
+        self.__builder.close()
+
+    def __create_grid(self, board: Board, board_seed: int | None) -> Grid:
+        """
+        Create the grid of a fixed size board. A no-guess board, generated from `board_seed`, has its first click
+        made for the player in the center, which it was generated to be solvable from.
+        """
+
+        grid = Grid(
+            self.__tileset,
+            (self.__tile_render_width, self.__tile_render_height),
+            self.__screen,
+            self.__num_of_bombs,
+            self.__rng,
+            self.__font,
+            self.__grid_size,
+            self.__grid_topleft,
+            self.__debug_mode,
+            self.__bomb_placement,
+            self.__renderer,
+            board,
+            self.__first_click,
+            self.__history_max_bytes,
+        )
+
+        if board_seed is not None:
+            if self.__debug_mode:
+                print(f"DEBUG: No-guess board generated from seed {board_seed:#x}")
+
+            first_click = (self.__grid_size[0] // 2, self.__grid_size[1] // 2)
+            if self.__recording is not None:
+                self.__recording.board_seed = board_seed
+                self.__recording.record(InputAction.REVEAL, first_click)
+            grid.reveal_click(first_click)
+
+        return grid
+
+    def __set_grid(self, grid: Grid):
+        """
+        Play on a new grid, and start generating the board after it.
+        """
+
+        self.__grid = grid
+        self.__camera.set_world_bounds(grid.world_rect())
+        self.__next_board_seed = self.__next_board_rng.getrandbits(64)
+        self.__next_board_job = self.__builder.build_in_worker(self.__next_board_seed)
+
+    def __wait_for_board(self, clock: pg.time.Clock) -> bool:
+        """
+        Show the progress of the board being generated or loaded until it is ready, handling events so the window stays
+        responsive, then play on it. Returns `False` if the window was closed first.
+        """
+
+        job = self.__board_job
+        if job is None:
+            return True
+
+        cols, rows = self.__grid_size
+        waiting_since = pg.time.get_ticks()
+        while not job.done():
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    return False
+
+            # Small boards are ready before the loading screen would show, which keeps the font from loading early
+            if pg.time.get_ticks() - waiting_since < LOADING_SCREEN_DELAY_MS:
+                clock.tick(LOADING_FPS)
+                continue
+
+            self.__screen.fill("black")
+            status = self.__font.get().render(
+                f"Preparing a {cols}x{rows} board: {job.status}", True, "white"
+            )
+            self.__screen.blit(
+                status, status.get_rect(center=self.__screen.get_rect().center)
+            )
             pg.display.flip()
+            clock.tick(LOADING_FPS)
 
-            # J: Unpress the tile after rendering
-            if self.__pressed_tile is not None and is_inside_grid:
-                self.__grid.unpress_tile(self.__pressed_tile)
+        self.__board_job = None
+        self.__set_grid(self.__create_grid(*job.result()))
+        return True
+
+    def __start_next_game(self, clock: pg.time.Clock) -> bool:
+        """
+        Start a new game on the next board, waiting for it if it is still being generated.
+        Returns `False` if the window was closed while waiting.
+        """
+
+        # The recording only covers the game it was started with
+        if self.__recording is not None and self.__grid is not None:
+            self.__recording.finish(self.__grid.board)
+            self.__recording = None
+
+        if self.__debug_mode:
+            print("DEBUG: Starting a new game")
+
+        board_seed = self.__next_board_seed
+        self.__board_job, self.__next_board_job = self.__next_board_job, None
+        if not self.__wait_for_board(clock):
+            return False
+
+        self.__board_seed = board_seed
+        return True
+
+    def __zoom(self, step: int, anchor: tuple[int, int]) -> bool:
+        """
+        Move up or down the zoom levels by `step`, keeping the point of the world under `anchor` on the screen still.
+        Returns whether the zoom level changed.
+        """
+
+        scale = self.__tileset.scale
+        level = self.__zoom_levels.index(scale) + step
+        if not 0 <= level < len(self.__zoom_levels):
+            return False
+
+        # Where the anchor is over the grid, in tiles, so it can be found again at the new tile size
+        anchor_x, anchor_y = anchor
+        offset_x, offset_y = self.__camera.offset
+        grid_left, grid_top = self.__grid_topleft
+        anchor_col = (anchor_x + offset_x - grid_left) / self.__tile_render_width
+        anchor_row = (anchor_y + offset_y - grid_top) / self.__tile_render_height
+
+        self.__tileset.set_scale(self.__zoom_levels[level])
+        self.__tile_render_size = self.__tileset.tile_render_size
+        self.__tile_render_width, self.__tile_render_height = self.__tile_render_size
+        self.__grid.set_tile_render_size(self.__tile_render_size)
+
+        self.__camera.set_world_bounds(self.__grid.world_rect())
+        self.__camera.pan(
+            (
+                grid_left + anchor_col * self.__tile_render_width - anchor_x - offset_x,
+                grid_top + anchor_row * self.__tile_render_height - anchor_y - offset_y,
+            )
+        )
+
+        if self.__debug_mode:
+            print(f"DEBUG: Zoomed to x{self.__zoom_levels[level]}")
+
+        return True
+
+    def __game_state(self) -> GameState:
+        if self.__grid.game_was_won:
+            return GameState.WON
+        if self.__grid.game_was_lost:
+            return GameState.LOST
+        return GameState.PLAYING
+
+    def __idle_timeout_ms(self) -> int:
+        """
+        How long the loop can sleep waiting for input. While the HUD timer is running, it wakes up for the next second.
+        """
+
+        board = self.__grid.board
+        elapsed_time = board.elapsed_time()
+        timer_is_running = (
+            elapsed_time > 0 and not board.game_was_won and not board.game_was_lost
+        )
+        if self.__hud is None or not timer_is_running:
+            return IDLE_TIMEOUT_MS
 
-            # K. Limit the frame rate
-            clock.tick(fps)
+        return min(IDLE_TIMEOUT_MS, math.ceil((1 - elapsed_time % 1) * 1000))
 
     # Debug data and text
     #
@@ -0,0 +1,109 @@
+import random
+import hashlib
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from solver import Solver
+
+# Candidates are checked in batches, each batch is finished before the next is started
+CANDIDATE_BATCH_SIZE = 64
+CANDIDATE_CHUNK_SIZE = 8  # candidates sent to a worker at a time
+MAX_CANDIDATES = 100_000
+
+
+def candidate_seed(seed: int, candidate: int) -> int:
+    """
+    The seed of the nth candidate layout, derived from the game seed.
+
+    Each candidate seed only depends on the game seed and its own number, so candidates can be checked in any order,
+    by any number of workers, and still come out the same.
+    """
+
+    digest = hashlib.blake2b(f"{seed}:{candidate}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def is_solvable_without_guessing(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    seed: int,
+    first_click: tuple[int, int],
+) -> bool:
+    """
+    Create the board for a seed and play it from the first click using only logic.
+    Returns whether the whole board could be cleared without a guess.
+    """
+
+    board = Board(grid_size, num_of_bombs, random.Random(seed))
+
+    # The first click has to open up an area, otherwise the first move would already be a guess
+    first_index = board.index(first_click)
+    if board.bombs[first_index] or board.neighbors[first_index] != 0:
+        return False
+
+    return Solver(board).auto_play(first_click)
+
+
+def generate_no_guess_board(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    seed: int,
+    first_click: tuple[int, int],
+    workers: int | None = None,
+    progress: Callable[[str], None] | None = None,
+) -> tuple[Board, int]:
+    """
+    Generate a board that can be fully solved by logic, starting from the first click.
+
+    Candidate layouts are created from seeds derived from `seed`, and checked in batches across a process pool.
+    The first candidate, in order, that can be solved is kept. Since a batch is always finished before moving on,
+    the same seed gives the same board no matter how many workers there are.
+
+    With `workers` set to 1 the candidates are checked in this process. `progress` is called with the number of
+    candidates checked after each batch. Returns the board and the seed it was made from, which can be given to
+    `random.Random` to create the same board again.
+    """
+
+    def check_batch(map_function, batch_start: int) -> int | None:
+        seeds = [
+            candidate_seed(seed, candidate)
+            for candidate in range(batch_start, batch_start + CANDIDATE_BATCH_SIZE)
+        ]
+        results = map_function(
+            is_solvable_without_guessing,
+            [grid_size] * len(seeds),
+            [num_of_bombs] * len(seeds),
+            seeds,
+            [first_click] * len(seeds),
+        )
+        for solvable_seed, solvable in zip(seeds, results):
+            if solvable:
+                return solvable_seed
+
+        return None
+
+    def search(map_function) -> int:
+        for batch_start in range(0, MAX_CANDIDATES, CANDIDATE_BATCH_SIZE):
+            solvable_seed = check_batch(map_function, batch_start)
+            if solvable_seed is not None:
+                return solvable_seed
+            if progress is not None:
+                progress(
+                    f"Checked {batch_start + CANDIDATE_BATCH_SIZE} layouts for one without guessing"
+                )
+
+        raise RuntimeError(
+            f"No board solvable without guessing was found in {MAX_CANDIDATES} candidates."
+        )
+
+    if workers == 1:
+        solvable_seed = search(map)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            solvable_seed = search(
+                lambda function, *iterables: executor.map(
+                    function, *iterables, chunksize=CANDIDATE_CHUNK_SIZE
+                )
+            )
+
+    return Board(grid_size, num_of_bombs, random.Random(solvable_seed)), solvable_seed
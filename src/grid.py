@@ -1,9 +1,26 @@
-import time
 import random
+from enum import Enum
+from collections.abc import Iterator
+from itertools import chain, compress, product, repeat
 import pygame as pg
-from tileset import Tileset
+from tileset import TileType, Tileset
 from tile_sprite import TileSprite
-from utility import calculate_neighbors
+from board import Action, Board, CERTAIN_FLAG, FirstClickMode, PlacementMode
+from bomb_animation import BombAnimator
+from history import HISTORY_MAX_BYTES, History
+from camera import Camera
+from font_loader import LazyFont
+from utility import click_was_inside_grid
+
+# Past this many dirty tiles, a single rect around all of them is cheaper to present than a rect per tile
+MAX_DIRTY_RECTS = 256
+
+
+class Renderer(Enum):
+    # A TileSprite per tile within view, each updating its own image
+    SPRITES = "sprites"
+    # No sprites, tile types are read from the board and drawn with a single batched blit
+    ATLAS = "atlas"
 
 
 class Grid:
@@ -11,7 +28,11 @@ class Grid:
     Grid will handle creation of the grid, management of the tile sprites, and manage the tile grid.
     and will be created and used within a instance of the Game class.
 
+    The game state itself is held within a Board, the Grid is a view over it which handles rendering.
+    Tile sprites only exist for the cells within view of the camera.
+
     Many of the arguments within this constructor need to be instantiated before being passed in.
+    A Board that was already generated can be passed in, otherwise one is created from the rng.
     """
 
     def __init__(
@@ -21,10 +42,15 @@ class Grid:
         screen: pg.Surface,
         num_of_bombs: int,
         rng: random.Random,
-        font: pg.Font,
+        font: LazyFont,
         grid_size: tuple[int, int],
         grid_topleft: tuple[int, int],
         debug_mode: bool = False,
+        bomb_placement: PlacementMode = PlacementMode.SAMPLE,
+        renderer: Renderer = Renderer.SPRITES,
+        board: Board | None = None,
+        first_click: FirstClickMode = FirstClickMode.NONE,
+        history_max_bytes: int = HISTORY_MAX_BYTES,
     ):
         if debug_mode:
             print("DEBUG: Creating instance of Grid")
@@ -38,8 +64,10 @@ class Grid:
         self.__font = font
         self.__grid_topleft = grid_topleft
         self.__debug_mode = debug_mode
+        self.__bomb_placement = bomb_placement
+        self.__renderer = renderer
 
-        # Tile groups
+        # Tile groups, only holding the tiles that are within view of the camera
         self.all_tiles = pg.sprite.Group()
 
         # Grid
@@ -47,246 +75,500 @@ class Grid:
         self.__grid_size = grid_size
         self.__grid_cols = self.__grid_size[0]
         self.__grid_rows = self.__grid_size[1]
-        self.__tile_grid: list[list[TileSprite]] = []
+        self.__tile_sprites: dict[tuple[int, int], TileSprite] = {}
 
-        # Win state
-        self.remaining_tiles_to_reveal = (
-            self.__grid_cols * self.__grid_rows
-        ) - self.__num_of_bombs
-        self.flags_remaining = self.__num_of_bombs
-        self.game_was_won: bool = False
+        # Rendering state
+        self.__pressed_tile: tuple[int, int] | None = None
+        self.__dirty_tiles: set[tuple[int, int]] = set()
+        self.__visible_tiles: tuple[range, range] = (range(0), range(0))
 
-        # Game timer
-        self.__first_click_occured_at: float | None = None
-        self.__game_ended_at: float | None = None
+        # Exploding bombs, drawn over the tile types on the board
+        self.__bomb_animator = BombAnimator()
 
-        self.__first_click_occured: bool = False
+        # Atlas rendering state
+        self.__atlas_pressed_tile: tuple[int, int] | None = None
+        self.__atlas_positions: list[tuple[int, int]] = []
+        self.__atlas_camera_offset: tuple[int, int] | None = None
 
         # Initialization methods
         if self.__debug_mode:
             print("DEBUG: Beginning initialization")
-        self.__create_grid()
-        self.__place_bombs()
-        self.__count_bombs()
+        if board is None:
+            board = Board(
+                self.__grid_size,
+                self.__num_of_bombs,
+                self.__rng,
+                self.__debug_mode,
+                self.__bomb_placement,
+                first_click,
+            )
+        self.board = board
+        self.history = History(board, history_max_bytes)
 
         # DEBUG
         if self.__debug_mode:
             print("DEBUG: Grid has been initialized successfully.")
 
+    # == Win state ==
+    @property
+    def remaining_tiles_to_reveal(self) -> int:
+        return self.board.remaining_tiles_to_reveal
+
+    @property
+    def flags_remaining(self) -> int:
+        return self.board.flags_remaining
+
+    @property
+    def game_was_won(self) -> bool:
+        return self.board.game_was_won
+
+    @property
+    def game_was_lost(self) -> bool:
+        return self.board.game_was_lost
+
     # == Public Methods ==
+    def contains(self, col_row: tuple[int, int]) -> bool:
+        return click_was_inside_grid(col_row, self.__grid_size)
+
     def reveal_click(self, col_row_clicked: tuple[int, int]) -> bool:
         """
-        Provided the column and row of the tile revealed, perform the reveal of the tile, flooding neighboring tiles if empty,
-        updating the TileSprite's state as needed.
+        Provided the column and row of the tile revealed, perform the reveal of the tile on the board,
+        flooding neighboring tiles if empty.
 
         Returning `False` if the game is over due to revealing a bomb, or returning `True` if a bomb was **not** revealed
         and the game can continue.
         """
 
-        if not self.__first_click_occured:
-            self.__first_click_occured = True
-            self.__first_click_occured_at = time.time()
+        bomb_not_clicked = self.board.reveal_click(col_row_clicked)
+        self.history.record(Action.REVEAL, col_row_clicked)
+        self.__mark_changed_dirty()
 
-        col, row = col_row_clicked
-        tile_clicked = self.__tile_grid[col][row]
+        if not bomb_not_clicked:
+            self.__explode_bombs(col_row_clicked)
 
-        if tile_clicked.has_flag() or tile_clicked.was_clicked:
-            # Unable to reveal due to flag blocking reveal
-            return True
+        return bomb_not_clicked
 
-        elif tile_clicked.has_bomb:
-            # Reveal the bomb and end the game
-            tile_clicked.reveal()
-            self.__end_game(False)
+    def flag_click(self, col_row_clicked: tuple[int, int]):
+        """
+        Provided the column and row of the tile being flagged (or unflagged), cycle through the flag types on the tile.
+        """
+
+        self.board.flag_click(col_row_clicked)
+        self.history.record(Action.FLAG, col_row_clicked)
+        self.__mark_changed_dirty()
+
+    def undo(self) -> bool:
+        """
+        Undo the last reveal or flag, returning whether there was one to undo.
+        """
+
+        if not self.history.undo():
             return False
 
-        elif tile_clicked.no_neighboring_bombs():
-            # Reveal many tiles and decrement tiles left to reveal
-            num_tiles_revealed = self.__flood_tiles(col_row_clicked)
-            # NOTE: the private method itself could handle decrementing num_tiles_revealed
-            self.remaining_tiles_to_reveal -= num_tiles_revealed
+        self.__mark_changed_dirty()
 
-        else:
-            # Reveal single tile and decrement tiles left to reveal
-            tile_clicked.reveal()
-            self.remaining_tiles_to_reveal -= 1
+        # Undoing the reveal that lost the game puts out the explosions
+        if self.__bomb_animator.has_exploded and not self.board.game_was_lost:
+            self.__dirty_tiles.update(self.__bomb_animator.exploded_tiles())
+            self.__bomb_animator = BombAnimator()
+
+        return True
 
-        # Tile was revealed. Was it the last tile?
-        if self.remaining_tiles_to_reveal <= 0:
-            self.__end_game(True)
+    def redo(self) -> bool:
+        """
+        Apply the last undone reveal or flag again, returning whether there was one to redo.
+        """
+
+        if not self.history.redo():
+            return False
+
+        self.__mark_changed_dirty()
+        if self.board.game_was_lost:
+            self.__explode_bombs(self.board.col_row(self.board.last_changed[0]))
 
         return True
 
-    def flag_click(self, col_row_clicked: tuple[int, int]):
+    def set_pressed_tile(self, col_row: tuple[int, int] | None):
         """
-        Provided the column and row of the tile being flagged (or unflagged), cycle through the flag types on the tile.
+        Show the tile at column and row as "pressed", or no tile if `None`.
+        Only touches the tiles when the pressed tile changes, so holding a press does not redraw it every frame.
         """
 
-        col, row = col_row_clicked
-        tile_clicked = self.__tile_grid[col][row]
+        if col_row == self.__pressed_tile:
+            return
 
-        update_flag_count, tile_now_has_flag = tile_clicked.cycle_flag()
+        if self.__pressed_tile is not None:
+            self.unpress_tile(self.__pressed_tile)
 
-        if update_flag_count:
-            if tile_now_has_flag:
-                self.flags_remaining -= 1
-            else:
-                self.flags_remaining += 1
+        self.__pressed_tile = col_row
+        if col_row is not None:
+            self.press_tile(col_row)
 
     def press_tile(self, col_row_clicked: tuple[int, int]):
         """
         Provided the column and row of a tile, change the tile to be "pressed".
         """
 
-        col, row = col_row_clicked
-        tile_clicked = self.__tile_grid[col][row]
-
-        if tile_clicked.was_clicked or tile_clicked.has_flag():
+        if self.board.was_revealed(col_row_clicked) or self.board.has_flag(
+            col_row_clicked
+        ):
             return
 
-        tile_clicked.press()
+        if self.__renderer == Renderer.ATLAS:
+            self.__atlas_pressed_tile = col_row_clicked
+        else:
+            # Tiles out of view have no sprite, the pressed tile is pressed once it comes into view
+            tile = self.__tile_sprites.get(col_row_clicked)
+            if tile is None:
+                return
+            tile.press()
+        self.__dirty_tiles.add(col_row_clicked)
 
     def unpress_tile(self, col_row_clicked: tuple[int, int]):
         """
         Resets the "pressed" state tile at column and row
         """
 
-        col, row = col_row_clicked
-        tile_clicked = self.__tile_grid[col][row]
+        if self.__renderer == Renderer.ATLAS:
+            if self.__atlas_pressed_tile == col_row_clicked:
+                self.__atlas_pressed_tile = None
+                self.__dirty_tiles.add(col_row_clicked)
+            return
+
+        tile = self.__tile_sprites.get(col_row_clicked)
+        if tile is None:
+            return
 
-        tile_clicked.unpress()
+        tile.unpress()
+        self.__dirty_tiles.add(col_row_clicked)
 
-    # == Private Methods ==
-    def __create_grid(self):
+    @property
+    def is_animating(self) -> bool:
+        return self.__bomb_animator.is_animating
+
+    def update_animations(self, now_ms: int):
+        """
+        Advance the exploding bombs to the current time, marking the tiles whose frame changed to be drawn.
         """
-        Creates the grid of tile sprites.
 
-        In order to create a new TileSprite instance, we must calculate and provide the topleft corner as an argument.
-        We do not need to provide a width and height to the tiles individually, the tileset has the same as the TileSprites.
+        if self.__bomb_animator.is_animating:
+            self.__dirty_tiles.update(self.__bomb_animator.advance(now_ms))
+
+    def set_tile_render_size(self, tile_render_size: tuple[int, int]):
+        """
+        Change the size tiles are drawn at, such as when zooming. Tile positions are worked out again on the next draw.
         """
 
-        for col in range(self.__grid_cols):
-            self.__tile_grid.append([])
-            for row in range(self.__grid_rows):
-                tile_x = self.__grid_left + (col * self.__tile_render_width)
-                tile_y = self.__grid_top + (row * self.__tile_render_height)
-                new_tile = TileSprite(self.__tileset, tile_x, tile_y)
+        self.__tile_render_width, self.__tile_render_height = tile_render_size
 
-                self.all_tiles.add(new_tile)
-                self.__tile_grid[col].append(new_tile)
+        # Tile sprites hold their own position, so they are created again at the new size
+        self.__tile_sprites = {}
+        self.all_tiles.empty()
+        self.__visible_tiles = (range(0), range(0))
+        self.__atlas_camera_offset = None
 
-    def __place_bombs(self):
+    def world_rect(self) -> pg.Rect:
         """
-        Places bombs across the grid utilizing the provided `self.__rng` instance, shared across the entire game.
+        The area of the world that the grid covers, including the margin around it, for the camera to scroll over.
         """
 
-        placed_bombs = 0
-        while placed_bombs < self.__num_of_bombs:
-            # DEBUG
-            if self.__debug_mode:
-                print(
-                    f"DEBUG: Bombs needed: {self.__num_of_bombs}, Bombs placed: {placed_bombs}"
-                )
+        return pg.Rect(
+            0,
+            0,
+            (self.__grid_left * 2) + (self.__grid_cols * self.__tile_render_width),
+            (self.__grid_top * 2) + (self.__grid_rows * self.__tile_render_height),
+        )
 
-            # should never calculate outside of grid
-            bomb_col, bomb_row = (
-                self.__rng.randint(0, self.__grid_cols - 1),
-                self.__rng.randint(0, self.__grid_rows - 1),
-            )
+    def draw(self, screen: pg.Surface, camera: Camera):
+        """
+        Update and draw every tile within view of the camera.
+        """
 
-            tile = self.__tile_grid[bomb_col][bomb_row]
-            if tile.has_no_bomb():
-                tile.place_bomb()
-                placed_bombs += 1
-            elif tile.has_bomb:
-                continue
+        self.__dirty_tiles.clear()
+        if self.__renderer == Renderer.ATLAS:
+            self.__draw_atlas(screen, camera)
+            return
 
-        # WARNING
-        if placed_bombs != self.__num_of_bombs:
-            print("WARNING: Error with number of bombs placed.")
+        self.__update_visible_tiles(camera)
 
-    def __count_bombs(self):
+        offset_x, offset_y = camera.offset
+        for col_row, tile in self.__tile_sprites.items():
+            self.__update_tile_sprite(col_row, tile)
+            screen.blit(tile.image, tile.rect.move(-offset_x, -offset_y))
+
+    def draw_dirty(self, screen: pg.Surface, camera: Camera) -> list[pg.Rect]:
         """
-        For every tile in the grid, call the `calculate_neighbors` function and provide the tile with the number of neighbors.
+        Update and draw only the tiles within view that changed since the last draw.
+
+        Returns the rects that were drawn to, to be passed to `pg.display.update`.
         """
 
-        # TODO: Optimize by skipping calculations for tiles that have bombs
+        if self.__renderer == Renderer.ATLAS:
+            return self.__draw_atlas_dirty(screen, camera)
 
-        for col in range(self.__grid_cols):
-            for row in range(self.__grid_rows):
-                num_neighbors = calculate_neighbors(
-                    (col, row), self.__grid_cols, self.__grid_rows, self.__tile_grid
-                )
-                self.__tile_grid[col][row].set_neighbors(num_neighbors)
+        # When more tiles changed than can be seen, it is cheaper to draw everything in view
+        if len(self.__dirty_tiles) > len(self.__tile_sprites):
+            self.draw(screen, camera)
+            return [screen.get_rect()]
+
+        offset_x, offset_y = camera.offset
+        dirty_rects: list[pg.Rect] = []
+        for col_row in self.__dirty_tiles:
+            tile = self.__tile_sprites.get(col_row)
+            if tile is None:
+                # Not in view, it will be drawn once the camera moves to it
+                continue
+
+            self.__update_tile_sprite(col_row, tile)
+            dirty_rects.append(
+                screen.blit(tile.image, tile.rect.move(-offset_x, -offset_y))
+            )
+        self.__dirty_tiles.clear()
+
+        if len(dirty_rects) > MAX_DIRTY_RECTS:
+            return [dirty_rects[0].unionall(dirty_rects)]
+
+        return dirty_rects
 
-    def __flood_tiles(self, first_tile: tuple[int, int]):
+    # == Private Methods ==
+    def __draw_atlas(self, screen: pg.Surface, camera: Camera):
         """
-        Starting at the first tile, that will not have any neighbors, this algorithm will reveal any tile that is
-        neighboring the empty tiles.
+        Draw every tile within view of the camera, straight from the tile types stored on the board.
 
-        Return how many tiles were revealed
+        The tile types of each visible row are sliced out of the board, mapped to the tileset surfaces and paired with
+        screen positions, all without calling a Python method per tile, then submitted to a single `fblits` call.
         """
 
-        num_revealed_tiles = 0
+        self.__update_atlas_positions(camera)
+        visible_cols, visible_rows = self.__visible_tiles
+        if not visible_cols or not visible_rows:
+            return
+
+        tile_types = self.board.tile_types
+        cols = self.board.cols
+        row_slices = (
+            tile_types[row * cols + visible_cols.start : row * cols + visible_cols.stop]
+            for row in visible_rows
+        )
+        tiles = map(
+            self.__tileset.get_tiles().__getitem__, chain.from_iterable(row_slices)
+        )
+        screen.fblits(zip(tiles, self.__atlas_positions))
+
+        # Neither are exploding bombs, only the tiles in view are checked so this does not grow with the bomb count
+        if self.__bomb_animator.has_exploded:
+            for col_row in product(visible_cols, visible_rows):
+                if self.__bomb_animator.frame(col_row) is not None:
+                    self.__draw_atlas_tile(screen, camera, col_row)
+
+        # The pressed tile is not part of the board, so it is drawn over the top
+        if self.__atlas_pressed_tile is not None:
+            self.__draw_atlas_tile(screen, camera, self.__atlas_pressed_tile)
+
+    def __draw_atlas_dirty(self, screen: pg.Surface, camera: Camera) -> list[pg.Rect]:
+        """
+        Draw only the tiles within view that changed since the last draw, straight from the tile types on the board.
+        """
 
-        to_visit_list: list[tuple[int, int]] = [first_tile]
-        while len(to_visit_list) > 0:
-            # 1. Always reveal the tile being visited, and increment the counter
-            col, row = to_visit_list.pop()
-            self.__tile_grid[col][row].reveal()
-            num_revealed_tiles += 1
+        self.__update_atlas_positions(camera)
+        visible_cols, visible_rows = self.__visible_tiles
 
-            # 2. Then check if we look at its neighbors
-            if self.__tile_grid[col][row].no_neighboring_bombs():
-                for col_change in range(-1, 2):
-                    for row_change in range(-1, 2):
-                        check_col, check_row = col + col_change, row + row_change
+        # When more tiles changed than can be seen, it is cheaper to draw everything in view
+        if len(self.__dirty_tiles) > len(self.__atlas_positions):
+            self.draw(screen, camera)
+            return [screen.get_rect()]
 
-                        # A. Don't recheck the same tile
-                        if col_change == 0 and row_change == 0:
-                            continue
+        dirty_rects: list[pg.Rect] = []
+        for col_row in self.__dirty_tiles:
+            col, row = col_row
+            if col in visible_cols and row in visible_rows:
+                dirty_rects.append(self.__draw_atlas_tile(screen, camera, col_row))
+        self.__dirty_tiles.clear()
 
-                        # B. Don't look outside of the grid
-                        outside_grid = (
-                            check_col < 0
-                            or check_row < 0
-                            or check_col >= self.__grid_cols
-                            or check_row >= self.__grid_rows
-                        )
-                        if outside_grid:
-                            continue
+        if len(dirty_rects) > MAX_DIRTY_RECTS:
+            return [dirty_rects[0].unionall(dirty_rects)]
 
-                        # C. Don't add it if its already in the list
-                        next_tile_visit = (check_col, check_row)
-                        if next_tile_visit in to_visit_list:
-                            continue
+        return dirty_rects
 
-                        # D. Don't add it if its already revealed
-                        if self.__tile_grid[check_col][check_row].was_clicked:
-                            continue
+    def __draw_atlas_tile(
+        self, screen: pg.Surface, camera: Camera, col_row: tuple[int, int]
+    ) -> pg.Rect:
+        """
+        Draw a single tile, straight from the tile type stored on the board.
+        """
 
-                        # E. Add to the list
-                        to_visit_list.append((check_col, check_row))
+        bomb_frame = self.__bomb_animator.frame(col_row)
+        if col_row == self.__atlas_pressed_tile:
+            tile = self.__tileset.get_tile(TileType.CLICKED_EMPTY)
+        elif bomb_frame is not None:
+            tile = self.__tileset.get_tile(bomb_frame)
+        else:
+            tile = self.__tileset.get_tiles()[
+                self.board.tile_types[self.board.index(col_row)]
+            ]
 
-        return num_revealed_tiles
+        col, row = col_row
+        offset_x, offset_y = camera.offset
+        tile_x = self.__grid_left + (col * self.__tile_render_width) - offset_x
+        tile_y = self.__grid_top + (row * self.__tile_render_height) - offset_y
+        return screen.blit(tile, (tile_x, tile_y))
 
-    def __end_game(self, player_won: bool) -> float:
+    def __update_atlas_positions(self, camera: Camera):
         """
-        End the game by calculating the time to clear the level.
+        Work out the screen position of every tile within view, in the same order as the rows are sliced from the
+        board. Only done again once the camera moves.
         """
 
-        self.__game_ended_at = time.time()
-        if player_won:
-            self.game_was_won = True
-        else:
-            return 0.0
+        if camera.offset == self.__atlas_camera_offset:
+            return
+        self.__atlas_camera_offset = camera.offset
+
+        self.__visible_tiles = camera.visible_tile_range(
+            self.__grid_topleft,
+            (self.__tile_render_width, self.__tile_render_height),
+            self.__grid_size,
+        )
+        visible_cols, visible_rows = self.__visible_tiles
+
+        offset_x, offset_y = camera.offset
+        tile_xs = [
+            self.__grid_left + (col * self.__tile_render_width) - offset_x
+            for col in visible_cols
+        ]
+        self.__atlas_positions = list(
+            chain.from_iterable(
+                zip(
+                    tile_xs,
+                    repeat(
+                        self.__grid_top + (row * self.__tile_render_height) - offset_y
+                    ),
+                )
+                for row in visible_rows
+            )
+        )
+
+    def __explode_bombs(self, col_row_clicked: tuple[int, int]):
+        """
+        Explode the bomb that was clicked, then every other bomb that was not flagged, nearest first.
+        """
 
-        # Type guarding
-        if type(self.__first_click_occured_at) is not float:
-            raise TypeError("Time of first click was not saved.")
+        self.__bomb_animator.explode(
+            col_row_clicked,
+            pg.time.get_ticks(),
+            (
+                col_row
+                for col_row in self.__bombs_around(col_row_clicked)
+                if self.board.flags[self.board.index(col_row)] != CERTAIN_FLAG
+            ),
+        )
+
+    def __bombs_around(self, col_row: tuple[int, int]) -> Iterator[tuple[int, int]]:
+        """
+        Every bomb on the board other than the one at column and row, in rings moving out from it.
+
+        Each side of a ring is sliced out of the board and searched in C, so the rings are only worked out as the
+        bombs are needed, and the cost of finding the next bomb does not depend on the number of bombs.
+        """
+
+        board = self.board
+        cols, rows, bombs = board.cols, board.rows, board.bombs
+        col, row = col_row
+
+        for distance in range(1, max(cols, rows)):
+            left, right = max(col - distance, 0), min(col + distance, cols - 1)
+            top, bottom = max(row - distance, 0), min(row + distance, rows - 1)
+
+            # Top and bottom sides, across the full width of the ring
+            for side_row in (row - distance, row + distance):
+                if 0 <= side_row < rows:
+                    start = side_row * cols
+                    for side_col in compress(
+                        range(left, right + 1), bombs[start + left : start + right + 1]
+                    ):
+                        yield (side_col, side_row)
+
+            # Left and right sides, between the top and bottom
+            side_rows = range(max(row - distance + 1, 0), min(row + distance, rows))
+            for side_col in (col - distance, col + distance):
+                if 0 <= side_col < cols and side_rows:
+                    column = bombs[
+                        side_rows.start * cols + side_col : side_rows.stop * cols : cols
+                    ]
+                    for side_row in compress(side_rows, column):
+                        yield (side_col, side_row)
+
+            if left == 0 and top == 0 and right == cols - 1 and bottom == rows - 1:
+                return
+
+    def __update_tile_sprite(self, col_row: tuple[int, int], tile: TileSprite):
+        """
+        Update the image of a tile sprite from the board, or from the bomb animation if its bomb has exploded.
+        """
+
+        tile.update()
+        bomb_frame = self.__bomb_animator.frame(col_row)
+        if bomb_frame is not None:
+            tile.image = self.__tileset.get_tile(bomb_frame)
+
+    def __mark_changed_dirty(self):
+        """
+        Mark the cells changed by the last action on the board as needing to be redrawn.
+        """
+
+        col_row = self.board.col_row
+        self.__dirty_tiles.update(col_row(index) for index in self.board.last_changed)
+
+    def __tile_sprite(self, col_row: tuple[int, int]) -> TileSprite:
+        """
+        Get the tile sprite showing the cell at column and row, creating it if there is not one yet.
+
+        In order to create a new TileSprite instance, we must calculate and provide the topleft corner as an argument.
+        We do not need to provide a width and height to the tiles individually, the tileset has the same as the TileSprites.
+        """
+
+        tile = self.__tile_sprites.get(col_row)
+        if tile is not None:
+            return tile
 
-        # calcluate and return game time
-        game_time = self.__game_ended_at - self.__first_click_occured_at
+        col, row = col_row
+        tile_x = self.__grid_left + (col * self.__tile_render_width)
+        tile_y = self.__grid_top + (row * self.__tile_render_height)
+        tile = TileSprite(self.__tileset, self.board, col_row, tile_x, tile_y)
 
-        print(f"DEBUG: Game Won!\nDEBUG: Grid took {game_time:.2f}s to complete.")
-        return game_time
+        self.__tile_sprites[col_row] = tile
+        self.all_tiles.add(tile)
+        return tile
+
+    def __update_visible_tiles(self, camera: Camera):
+        """
+        Make sure there are tile sprites for every cell within view of the camera, and only those cells.
+
+        Tile sprites are only created once they come into view, and are dropped once they leave it, so the number of
+        sprites depends on the size of the screen rather than the size of the grid.
+        """
+
+        visible_tiles = camera.visible_tile_range(
+            self.__grid_topleft,
+            (self.__tile_render_width, self.__tile_render_height),
+            self.__grid_size,
+        )
+        if visible_tiles == self.__visible_tiles:
+            return
+        self.__visible_tiles = visible_tiles
+
+        visible_cols, visible_rows = visible_tiles
+        previous_sprites = self.__tile_sprites
+        self.__tile_sprites = {}
+        self.all_tiles.empty()
+
+        for row in visible_rows:
+            for col in visible_cols:
+                tile = previous_sprites.get((col, row))
+                if tile is None:
+                    self.__tile_sprite((col, row))
+                else:
+                    self.__tile_sprites[(col, row)] = tile
+                    self.all_tiles.add(tile)
+
+        if self.__pressed_tile in self.__tile_sprites:
+            self.press_tile(self.__pressed_tile)
@@ -0,0 +1,151 @@
+from array import array
+from collections import deque
+from board import Action, Board
+
+# Bytes of undo history kept, the oldest actions are dropped past this
+HISTORY_MAX_BYTES = 16 * 1024 * 1024
+# Rough size of an entry besides its cells, so that many small actions are still counted
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class HistoryEntry:
+    """
+    HistoryEntry is a single action in the history: the cells it changed, the flags they had before it, and the
+    counters from before it.
+    """
+
+    __slots__ = (
+        "action",
+        "col_row",
+        "indexes",
+        "flags",
+        "remaining_tiles_to_reveal",
+        "flags_remaining",
+    )
+
+    def __init__(
+        self,
+        action: Action,
+        col_row: tuple[int, int],
+        indexes: array,
+        flags: bytes,
+        remaining_tiles_to_reveal: int,
+        flags_remaining: int,
+    ):
+        self.action = action
+        self.col_row = col_row
+        self.indexes = indexes
+        self.flags = flags
+        self.remaining_tiles_to_reveal = remaining_tiles_to_reveal
+        self.flags_remaining = flags_remaining
+
+    def num_bytes(self) -> int:
+        return (
+            ENTRY_OVERHEAD_BYTES
+            + self.indexes.itemsize * len(self.indexes)
+            + len(self.flags)
+        )
+
+
+class History:
+    """
+    History keeps the actions made on a board so they can be undone and redone.
+
+    Each action only stores the cells it changed, such as the whole region of a flood, with the flag each had before
+    it, as reported by the board in `last_changed_flags`. Every changed cell was unrevealed before the action, so that
+    is enough to undo it, and redoing it applies the action again. Both cost as much as the cells the action changed,
+    never the whole board, so nothing of the size of the board is kept. Once the entries take more than `max_bytes`,
+    the oldest are dropped and can no longer be undone.
+    """
+
+    def __init__(self, board: Board, max_bytes: int = HISTORY_MAX_BYTES):
+        self.board = board
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+
+        self.__done: deque[HistoryEntry] = deque()
+        self.__undone: list[HistoryEntry] = []
+
+        # The counters as they were before the next action, to fill in its entry once it has changed them
+        self.__remaining_tiles_to_reveal = board.remaining_tiles_to_reveal
+        self.__flags_remaining = board.flags_remaining
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.__done)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.__undone)
+
+    def record(self, action: Action, col_row: tuple[int, int]):
+        """
+        Add the action just applied to the board. Anything undone can no longer be redone, unless the action changed
+        nothing, such as revealing a tile that was already revealed, which is not added.
+        """
+
+        if not self.board.last_changed:
+            return
+
+        for entry in self.__undone:
+            self.num_bytes -= entry.num_bytes()
+        self.__undone.clear()
+        self.__push(action, col_row)
+
+    def undo(self) -> bool:
+        """
+        Undo the last action, returning whether there was one to undo. The cells are in `board.last_changed`.
+        """
+
+        if not self.__done:
+            return False
+
+        entry = self.__done.pop()
+        self.board.revert_cells(
+            entry.indexes,
+            entry.flags,
+            entry.remaining_tiles_to_reveal,
+            entry.flags_remaining,
+        )
+        self.__remaining_tiles_to_reveal = entry.remaining_tiles_to_reveal
+        self.__flags_remaining = entry.flags_remaining
+
+        self.__undone.append(entry)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Apply the last undone action again, returning whether there was one to redo.
+        """
+
+        if not self.__undone:
+            return False
+
+        entry = self.__undone.pop()
+        self.num_bytes -= entry.num_bytes()
+        self.board.apply(entry.action, entry.col_row)
+        self.__push(entry.action, entry.col_row)
+        return True
+
+    # == Private Methods ==
+    def __push(self, action: Action, col_row: tuple[int, int]):
+        board = self.board
+        changed = board.last_changed
+        if changed:
+            entry = HistoryEntry(
+                action,
+                col_row,
+                array("I", changed),
+                # Most cells have no flag, a flood of cells without any only needs to store that
+                board.last_changed_flags,
+                self.__remaining_tiles_to_reveal,
+                self.__flags_remaining,
+            )
+            self.__done.append(entry)
+            self.num_bytes += entry.num_bytes()
+
+        self.__remaining_tiles_to_reveal = board.remaining_tiles_to_reveal
+        self.__flags_remaining = board.flags_remaining
+
+        while self.num_bytes > self.max_bytes and self.__done:
+            self.num_bytes -= self.__done.popleft().num_bytes()
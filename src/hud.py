@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from enum import Enum
+import pygame as pg
+from font_loader import LazyFont
+
+# Rendered text kept for reuse, the least recently used is dropped past this many
+HUD_CACHE_SIZE = 64
+HUD_BACKGROUND = "black"
+HUD_TEXT_COLOR = "white"
+
+
+class GameState(Enum):
+    PLAYING = ""
+    WON = "You won!"
+    LOST = "Game over"
+
+
+class Hud:
+    """
+    Hud shows the flags remaining, the game state and the elapsed time, in a fixed rect of the screen.
+
+    The rect is split into a field for each value, and a field is only drawn again when its value changes. Text is
+    rendered through a bounded LRU cache: labels are cached as whole strings, and numbers are put together from cached
+    glyphs of their digits, so a ticking timer does not render any new text.
+    """
+
+    def __init__(self, font: LazyFont, rect: pg.Rect, cache_size: int = HUD_CACHE_SIZE):
+        self.rect = rect
+        self.__font = font
+        self.__cache_size = cache_size
+        self.__cache: OrderedDict[str, pg.Surface] = OrderedDict()
+
+        # Left, middle and right thirds of the rect
+        field_width = rect.width // 3
+        self.__field_rects = {
+            "flags": pg.Rect(rect.left, rect.top, field_width, rect.height),
+            "state": pg.Rect(
+                rect.left + field_width, rect.top, field_width, rect.height
+            ),
+            "time": pg.Rect(
+                rect.left + field_width * 2,
+                rect.top,
+                rect.width - field_width * 2,
+                rect.height,
+            ),
+        }
+        self.__values: dict[str, int | GameState | None] = dict.fromkeys(
+            self.__field_rects
+        )
+        self.__changed_fields: set[str] = set(self.__field_rects)
+
+    # == Public Methods ==
+    def update(self, flags_remaining: int, state: GameState, elapsed_seconds: int):
+        """
+        Set the values to show, marking the fields whose value changed to be drawn.
+        """
+
+        for field, value in (
+            ("flags", flags_remaining),
+            ("state", state),
+            ("time", elapsed_seconds),
+        ):
+            if self.__values[field] != value:
+                self.__values[field] = value
+                self.__changed_fields.add(field)
+
+    def draw(self, screen: pg.Surface, redraw: bool) -> list[pg.Rect]:
+        """
+        Draw the fields that changed, or every field if `redraw` is set because what was under the HUD was drawn over.
+        Returns the areas drawn to, for a partial display update.
+        """
+
+        if redraw:
+            self.__changed_fields.update(self.__field_rects)
+
+        drawn_rects = []
+        for field in self.__changed_fields:
+            field_rect = self.__field_rects[field]
+            screen.fill(HUD_BACKGROUND, field_rect)
+
+            surfaces = self.__field_surfaces(field, self.__values[field])
+            width = sum(surface.get_width() for surface in surfaces)
+            if field == "flags":
+                x = field_rect.left
+            elif field == "state":
+                x = field_rect.centerx - width // 2
+            else:
+                x = field_rect.right - width
+
+            for surface in surfaces:
+                screen.blit(
+                    surface, (x, field_rect.centery - surface.get_height() // 2)
+                )
+                x += surface.get_width()
+            drawn_rects.append(field_rect)
+
+        self.__changed_fields.clear()
+        return drawn_rects
+
+    # == Private Methods ==
+    def __field_surfaces(
+        self, field: str, value: int | GameState | None
+    ) -> list[pg.Surface]:
+        """
+        The surfaces that make up the text of a field, in order from left to right.
+        """
+
+        if value is None:
+            return []
+        if isinstance(value, GameState):
+            return [self.__text(value.value)] if value.value else []
+
+        label = "Flags " if field == "flags" else "Time "
+        return [self.__text(label)] + [self.__text(digit) for digit in str(value)]
+
+    def __text(self, text: str) -> pg.Surface:
+        """
+        The rendered text, from the cache if it has been rendered recently.
+        """
+
+        surface = self.__cache.get(text)
+        if surface is not None:
+            self.__cache.move_to_end(text)
+            return surface
+
+        surface = self.__font.get().render(text, True, HUD_TEXT_COLOR)
+        self.__cache[text] = surface
+        if len(self.__cache) > self.__cache_size:
+            self.__cache.popitem(last=False)
+
+        return surface
@@ -1,8 +1,20 @@
+import os
+import time
+import tracemalloc
 import random
 import pygame as pg
 
 from tileset import Tileset
-from game import Game
+from font_loader import LazyFont
+from game import FRAME_STAGES, Game, RenderMode
+from frame_profiler import FrameProfiler, ProfilerOverlay
+from memory_report import TRACE_FRAMES, MemoryOverlay
+from hud import Hud
+from board import FirstClickMode, PlacementMode
+from grid import Renderer
+from recording import Recording
+from history import HISTORY_MAX_BYTES
+from board_save import read_header, save_board
 
 # General
 NAME = "Bomb Finder"
@@ -13,45 +25,148 @@ SCREEN_CENTER = SCREEN_SIZE[0] / 2, SCREEN_SIZE[1] / 2
 TILE_SCALE = 4
 TILE_SIZE = (16, 16)
 TILE_RENDER_SIZE = (TILE_SIZE[0] * TILE_SCALE, TILE_SIZE[1] * TILE_SCALE)
+ZOOM_LEVELS = (
+    0.5,
+    1,
+    2,
+    3,
+    4,
+)  # tile scales to zoom between, with the mouse wheel or +/- keys
 TILE_PATH = "assets/asperite_files/basic-tileset.png"
+TILE_CACHE_DIR = ".cache"
 FPS = 120
+RENDER_MODE = RenderMode.DIRTY
+RENDERER = Renderer.ATLAS
+HUD_RECT = pg.Rect(100, 20, 600, 60)  # above the grid
+IDLE_MODE = True  # sleep until the next event, instead of drawing at FPS, while nothing is moving
 
 # Font
 SOURCE_FONT_PATH = "./assets/fonts/SourceSansPro/SourcingSansPro-Regular.ttf"
 
 # Debug
 DEBUG_GAME = True
+PROFILE_FRAMES = False  # time every stage of the game loop, shown in an overlay
+PROFILE_CSV_PATH = "frame_profile.csv"  # every profiled frame is written here on exit
+PROFILE_FONT_SIZE = 16
+# Trace allocations from startup, so M shows the memory used by each subsystem. Tracing slows down making boards.
+MEMORY_REPORT = False
+
+# Recording, every session is saved so it can be replayed with replay.py
+RECORD_SESSIONS = True
+RECORDING_DIR = "recordings"
+
+# Saves, an unfinished game is saved on exit and carried on from the next time the game starts
+SAVE_PATH = "saves/board.bfs"
 
 # Games
 DEFAULT_GRID_SIZE = (6, 6)
 DEFAULT_GRID_TOPLEFT = (100, 100)
 DEFAULT_SEED = 0xABCDEF1234  # All seeds should be a 10 digit hexadecimal number
 DEFAULT_NUMBER_BOMBS = 3
+# LEGACY reproduces boards from seeds used before sampling
+DEFAULT_BOMB_PLACEMENT = PlacementMode.SAMPLE
+# DEFER places bombs on the first reveal, RELOCATE moves them away from it, NONE lets the first reveal hit a bomb.
+# RELOCATE boards are placed while being generated in the background, DEFER ones on the first reveal.
+FIRST_CLICK_MODE = FirstClickMode.RELOCATE
+# Set to a fraction of cells with bombs, such as 0.2, to play on an endless board instead of a fixed grid
+ENDLESS_BOMB_DENSITY = None
+NO_GUESS = (
+    False  # only create boards that can be solved from the center without guessing
+)
 
 
 def main():
-    # Initialization
-    pg.init()
+    startup_began_at = time.perf_counter()
+    if MEMORY_REPORT:
+        tracemalloc.start(TRACE_FRAMES)
+
+    # Initialization, only the display is needed before the first frame
+    pg.display.init()
     screen = pg.display.set_mode(SCREEN_SIZE)
     clock = pg.time.Clock()
-    font = pg.font.Font(SOURCE_FONT_PATH, 30)
+    font = LazyFont(SOURCE_FONT_PATH, 30)
 
     # Start rendering
     pg.display.set_caption(NAME)
     pg.display.update()
 
-    tileset = Tileset(TILE_PATH, TILE_SIZE, TILE_SCALE)
+    tileset_began_at = time.perf_counter()
+    tileset = Tileset(TILE_PATH, TILE_SIZE, TILE_SCALE, TILE_CACHE_DIR)
+    if DEBUG_GAME:
+        print(
+            f"DEBUG: Tileset loaded in {(time.perf_counter() - tileset_began_at) * 1000:.1f}ms"
+            f" ({'cached' if tileset.loaded_from_cache else 'not cached'})"
+        )
+
+    # Carry on from a saved game if there is one
+    seed, grid_size, num_of_bombs = (
+        DEFAULT_SEED,
+        DEFAULT_GRID_SIZE,
+        DEFAULT_NUMBER_BOMBS,
+    )
+    # Only fixed size games are saved, recorded and resumed
+    fixed_size = ENDLESS_BOMB_DENSITY is None
+
+    # Only the header is read here, the cells are loaded by the game behind its loading screen
+    save_path = None
+    if fixed_size and os.path.exists(SAVE_PATH):
+        header = read_header(SAVE_PATH)
+        save_path = SAVE_PATH
+        seed, grid_size, num_of_bombs = (
+            header["seed"],
+            header["grid_size"],
+            header["num_of_bombs"],
+        )
+
+    # A resumed game cannot be recorded, since its earlier actions are not known
+    recording = None
+    if RECORD_SESSIONS and fixed_size and save_path is None:
+        recording = Recording(
+            seed,
+            grid_size,
+            num_of_bombs,
+            DEFAULT_BOMB_PLACEMENT.value,
+            NO_GUESS,
+            FIRST_CLICK_MODE.value,
+        )
+
+    profiler, profiler_overlay = None, None
+    if PROFILE_FRAMES:
+        profiler = FrameProfiler(FRAME_STAGES)
+        profiler_overlay = ProfilerOverlay(
+            profiler, LazyFont(SOURCE_FONT_PATH, PROFILE_FONT_SIZE)
+        )
+
+    memory_overlay = None
+    if MEMORY_REPORT:
+        memory_overlay = MemoryOverlay(LazyFont(SOURCE_FONT_PATH, PROFILE_FONT_SIZE))
 
     game = Game(
         tileset,
         TILE_RENDER_SIZE,
         screen,
-        DEFAULT_NUMBER_BOMBS,
-        random.Random(DEFAULT_SEED),
+        num_of_bombs,
+        random.Random(seed),
         font,
-        DEFAULT_GRID_SIZE,
+        grid_size,
         DEFAULT_GRID_TOPLEFT,
         DEBUG_GAME,
+        DEFAULT_BOMB_PLACEMENT,
+        RENDER_MODE,
+        RENDERER,
+        NO_GUESS,
+        IDLE_MODE,
+        recording,
+        None,
+        profiler,
+        profiler_overlay,
+        Hud(font, HUD_RECT),
+        ENDLESS_BOMB_DENSITY,
+        FIRST_CLICK_MODE,
+        ZOOM_LEVELS,
+        HISTORY_MAX_BYTES,
+        memory_overlay,
+        save_path,
     )
 
     # TESTING FOR NEW GRID CLASS
@@ -92,7 +207,36 @@ def main():
     # load the tile types
 
     # Main game loop
-    game.start_game(clock, FPS)
+    game.start_game(clock, FPS, startup_began_at)
+
+    if profiler is not None:
+        profiler.dump_csv(PROFILE_CSV_PATH)
+        if DEBUG_GAME:
+            print(f"DEBUG: Frame profile written to {PROFILE_CSV_PATH}")
+
+    # The window can be closed before the first board has been generated, leaving the save as it was
+    board = game.board
+    if board is not None:
+        game_over = board.game_was_won or board.game_was_lost
+        # A deferred board has no bombs until the first reveal, so there is nothing to carry on from yet
+        if fixed_size and not game_over and board.bombs_placed:
+            os.makedirs(os.path.dirname(SAVE_PATH), exist_ok=True)
+            # After N started a new game, the board was generated from a seed of its own
+            board_seed = game.board_seed if game.board_seed is not None else seed
+            save_board(SAVE_PATH, board, board_seed)
+            if DEBUG_GAME:
+                print(f"DEBUG: Game saved to {SAVE_PATH}")
+        elif fixed_size and os.path.exists(SAVE_PATH):
+            os.remove(SAVE_PATH)
+
+    if recording is not None and board is not None:
+        os.makedirs(RECORDING_DIR, exist_ok=True)
+        recording_path = os.path.join(
+            RECORDING_DIR, f"session-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        recording.save(recording_path)
+        if DEBUG_GAME:
+            print(f"DEBUG: Session recorded to {recording_path}")
 
     # exiting event loop to exit
     pg.quit()
@@ -0,0 +1,389 @@
+import gc
+import os
+import random
+import argparse
+import tracemalloc
+from collections.abc import Iterable
+
+# Headless mode runs without opening a window
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+from tileset import Tileset
+from grid import Grid, Renderer
+from endless_grid import EndlessGrid
+from endless_board import CHUNK_CELLS
+from camera import Camera
+from font_loader import LazyFont
+from frame_profiler import OVERLAY_PADDING
+
+# Frames kept for each traced allocation, enough to find the module of the game it was made from through pygame
+TRACE_FRAMES = 8
+
+# Subsystems of a report, in the order they are listed
+BOARD_STATE = "board state"
+SPRITES = "sprites"
+TILE_SURFACES = "tile surfaces"
+CACHES = "caches"
+OTHER = "other"
+SUBSYSTEMS = [BOARD_STATE, SPRITES, TILE_SURFACES, CACHES, OTHER]
+
+# Allocations are counted against the subsystem of the most recent module of the game they were made from
+SUBSYSTEM_MODULES = {
+    "board.py": BOARD_STATE,
+    "endless_board.py": BOARD_STATE,
+    "utility.py": BOARD_STATE,
+    "generator.py": BOARD_STATE,
+    "solver.py": BOARD_STATE,
+    "board_save.py": BOARD_STATE,
+    "grid.py": SPRITES,
+    "endless_grid.py": SPRITES,
+    "tile_sprite.py": SPRITES,
+    "tileset.py": TILE_SURFACES,
+    "history.py": CACHES,
+    "bomb_animation.py": CACHES,
+    "font_loader.py": CACHES,
+}
+
+# Headless mode, a board of each size is measured with part of it revealed
+TILE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "assets", "asperite_files", "basic-tileset.png"
+)
+TILE_SIZE = (16, 16)
+HEADLESS_GRID_SIZES = [(100, 100), (300, 300), (1000, 1000)]
+HEADLESS_VIEW_SIZE = (800, 800)
+HEADLESS_TILE_SCALE = 4
+HEADLESS_BOMB_DENSITY = 0.15
+HEADLESS_CLICKS = 100
+SEED = 0xABCDEF1234
+
+
+class MemoryReport:
+    """
+    MemoryReport is the bytes used by each subsystem of a game, on a board of `num_cells` cells with `num_sprites`
+    tile sprites in view.
+    """
+
+    def __init__(
+        self, subsystem_bytes: dict[str, int], num_cells: int, num_sprites: int
+    ):
+        self.subsystem_bytes = subsystem_bytes
+        self.num_cells = num_cells
+        self.num_sprites = num_sprites
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(self.subsystem_bytes.values())
+
+    def bytes_per_cell(self, subsystem: str | None = None) -> float:
+        """
+        The bytes of a subsystem for each cell of the board, or of every subsystem if none is given.
+        """
+
+        num_bytes = (
+            self.total_bytes
+            if subsystem is None
+            else self.subsystem_bytes.get(subsystem, 0)
+        )
+        return num_bytes / self.num_cells if self.num_cells else 0.0
+
+    def rows(self) -> list[tuple[str, str, str]]:
+        """
+        The report as rows of text, a subsystem with its size and bytes per cell on each, and the total last.
+        """
+
+        rows = [("subsystem", "size", "B/cell")]
+        for subsystem in [*self.subsystem_bytes, None]:
+            num_bytes = (
+                self.total_bytes
+                if subsystem is None
+                else self.subsystem_bytes[subsystem]
+            )
+            rows.append(
+                (
+                    subsystem or "total",
+                    format_bytes(num_bytes),
+                    f"{self.bytes_per_cell(subsystem):.2f}",
+                )
+            )
+
+        return rows
+
+
+def format_bytes(num_bytes: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(num_bytes) < 1024:
+            return f"{num_bytes:.0f}{unit}" if unit == "B" else f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+
+    return f"{num_bytes:.1f}GiB"
+
+
+def surface_bytes(surfaces: Iterable[pg.Surface]) -> int:
+    """
+    Bytes of pixels held by surfaces. Subsurfaces share the pixels of their parent, which are counted once.
+    """
+
+    parents: dict[int, int] = {}
+    for surface in surfaces:
+        while (parent := surface.get_parent()) is not None:
+            surface = parent
+        parents[id(surface)] = surface.get_pitch() * surface.get_height()
+
+    return sum(parents.values())
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """
+    Snapshot of the memory traced so far, leaving out the allocations of tracemalloc and of the report itself.
+    Raises RuntimeError if tracemalloc is not tracing.
+    """
+
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc must be tracing to report memory.")
+
+    return tracemalloc.take_snapshot().filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+
+
+def traced_bytes(baseline: tracemalloc.Snapshot | None = None) -> dict[str, int]:
+    """
+    Bytes allocated by Python, and still held, since tracemalloc started, by subsystem. If a `baseline` snapshot is
+    given, only the bytes held since it was taken are counted.
+
+    Each allocation is counted against the most recent module of the game in its traceback, so the sprite group and
+    rects pygame makes for a tile sprite count as sprites. Raises RuntimeError if tracemalloc is not tracing.
+    """
+
+    snapshot = take_snapshot()
+    statistics = (
+        [
+            (statistic.traceback, statistic.size)
+            for statistic in snapshot.statistics("traceback")
+        ]
+        if baseline is None
+        else [
+            (statistic.traceback, statistic.size_diff)
+            for statistic in snapshot.compare_to(baseline, "traceback")
+        ]
+    )
+
+    subsystem_bytes = dict.fromkeys(SUBSYSTEMS, 0)
+    for traceback, size in statistics:
+        subsystem = OTHER
+        # Frames are ordered from the oldest to the most recent
+        for frame in reversed(traceback):
+            module_subsystem = SUBSYSTEM_MODULES.get(os.path.basename(frame.filename))
+            if module_subsystem is not None:
+                subsystem = module_subsystem
+                break
+        subsystem_bytes[subsystem] += size
+
+    return subsystem_bytes
+
+
+def memory_report(
+    grid: Grid | EndlessGrid,
+    tileset: Tileset,
+    baseline: tracemalloc.Snapshot | None = None,
+) -> MemoryReport:
+    """
+    Report the memory used by a game, from a tracemalloc snapshot plus the pixels of the tileset surfaces, which
+    pygame allocates outside of Python. The tiles being drawn count as tile surfaces, the other zoom levels as caches.
+
+    Only allocations made since tracemalloc started are seen, so it should be started with `TRACE_FRAMES` before the
+    tileset and board are created, or a `baseline` snapshot taken to count only what was allocated after it. Taking
+    the snapshot takes a while on large boards, it is not meant for every frame.
+    """
+
+    subsystem_bytes = traced_bytes(baseline)
+    subsystem_bytes[TILE_SURFACES] += surface_bytes(tileset.get_tiles())
+    subsystem_bytes[CACHES] += surface_bytes(tileset.cached_tiles())
+
+    if isinstance(grid, EndlessGrid):
+        # Endless boards only hold the chunks explored so far
+        return MemoryReport(subsystem_bytes, grid.board.num_chunks * CHUNK_CELLS, 0)
+
+    return MemoryReport(subsystem_bytes, grid.board.num_cells, len(grid.all_tiles))
+
+
+class MemoryOverlay:
+    """
+    MemoryOverlay draws a memory report in the top right of the screen.
+
+    Reports are only taken when asked for, as the snapshot of a large board takes too long to take every frame.
+    """
+
+    def __init__(self, font: LazyFont):
+        self.__font = font
+        self.__panel: pg.Surface | None = None
+        self.__panel_changed = False
+
+    @property
+    def is_shown(self) -> bool:
+        return self.__panel is not None
+
+    def rect(self, screen: pg.Surface) -> pg.Rect:
+        if self.__panel is None:
+            return pg.Rect(0, 0, 0, 0)
+
+        return self.__panel.get_rect(topright=screen.get_rect().topright)
+
+    def show(self, report: MemoryReport | None):
+        """
+        Show a report, or hide the overlay if `report` is `None`. Whatever was under it needs drawing again.
+        """
+
+        if report is None:
+            self.__panel = None
+            return
+
+        font = self.__font.get()
+        rows = [
+            (f"{report.num_sprites} sprites", "", ""),
+            *report.rows(),
+        ]
+        surfaces = [[font.render(text, True, "white") for text in row] for row in rows]
+
+        column_widths = [
+            max(row[column].get_width() for row in surfaces)
+            for column in range(len(surfaces[0]))
+        ]
+        line_height = max(surface.get_height() for row in surfaces for surface in row)
+
+        panel = pg.Surface(
+            (
+                sum(column_widths) + OVERLAY_PADDING * (len(column_widths) * 2 + 1),
+                line_height * len(surfaces) + OVERLAY_PADDING * 2,
+            )
+        )
+        panel.fill("black")
+        for line_number, row in enumerate(surfaces):
+            y = OVERLAY_PADDING + line_number * line_height
+            x = OVERLAY_PADDING
+            for column, surface in enumerate(row):
+                # The subsystems are left aligned, the sizes right aligned
+                offset = (
+                    0 if column == 0 else column_widths[column] - surface.get_width()
+                )
+                panel.blit(surface, (x + offset, y))
+                x += column_widths[column] + OVERLAY_PADDING * 2
+
+        self.__panel = panel
+        self.__panel_changed = True
+
+    def draw(self, screen: pg.Surface, redraw: bool) -> pg.Rect | None:
+        """
+        Draw the overlay if the report changed, or if `redraw` is set because what was under it was drawn over.
+        Returns the area drawn to, or `None` if nothing was drawn.
+        """
+
+        if self.__panel is None or not (redraw or self.__panel_changed):
+            return None
+
+        self.__panel_changed = False
+        return screen.blit(self.__panel, self.rect(screen))
+
+
+def measure_grid_size(
+    grid_size: tuple[int, int],
+    tileset: Tileset,
+    screen: pg.Surface,
+    renderer: Renderer,
+) -> MemoryReport:
+    """
+    Create a board of a size, reveal part of it and draw a frame, then report the memory used.
+
+    Only what is allocated from here on is counted, so boards measured before, and the tileset, are left out. Anything
+    left over from a board measured before should be collected first, so that freeing it is not counted against this one.
+    """
+
+    baseline = take_snapshot()
+    num_cells = grid_size[0] * grid_size[1]
+    grid = Grid(
+        tileset,
+        tileset.tile_render_size,
+        screen,
+        max(1, int(num_cells * HEADLESS_BOMB_DENSITY)),
+        random.Random(SEED),
+        None,
+        grid_size,
+        (0, 0),
+        renderer=renderer,
+    )
+
+    click_rng = random.Random(SEED + 1)
+    for _ in range(HEADLESS_CLICKS):
+        col_row = (click_rng.randrange(grid_size[0]), click_rng.randrange(grid_size[1]))
+        if not grid.board.has_bomb(col_row):
+            grid.reveal_click(col_row)
+
+    grid.draw(screen, Camera(screen.get_size(), grid.world_rect()))
+    return memory_report(grid, tileset, baseline)
+
+
+def report_grid_sizes(grid_sizes: list[tuple[int, int]], renderer: Renderer):
+    """
+    Print the bytes per cell of each subsystem across grid sizes, drawn in a window of `HEADLESS_VIEW_SIZE`.
+    Sprites only exist for the tiles in view, so their bytes per cell fall as the grid grows.
+
+    Each size is measured on its own: the board of the size before is freed and collected before the next is made.
+    """
+
+    tracemalloc.start(TRACE_FRAMES)
+    pg.init()
+    pg.display.set_mode((1, 1))
+    screen = pg.Surface(HEADLESS_VIEW_SIZE)
+    tileset = Tileset(TILE_PATH, TILE_SIZE, HEADLESS_TILE_SCALE)
+
+    print(
+        f"{'grid':>11} {'sprites':>8}"
+        + "".join(f" {subsystem:>13}" for subsystem in SUBSYSTEMS)
+        + f" {'total':>13}  (bytes per cell, {renderer.value} renderer)"
+    )
+    for grid_size in grid_sizes:
+        # The grid, sprites and board of the size before only go once their reference cycles are collected
+        gc.collect()
+        report = measure_grid_size(grid_size, tileset, screen, renderer)
+        print(
+            f"{grid_size[0]:>5}x{grid_size[1]:<5} {report.num_sprites:>8}"
+            + "".join(
+                f" {report.bytes_per_cell(subsystem):>13.2f}"
+                for subsystem in SUBSYSTEMS
+            )
+            + f" {report.bytes_per_cell():>13.2f}  ({format_bytes(report.total_bytes)})"
+        )
+
+    pg.quit()
+    tracemalloc.stop()
+
+
+def parse_grid_size(text: str) -> tuple[int, int]:
+    cols, rows = text.lower().split("x")
+    return int(cols), int(rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Bomb Finder memory use per cell across grid sizes"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=parse_grid_size,
+        default=HEADLESS_GRID_SIZES,
+        help="grid sizes to measure, such as 100x100",
+    )
+    parser.add_argument(
+        "--renderer",
+        choices=[renderer.value for renderer in Renderer],
+        default=Renderer.ATLAS.value,
+    )
+    args = parser.parse_args()
+
+    report_grid_sizes(args.sizes, Renderer(args.renderer))
@@ -0,0 +1,145 @@
+import json
+import time
+import hashlib
+from enum import Enum
+from board import Board
+
+RECORDING_VERSION = 1
+
+
+class InputAction(Enum):
+    # Reveal and flag match the values of `board.Action`
+    REVEAL = 0
+    FLAG = 1
+    # The tile shown pressed while the left mouse button is held, or none when it is released
+    PRESS = 2
+    RELEASE = 3
+    # Undoing the last reveal or flag, and redoing it
+    UNDO = 4
+    REDO = 5
+
+
+def board_result(board: Board) -> dict:
+    """
+    The state a board is in, small enough to store with a recording and compare after a replay.
+    """
+
+    bomb_revealed = any(
+        bomb and revealed for bomb, revealed in zip(board.bombs, board.revealed)
+    )
+    return {
+        "won": board.game_was_won,
+        "bomb_revealed": bomb_revealed,
+        "remaining_tiles_to_reveal": board.remaining_tiles_to_reveal,
+        "flags_remaining": board.flags_remaining,
+        # Every tile as it is drawn, so that any difference in the board shows up
+        "tiles_hash": hashlib.blake2b(board.tile_types, digest_size=8).hexdigest(),
+    }
+
+
+class Recording:
+    """
+    Recording keeps everything needed to play a session again: the seed and game config, and the actions made on the
+    grid in order. Actions are stored at the grid level, as (col, row), so they do not depend on the window, camera or
+    mouse position.
+
+    Each action is stored as `[milliseconds since the previous action, action, col, row]`.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        grid_size: tuple[int, int],
+        num_of_bombs: int,
+        bomb_placement: str,
+        no_guess: bool = False,
+        first_click_mode: str = "none",
+    ):
+        self.seed = seed
+        self.grid_size = grid_size
+        self.num_of_bombs = num_of_bombs
+        self.bomb_placement = bomb_placement
+        self.no_guess = no_guess
+        self.first_click_mode = first_click_mode
+
+        # No-guess games are created from a generated seed, recorded so replays do not have to search for it again
+        self.board_seed: int | None = None
+
+        self.actions: list[list[int]] = []
+        self.result: dict | None = None
+
+        self.__last_action_at = time.perf_counter()
+        self.__pressed_tile: tuple[int, int] | None = None
+
+    # == Recording ==
+    def record(self, action: InputAction, col_row: tuple[int, int] = (-1, -1)):
+        now = time.perf_counter()
+        elapsed_ms = round((now - self.__last_action_at) * 1000)
+        self.__last_action_at = now
+
+        self.actions.append([elapsed_ms, action.value, col_row[0], col_row[1]])
+
+    def record_pressed_tile(self, col_row: tuple[int, int] | None):
+        """
+        Record the pressed tile, only when it changes since the game sets it every frame.
+        """
+
+        if col_row == self.__pressed_tile:
+            return
+
+        self.__pressed_tile = col_row
+        if col_row is None:
+            self.record(InputAction.RELEASE)
+        else:
+            self.record(InputAction.PRESS, col_row)
+
+    def finish(self, board: Board):
+        """
+        Keep the state the game ended in, so that a replay can be checked against it.
+        """
+
+        self.result = board_result(board)
+
+    # == Saving and loading ==
+    def save(self, path: str):
+        with open(path, "w") as recording_file:
+            json.dump(
+                {
+                    "version": RECORDING_VERSION,
+                    "seed": self.seed,
+                    "grid_size": list(self.grid_size),
+                    "num_of_bombs": self.num_of_bombs,
+                    "bomb_placement": self.bomb_placement,
+                    "no_guess": self.no_guess,
+                    "first_click_mode": self.first_click_mode,
+                    "board_seed": self.board_seed,
+                    "result": self.result,
+                    "actions": self.actions,
+                },
+                recording_file,
+                separators=(",", ":"),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "Recording":
+        with open(path) as recording_file:
+            data = json.load(recording_file)
+
+        if data["version"] != RECORDING_VERSION:
+            raise ValueError(
+                f"Recording {path} is version {data['version']}, expected {RECORDING_VERSION}."
+            )
+
+        recording = cls(
+            data["seed"],
+            tuple(data["grid_size"]),
+            data["num_of_bombs"],
+            data["bomb_placement"],
+            data["no_guess"],
+            # Recordings made before first click modes always let the first reveal hit a bomb
+            data.get("first_click_mode", "none"),
+        )
+        recording.board_seed = data["board_seed"]
+        recording.result = data["result"]
+        recording.actions = data["actions"]
+        return recording
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Replays run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+from tileset import Tileset
+from board import Board, FirstClickMode, PlacementMode
+from grid import Grid, Renderer
+from camera import Camera
+from recording import InputAction, Recording, board_result
+
+# Rendering, 16x16 tiles since nothing is shown
+TILE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "assets", "asperite_files", "basic-tileset.png"
+)
+REPLAY_TILE_SIZE = (16, 16)
+REPLAY_VIEW_SIZE = (800, 800)
+
+
+def replay(
+    recording: Recording, tileset: Tileset, screen: pg.Surface | None = None
+) -> dict:
+    """
+    Play the actions of a recording on a new grid, as fast as they can be applied.
+
+    If a `screen` is given, the changed tiles are drawn to it after every action, as the game would each frame.
+    Returns the board the replay ended on, and whether it matches the board the recording ended on.
+    """
+
+    started_at = time.perf_counter()
+
+    # Create the board the same way the game did
+    board = None
+    if recording.board_seed is not None:
+        board = Board(
+            recording.grid_size,
+            recording.num_of_bombs,
+            random.Random(recording.board_seed),
+        )
+
+    grid = Grid(
+        tileset,
+        REPLAY_TILE_SIZE,
+        screen,
+        recording.num_of_bombs,
+        random.Random(recording.seed),
+        None,
+        recording.grid_size,
+        (0, 0),
+        bomb_placement=PlacementMode(recording.bomb_placement),
+        renderer=Renderer.ATLAS,
+        board=board,
+        first_click=FirstClickMode(recording.first_click_mode),
+    )
+
+    camera = None
+    if screen is not None:
+        camera = Camera(screen.get_size(), grid.world_rect())
+        grid.draw(screen, camera)
+
+    for _, action, col, row in recording.actions:
+        action = InputAction(action)
+        if action == InputAction.REVEAL:
+            grid.reveal_click((col, row))
+        elif action == InputAction.FLAG:
+            grid.flag_click((col, row))
+        elif action == InputAction.PRESS:
+            grid.set_pressed_tile((col, row))
+        elif action == InputAction.RELEASE:
+            grid.set_pressed_tile(None)
+        elif action == InputAction.UNDO:
+            grid.undo()
+        elif action == InputAction.REDO:
+            grid.redo()
+
+        if camera is not None:
+            grid.draw_dirty(screen, camera)
+
+    result = board_result(grid.board)
+    return {
+        "result": result,
+        "matches": recording.result is None or result == recording.result,
+        "actions": len(recording.actions),
+        "seconds": time.perf_counter() - started_at,
+    }
+
+
+def recording_paths(paths: list[str]) -> list[str]:
+    """
+    The recording files given, with directories expanded to the recordings inside them.
+    """
+
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(
+                os.path.join(path, name)
+                for name in sorted(os.listdir(path))
+                if name.endswith(".json")
+            )
+        else:
+            found.append(path)
+
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay recorded Bomb Finder sessions headless, checking each ends on the recorded board"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="recording files, or directories of them"
+    )
+    parser.add_argument(
+        "--render",
+        action="store_true",
+        help="draw the changed tiles after every action, to include rendering in the timing",
+    )
+    args = parser.parse_args()
+
+    pg.display.init()
+    pg.display.set_mode((1, 1))
+    tileset = Tileset(TILE_PATH, REPLAY_TILE_SIZE, 1)
+    screen = pg.Surface(REPLAY_VIEW_SIZE) if args.render else None
+
+    paths = recording_paths(args.paths)
+    mismatches = 0
+    total_actions = 0
+    started_at = time.perf_counter()
+    for path in paths:
+        replayed = replay(Recording.load(path), tileset, screen)
+        total_actions += replayed["actions"]
+        if not replayed["matches"]:
+            mismatches += 1
+            print(f"MISMATCH: {path} ended on {replayed['result']}")
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"Replayed {len(paths)} recordings, {total_actions} actions in {elapsed:.2f}s"
+        f" ({total_actions / elapsed if elapsed else 0:.0f} actions/s), {mismatches} mismatches"
+    )
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import random
+import argparse
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from board import Action, Board
+from solver import Solver
+from generator import candidate_seed
+
+# Games are handed to the workers in shards, and only a few shards per worker are in flight at once
+SHARD_SIZE = 500
+SHARDS_IN_FLIGHT_PER_WORKER = 2
+PROGRESS_INTERVAL = 5.0  # seconds between progress lines
+
+
+class Policy(ABC):
+    """
+    A policy decides the moves made in a simulated game. A new policy is created for every game.
+    """
+
+    def __init__(self, board: Board, rng: random.Random):
+        self.board = board
+        self.rng = rng
+        self.guesses = 0
+
+    @abstractmethod
+    def next_move(self) -> tuple[Action, tuple[int, int]]:
+        """
+        The next move to make on the board.
+        """
+
+    def observe(self, changed_cells: list[int]):
+        """
+        Called after every move with the cells that changed on the board.
+        """
+
+    def random_unrevealed_cell(
+        self, excluded: set[int] | None = None
+    ) -> tuple[int, int]:
+        """
+        A random cell that has not been revealed, and is not one of the excluded cells if any are left.
+        """
+
+        board = self.board
+        cells = [
+            index
+            for index in range(board.num_cells)
+            if not board.revealed[index] and (excluded is None or index not in excluded)
+        ]
+        if not cells:
+            cells = [
+                index for index in range(board.num_cells) if not board.revealed[index]
+            ]
+
+        return board.col_row(self.rng.choice(cells))
+
+
+class RandomPolicy(Policy):
+    """
+    Reveals random cells until the game ends.
+    """
+
+    def next_move(self) -> tuple[Action, tuple[int, int]]:
+        self.guesses += 1
+        return (Action.REVEAL, self.random_unrevealed_cell())
+
+
+class SolverPolicy(Policy):
+    """
+    Reveals the cells the solver is certain are safe, guessing a random unknown cell only when there are none.
+    """
+
+    def __init__(self, board: Board, rng: random.Random):
+        super().__init__(board, rng)
+        self.__solver = Solver(board)
+        self.__moves: list[tuple[int, int]] = []
+
+    def next_move(self) -> tuple[Action, tuple[int, int]]:
+        if not self.__moves:
+            self.__moves = self.__solver.next_safe_moves()
+
+        while self.__moves:
+            col_row = self.__moves.pop()
+            if not self.board.was_revealed(col_row):
+                return (Action.REVEAL, col_row)
+
+        self.guesses += 1
+        certain_mines = {
+            self.board.index(col_row) for col_row in self.__solver.certain_mines()
+        }
+        return (Action.REVEAL, self.random_unrevealed_cell(certain_mines))
+
+    def observe(self, changed_cells: list[int]):
+        self.__solver.update(changed_cells)
+
+
+POLICIES: dict[str, type[Policy]] = {
+    "random": RandomPolicy,
+    "solver": SolverPolicy,
+}
+
+
+def play_game(
+    grid_size: tuple[int, int], num_of_bombs: int, seed: int, policy_name: str
+) -> dict:
+    """
+    Play a single game to the end with the policy, applying its moves with the same rules as the game itself.
+    """
+
+    started_at = time.perf_counter()
+    board = Board(grid_size, num_of_bombs, random.Random(seed))
+    policy = POLICIES[policy_name](board, random.Random(seed + 1))
+
+    moves = 0
+    bomb_not_clicked = True
+    while bomb_not_clicked and not board.game_was_won:
+        action, col_row = policy.next_move()
+        bomb_not_clicked = board.apply(action, col_row)
+        policy.observe(board.last_changed)
+        moves += 1
+
+    return {
+        "seed": seed,
+        "won": board.game_was_won,
+        "moves": moves,
+        "guesses": policy.guesses,
+        "cells_left": board.remaining_tiles_to_reveal,
+        "seconds": time.perf_counter() - started_at,
+    }
+
+
+def play_shard(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    base_seed: int,
+    policy_name: str,
+    first_game: int,
+    num_games: int,
+) -> list[dict]:
+    """
+    Play a shard of games in a worker. Each game has its own seed, derived from the base seed and its number.
+    """
+
+    results = []
+    for game in range(first_game, first_game + num_games):
+        result = play_game(
+            grid_size, num_of_bombs, candidate_seed(base_seed, game), policy_name
+        )
+        result["game"] = game
+        results.append(result)
+
+    return results
+
+
+def simulate(
+    grid_size: tuple[int, int],
+    num_of_bombs: int,
+    num_games: int,
+    base_seed: int,
+    policy_name: str,
+    output_path: str,
+    workers: int | None = None,
+):
+    """
+    Play many games across a process pool, streaming each result to a JSON lines file as shards finish, then print the
+    aggregate statistics.
+    """
+
+    if num_games < 1:
+        raise ValueError(
+            f"Unable to simulate {num_games} games, at least one is needed."
+        )
+
+    workers = workers or os.cpu_count() or 1
+    shards = (
+        (first_game, min(SHARD_SIZE, num_games - first_game))
+        for first_game in range(0, num_games, SHARD_SIZE)
+    )
+
+    games_played = 0
+    games_won = 0
+    total_guesses = 0
+    started_at = time.perf_counter()
+    last_progress_at = started_at
+
+    with (
+        open(output_path, "w") as output_file,
+        ProcessPoolExecutor(max_workers=workers) as executor,
+    ):
+        in_flight = set()
+        while True:
+            # Keep a few shards per worker queued, without submitting every game at once
+            while len(in_flight) < workers * SHARDS_IN_FLIGHT_PER_WORKER:
+                shard = next(shards, None)
+                if shard is None:
+                    break
+                in_flight.add(
+                    executor.submit(
+                        play_shard,
+                        grid_size,
+                        num_of_bombs,
+                        base_seed,
+                        policy_name,
+                        *shard,
+                    )
+                )
+
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                for result in future.result():
+                    output_file.write(json.dumps(result) + "\n")
+                    games_played += 1
+                    games_won += result["won"]
+                    total_guesses += result["guesses"]
+
+            now = time.perf_counter()
+            if now - last_progress_at > PROGRESS_INTERVAL:
+                last_progress_at = now
+                print(
+                    f"{games_played}/{num_games} games, "
+                    f"{games_played / (now - started_at):.0f} games/s"
+                )
+
+    elapsed = time.perf_counter() - started_at
+    print(
+        f"{grid_size[0]}x{grid_size[1]} with {num_of_bombs} bombs, {policy_name} policy\n"
+        f"Games: {games_played}, won: {games_won} ({games_won / games_played:.2%})\n"
+        f"Guesses per game: {total_guesses / games_played:.2f}\n"
+        f"Throughput: {games_played / elapsed:.0f} games/s across {workers} workers"
+    )
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive number")
+
+    return number
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Play Bomb Finder games headless to gather win rate statistics"
+    )
+    parser.add_argument(
+        "--grid-size", default="30x16", help="columns x rows, e.g. 30x16"
+    )
+    parser.add_argument("--bombs", type=int, default=99)
+    parser.add_argument("--games", type=positive_int, default=10_000)
+    parser.add_argument(
+        "--seed", type=lambda value: int(value, 0), default=0xABCDEF1234
+    )
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="solver")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--output",
+        default="simulation.jsonl",
+        help="JSON lines file, one line per game",
+    )
+    args = parser.parse_args()
+
+    grid_cols, grid_rows = (int(size) for size in args.grid_size.split("x"))
+    simulate(
+        (grid_cols, grid_rows),
+        args.bombs,
+        args.games,
+        args.seed,
+        args.policy,
+        args.output,
+        args.workers,
+    )
@@ -0,0 +1,247 @@
+import random
+from board import Board, CERTAIN_FLAG
+
+
+class Solver:
+    """
+    Solver finds cells that are certainly safe, and cells that are certainly mines, using only what a player can see
+    on the board: the numbers on revealed cells, and optionally the flags.
+
+    The solver is incremental. After each reveal, `update` is given the cells that changed, and only the numbered
+    cells around them are looked at again, rather than rescanning the whole board. The numbered cells that still
+    have unknown cells around them make up the frontier.
+
+    Two rules are applied:
+    - Single cell: if a number already touches as many known mines as it shows, its other unknown neighbors are safe.
+      If it has exactly as many unknown neighbors as it has mines left, they are all mines.
+    - Subset: if the unknown neighbors of one number are all neighbors of a second number, the cells only around the
+      second number hold the difference of their mines left. That can make all of them safe, or all of them mines.
+    """
+
+    def __init__(self, board: Board, trust_flags: bool = False):
+        self.__board = board
+        self.__trust_flags = trust_flags
+
+        # Solver state, all flat indexes of the board
+        self.__safe_cells: set[int] = set()
+        self.__mine_cells: set[int] = set()
+        self.__frontier: set[int] = set()
+        self.__to_check: set[int] = set()
+        self.__to_check_subsets: set[int] = set()
+
+        # Start from what is already visible on the board
+        for index in range(self.__board.num_cells):
+            if self.__board.revealed[index]:
+                self.__to_check.add(index)
+            elif trust_flags and self.__board.flags[index] == CERTAIN_FLAG:
+                self.__mine_cells.add(index)
+
+    # == Public Methods ==
+    def update(self, changed_cells: list[int]):
+        """
+        Tell the solver which cells changed, such as `Board.last_changed` after a reveal or flag click.
+        Only the numbered cells around them will be looked at again.
+        """
+
+        board = self.__board
+        for index in changed_cells:
+            self.__safe_cells.discard(index)
+
+            if (
+                self.__trust_flags
+                and not board.revealed[index]
+                and board.flags[index] == CERTAIN_FLAG
+            ):
+                self.__mine_cells.add(index)
+
+            self.__to_check.add(index)
+            self.__to_check.update(self.__neighbors_of(index))
+
+    def next_safe_moves(self) -> list[tuple[int, int]]:
+        """
+        The cells that are certain to be safe to reveal, as (col, row).
+        An empty list means no move can be found without guessing.
+        """
+
+        self.__deduce()
+        return [self.__board.col_row(index) for index in sorted(self.__safe_cells)]
+
+    def certain_mines(self) -> list[tuple[int, int]]:
+        """
+        The cells that are certain to be mines, as (col, row).
+        """
+
+        self.__deduce()
+        return [self.__board.col_row(index) for index in sorted(self.__mine_cells)]
+
+    def auto_play(
+        self,
+        first_click: tuple[int, int] | None = None,
+        guess_rng: random.Random | None = None,
+    ) -> bool:
+        """
+        Play the board until the game is won, lost, or no safe move can be found.
+
+        When there is no safe move, a random unknown cell is revealed if `guess_rng` is given, otherwise play stops.
+        Returns whether the game was won.
+        """
+
+        board = self.__board
+        if first_click is not None and not self.__reveal(first_click):
+            return False
+
+        while not board.game_was_won:
+            moves = self.next_safe_moves()
+
+            if not moves:
+                if guess_rng is None:
+                    return False
+
+                unknown_cells = [
+                    index
+                    for index in range(board.num_cells)
+                    if not board.revealed[index] and index not in self.__mine_cells
+                ]
+                if not unknown_cells:
+                    return board.game_was_won
+                moves = [board.col_row(guess_rng.choice(unknown_cells))]
+
+            for col_row in moves:
+                if not self.__reveal(col_row):
+                    return False
+
+        return True
+
+    # == Private Methods ==
+    def __reveal(self, col_row: tuple[int, int]) -> bool:
+        """
+        Reveal a cell on the board and update the solver with the cells that changed.
+        Returns `False` if a bomb was revealed.
+        """
+
+        bomb_not_clicked = self.__board.reveal_click(col_row)
+        self.update(self.__board.last_changed)
+        return bomb_not_clicked
+
+    def __neighbors_of(self, index: int) -> list[int]:
+        """
+        The indexes of the cells surrounding a cell, inside the grid.
+        """
+
+        cols, rows = self.__board.cols, self.__board.rows
+        row, col = divmod(index, cols)
+
+        surrounding = []
+        for check_row in range(max(row - 1, 0), min(row + 2, rows)):
+            for check_col in range(max(col - 1, 0), min(col + 2, cols)):
+                if check_row != row or check_col != col:
+                    surrounding.append(check_row * cols + check_col)
+
+        return surrounding
+
+    def __constraint(self, index: int) -> tuple[set[int], int]:
+        """
+        The unknown cells around a revealed number, and how many of them are mines.
+        """
+
+        board = self.__board
+        unknown_cells = set()
+        mines_left = board.neighbors[index]
+        for neighbor in self.__neighbors_of(index):
+            if neighbor in self.__mine_cells:
+                mines_left -= 1
+            elif not board.revealed[neighbor]:
+                unknown_cells.add(neighbor)
+
+        return unknown_cells, mines_left
+
+    def __deduce(self):
+        """
+        Apply the single cell rule to every cell waiting to be checked, then the subset rule to the frontier cells that
+        changed, repeating until neither finds anything new.
+        """
+
+        while self.__to_check or self.__to_check_subsets:
+            while self.__to_check:
+                self.__check_single(self.__to_check.pop())
+
+            if self.__to_check_subsets:
+                self.__check_subset(self.__to_check_subsets.pop())
+
+    def __check_single(self, index: int):
+        """
+        Apply the single cell rule to a revealed number.
+        """
+
+        board = self.__board
+        if not board.revealed[index] or board.bombs[index]:
+            # Not a number, or a revealed bomb which ends the game
+            self.__frontier.discard(index)
+            return
+
+        unknown_cells, mines_left = self.__constraint(index)
+        unknown_cells -= self.__safe_cells
+        if not unknown_cells:
+            self.__frontier.discard(index)
+            return
+
+        self.__frontier.add(index)
+        self.__to_check_subsets.add(index)
+
+        if mines_left == 0:
+            self.__mark_safe(unknown_cells)
+        elif mines_left == len(unknown_cells):
+            self.__mark_mines(unknown_cells)
+
+    def __check_subset(self, index: int):
+        """
+        Apply the subset rule between a frontier number and every frontier number close enough to share unknown cells.
+        """
+
+        if index not in self.__frontier:
+            return
+
+        unknown_cells, mines_left = self.__constraint(index)
+        unknown_cells -= self.__safe_cells
+
+        cols, rows = self.__board.cols, self.__board.rows
+        row, col = divmod(index, cols)
+        for check_row in range(max(row - 2, 0), min(row + 3, rows)):
+            for check_col in range(max(col - 2, 0), min(col + 3, cols)):
+                other = check_row * cols + check_col
+                if other == index or other not in self.__frontier:
+                    continue
+
+                other_unknown, other_mines_left = self.__constraint(other)
+                other_unknown -= self.__safe_cells
+
+                # Check both ways around, either one may be the subset
+                for small, small_mines, large, large_mines in (
+                    (unknown_cells, mines_left, other_unknown, other_mines_left),
+                    (other_unknown, other_mines_left, unknown_cells, mines_left),
+                ):
+                    if not small or not small < large:
+                        continue
+
+                    difference = large - small
+                    difference_mines = large_mines - small_mines
+                    if difference_mines == 0:
+                        self.__mark_safe(difference)
+                        return
+                    elif difference_mines == len(difference):
+                        self.__mark_mines(difference)
+                        return
+
+    def __mark_safe(self, cells: set[int]):
+        self.__safe_cells.update(cells)
+
+        # A safe cell is no longer unknown to the numbers around it
+        for index in cells:
+            self.__to_check.update(self.__neighbors_of(index))
+
+    def __mark_mines(self, cells: set[int]):
+        self.__mine_cells.update(cells)
+
+        # Numbers around a mine have one less mine left to find
+        for index in cells:
+            self.__to_check.update(self.__neighbors_of(index))
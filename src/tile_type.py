@@ -0,0 +1,35 @@
+from enum import Enum
+
+
+class TileType(Enum):
+    # First row
+    UNCLICKED = 0  # Not clicked yet
+    CLICKED_EMPTY = 1  # Clicked with no number
+    CLICKED_ONE = 2
+    CLICKED_TWO = 3
+    CLICKED_THREE = 4
+    CLICKED_FOUR = 5
+    CLICKED_FIVE = 6
+    CLICKED_SIX = 7
+    CLICKED_SEVEN = 8
+    CLICKED_EIGHT = 9
+    # Second row
+    CLICKED_CERTAIN = 10
+    CLICKED_UNCERTAIN = 11
+    UNCLICKED_CERTAIN = 12
+    UNCLICKED_UNCERTAIN = 13
+    # Third row
+    BOMB_A = 20
+    BOMB_B = 21
+    BOMB_C = 22
+    BOMB_D = 23
+    BOMB_E = 24
+    BOMB_F = 25
+    BOMB_G = 26
+    BOMB_H = 27
+    BOMB_I = 28
+    BOMB_J = 29
+    BOMB_K = 38
+    BOMB_L = 39
+    BOMB_M = 48
+    BOMB_N = 49
@@ -1,77 +1,169 @@
-from enum import Enum
+import os
+import hashlib
+from collections import OrderedDict
 import pygame as pg
+from tile_type import TileType
 
-
-class TileType(Enum):
-    # First row
-    UNCLICKED = 0  # Not clicked yet
-    CLICKED_EMPTY = 1  # Clicked with no number
-    CLICKED_ONE = 2
-    CLICKED_TWO = 3
-    CLICKED_THREE = 4
-    CLICKED_FOUR = 5
-    CLICKED_FIVE = 6
-    CLICKED_SIX = 7
-    CLICKED_SEVEN = 8
-    CLICKED_EIGHT = 9
-    # Second row
-    CLICKED_CERTAIN = 10
-    CLICKED_UNCERTAIN = 11
-    UNCLICKED_CERTAIN = 12
-    UNCLICKED_UNCERTAIN = 13
-    # Third row
-    BOMB_A = 20
-    BOMB_B = 21
-    BOMB_C = 22
-    BOMB_D = 23
-    BOMB_E = 24
-    BOMB_F = 25
-    BOMB_G = 26
-    BOMB_H = 27
-    BOMB_I = 28
-    BOMB_J = 29
-    BOMB_K = 38
-    BOMB_L = 39
-    BOMB_M = 48
-    BOMB_N = 49
+# Scaled copies of the atlas kept for zooming, the least recently used is dropped past this many
+ZOOM_CACHE_SIZE = 3
 
 
 class Tileset:
-    def __init__(self, path, tile_size=(16, 16), scale=4):
+    """
+    Tileset slices a tileset image into a tile surface per TileType, scaled up for rendering.
+
+    The scale can be changed to zoom. Each scale is built once from the unscaled tiles, and the most recently used
+    scales are kept, so switching between them never scales a tile while drawing.
+    """
+
+    def __init__(
+        self,
+        path,
+        tile_size=(16, 16),
+        scale=4,
+        cache_dir=None,
+        zoom_cache_size=ZOOM_CACHE_SIZE,
+    ):
         self.__path: str = path
         self.__tile_size: tuple[int, int] = tile_size
         self.__tiles: list[pg.Surface] = []
-        self.__scale: int = scale
+        self.__scale: float = scale
+        self.__cache_dir: str | None = cache_dir
+        self.loaded_from_cache: bool = False
+
+        # Zoom levels, the tiles of each scale built so far and the unscaled tiles they are built from
+        self.__zoom_cache_size = zoom_cache_size
+        self.__levels: OrderedDict[float, list[pg.Surface]] = OrderedDict()
+        self.__base_tiles: list[pg.Surface] | None = None
+
+        # A whole number scale is cut out of the atlas scaled at once, which can be cached. Other scales are built a
+        # tile at a time like zoom levels, so that no tile blends in pixels from its neighbors
+        if scale == int(scale):
+            self.__make_tiles(self.__load_scaled_atlas())
+        else:
+            self.__tiles = self.__make_level(scale)
+        self.__levels[scale] = self.__tiles
+
+    @property
+    def scale(self) -> float:
+        return self.__scale
+
+    @property
+    def tile_render_size(self) -> tuple[int, int]:
+        return self.__tiles[0].get_size()
+
+    def set_scale(self, scale: float):
+        """
+        Switch the tiles to another scale, building them from the unscaled tiles if the scale is not cached.
+        """
+
+        tiles = self.__levels.get(scale)
+        if tiles is None:
+            tiles = self.__make_level(scale)
+            self.__levels[scale] = tiles
+            if len(self.__levels) > self.__zoom_cache_size:
+                self.__levels.popitem(last=False)
+        else:
+            self.__levels.move_to_end(scale)
+
+        self.__tiles = tiles
+        self.__scale = scale
+
+    def __load_scaled_atlas(self) -> pg.Surface:
+        """
+        Load the whole tileset already scaled, from the cache if it has been scaled before.
+        The cached file is keyed by the hash of the tileset file, the tile size and the scale.
+        """
+
+        with open(self.__path, "rb") as tileset_file:
+            source = tileset_file.read()
+
+        # cached as an uncompressed bitmap, which loads faster than decoding a png
+        cache_path = None
+        if self.__cache_dir is not None:
+            source_hash = hashlib.sha256(source).hexdigest()[:16]
+            tile_width, tile_height = self.__tile_size
+            cache_path = os.path.join(
+                self.__cache_dir,
+                f"tileset-{source_hash}-{tile_width}x{tile_height}-x{self.__scale}.bmp",
+            )
 
-        # processing
-        self.__image: pg.Surface = pg.image.load(self.__path).convert()
-        self.__rect: pg.Rect = self.__image.get_rect()
-        self.__og_image_height_px: int = self.__image.height
-        self.__og_image_width_px: int = self.__image.width
+            if os.path.exists(cache_path):
+                self.loaded_from_cache = True
+                return pg.image.load(cache_path).convert()
 
-        # calling methods
-        self.__make_tiles()
-        self.__scale_by(scale)
+        image = pg.image.load(self.__path).convert()
+        scaled_image = pg.transform.scale_by(image, self.__scale).convert()
 
-    def __make_tiles(self):
+        if cache_path is not None:
+            os.makedirs(self.__cache_dir, exist_ok=True)
+            pg.image.save(scaled_image, cache_path)
+
+        return scaled_image
+
+    def __make_tiles(self, image: pg.Surface):
         self.__tiles = []
-        tile_width = self.__tile_size[0]
-        tile_height = self.__tile_size[1]
+        tile_width = self.__tile_size[0] * int(self.__scale)
+        tile_height = self.__tile_size[1] * int(self.__scale)
 
         # iterates from top left corner, to top right corner, then down a row
-        for row in range(0, self.__rect.height, tile_height):
-            for col in range(0, self.__rect.width, tile_width):
-                tile_image = pg.Surface(self.__tile_size)
-                tile_image.blit(self.__image, (0, 0), (col, row, *self.__tile_size))
-                self.__tiles.append(tile_image.convert())
-
-    def __scale_by(self, scale):
-        self.__tiles = [
-            pg.transform.scale(
-                tile, (int(tile.get_width() * scale), int(tile.get_height() * scale))
-            ).convert()
-            for tile in self.__tiles
-        ]
+        # tiles share the pixels of the atlas, rather than each being copied into their own surface
+        for row in range(0, image.get_height(), tile_height):
+            for col in range(0, image.get_width(), tile_width):
+                self.__tiles.append(
+                    image.subsurface((col, row, tile_width, tile_height))
+                )
+
+    def __make_level(self, scale: float) -> list[pg.Surface]:
+        """
+        Build the tiles at a scale, by scaling each unscaled tile into a new atlas. Tiles are scaled one at a time so
+        that scales which are not whole numbers never blend pixels from neighboring tiles.
+        """
+
+        if self.__base_tiles is None:
+            base_image = pg.image.load(self.__path).convert()
+            base_width, base_height = self.__tile_size
+            self.__base_tiles = [
+                base_image.subsurface((col, row, base_width, base_height))
+                for row in range(0, base_image.get_height(), base_height)
+                for col in range(0, base_image.get_width(), base_width)
+            ]
+
+        base_width, base_height = self.__tile_size
+        tile_width = max(round(base_width * scale), 1)
+        tile_height = max(round(base_height * scale), 1)
+
+        # Laid out in a single row, tiles share the pixels of the atlas like the tiles of the first scale
+        atlas = pg.Surface((tile_width * len(self.__base_tiles), tile_height)).convert()
+        tiles = []
+        for number, base_tile in enumerate(self.__base_tiles):
+            position = (number * tile_width, 0)
+            atlas.blit(
+                pg.transform.scale(base_tile, (tile_width, tile_height)), position
+            )
+            tiles.append(atlas.subsurface((position, (tile_width, tile_height))))
+
+        return tiles
 
     def get_tile(self, type: TileType) -> pg.Surface:
         return self.__tiles[type.value]
+
+    def get_tiles(self) -> list[pg.Surface]:
+        # indexed by TileType value, for renderers that look up many tiles at once
+        return self.__tiles
+
+    def cached_tiles(self) -> list[pg.Surface]:
+        """
+        The tiles kept for zooming besides the ones being drawn, the other cached scales and the unscaled tiles.
+        """
+
+        tiles = [
+            tile
+            for level in self.__levels.values()
+            if level is not self.__tiles
+            for tile in level
+        ]
+        if self.__base_tiles is not None:
+            tiles.extend(self.__base_tiles)
+
+        return tiles
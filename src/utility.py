@@ -1,14 +1,13 @@
-from tile_sprite import TileSprite
-
-
 def calculate_neighbors(
     center_tile: tuple[int, int],
     grid_cols: int,
     grid_rows: int,
-    grid: list[list[TileSprite]],
+    bombs: bytearray,
 ) -> int:
     """
     Counts the bombs surrounding the tile in the center.
+
+    The bombs are provided as a flat mask, with one byte per cell, indexed as `row * grid_cols + col`.
     """
 
     number_of_bombs = 0
@@ -32,31 +31,68 @@ def calculate_neighbors(
                 continue
 
             # check for bomb
-            if grid[tile_col][tile_row].has_bomb:
+            if bombs[tile_row * grid_cols + tile_col]:
                 number_of_bombs += 1
 
     # print(f"tile {center_tile} as {number_of_bombs} bombs")
     return number_of_bombs
 
 
+def count_all_neighbors(bombs: bytearray, grid_cols: int, grid_rows: int) -> bytearray:
+    """
+    Counts the bombs surrounding every tile in the grid in one pass, giving the same results as calling
+    `calculate_neighbors` for every tile.
+
+    Each row of the bomb mask is read as a single integer with one byte per tile. Since a count can never
+    be more than 8, adding shifted copies of the rows never carries into the next byte, so the 3x3 sums are
+    done as a handful of integer operations per row, instead of a Python loop per tile.
+    """
+
+    row_width = grid_cols + 1
+    row_masks = [
+        int.from_bytes(bombs[row * grid_cols : (row + 1) * grid_cols], "little")
+        for row in range(grid_rows)
+    ]
+
+    # Sum of the tile itself, and the tiles to the left and right of it
+    row_sums = [mask + (mask << 8) + (mask >> 8) for mask in row_masks]
+
+    neighbors = bytearray()
+    for row in range(grid_rows):
+        # skip counting the center tile itself
+        total = row_sums[row] - row_masks[row]
+
+        if row > 0:
+            total += row_sums[row - 1]
+        if row < grid_rows - 1:
+            total += row_sums[row + 1]
+
+        # the left shift spills one byte past the end of the row
+        neighbors += total.to_bytes(row_width, "little")[:grid_cols]
+
+    return neighbors
+
+
 def click_to_tile_coord(
     click_coord: tuple[int, int],
     grid_topleft: tuple[int, int],
     tile_render_size: tuple[int, int],
+    camera_offset: tuple[int, int] = (0, 0),
 ) -> tuple[int, int]:
     """
-    Converts screen coordinates to tile grid coordinates.
+    Converts screen coordinates to tile grid coordinates, accounting for how far the camera has scrolled.
     """
 
     # Unpacking tuples
     click_x, click_y = click_coord
     grid_left, grid_top = grid_topleft
     tile_width, tile_height = tile_render_size
+    camera_x, camera_y = camera_offset
 
     # Click position relative to the tile grid
     rel_click_x, rel_click_y = (
-        click_x - grid_left,
-        click_y - grid_top,
+        click_x + camera_x - grid_left,
+        click_y + camera_y - grid_top,
     )
 
     # Floor divide the click position to find the tile coordinates
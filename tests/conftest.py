@@ -0,0 +1,26 @@
+import os
+import pytest
+
+# Tests that draw run without opening a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import pygame as pg
+
+from tileset import Tileset
+
+TILE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "assets", "asperite_files", "basic-tileset.png"
+)
+TILE_SIZE = (16, 16)
+SCREEN_SIZE = (800, 800)
+
+
+@pytest.fixture
+def screen():
+    pg.init()
+    yield pg.display.set_mode(SCREEN_SIZE)
+    pg.quit()
+
+
+@pytest.fixture
+def tileset(screen) -> Tileset:
+    return Tileset(TILE_PATH, TILE_SIZE, 4)
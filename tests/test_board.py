@@ -0,0 +1,291 @@
+import random
+import pytest
+from board import Board, FirstClickMode, PlacementMode, CERTAIN_FLAG
+from utility import count_all_neighbors
+from tile_type import TileType
+
+
+class ReferenceTile:
+    """
+    A tile of the grid as TileSprite kept it, before the state moved onto Board.
+    """
+
+    def __init__(self):
+        self.num_neighbors = 0
+        self.has_bomb = False
+        self.was_clicked = False
+        self.tile_type = TileType.UNCLICKED
+
+    def reveal(self):
+        if self.was_clicked:
+            return
+
+        self.was_clicked = True
+        if self.has_bomb:
+            self.tile_type = TileType.BOMB_A
+        elif self.num_neighbors == 0:
+            self.tile_type = TileType.CLICKED_EMPTY
+        else:
+            self.tile_type = TileType(self.num_neighbors + 1)
+
+    def cycle_flag(self) -> tuple[bool, bool]:
+        if self.tile_type == TileType.UNCLICKED_CERTAIN:
+            self.tile_type = TileType.UNCLICKED_UNCERTAIN
+            return (True, False)
+
+        elif self.tile_type == TileType.UNCLICKED_UNCERTAIN:
+            self.tile_type = TileType.UNCLICKED
+            return (False, False)
+
+        elif self.tile_type == TileType.UNCLICKED:
+            self.tile_type = TileType.UNCLICKED_CERTAIN
+            return (True, True)
+
+        return (False, False)
+
+    def has_flag(self) -> bool:
+        return self.tile_type == TileType.UNCLICKED_CERTAIN
+
+
+class ReferenceGrid:
+    """
+    The game logic as Grid ran it on a tile object per cell, with the flood searching a list of tiles to visit.
+
+    Two changes made along with Board are kept here too: a Certain Flag revealed by a flood is given back, and nothing
+    changes once the game has ended.
+    """
+
+    def __init__(self, grid_size: tuple[int, int], bombs: bytes):
+        self.cols, self.rows = grid_size
+        self.tile_grid = [
+            [ReferenceTile() for _ in range(self.rows)] for _ in range(self.cols)
+        ]
+        for col in range(self.cols):
+            for row in range(self.rows):
+                self.tile_grid[col][row].has_bomb = bool(bombs[row * self.cols + col])
+
+        for col in range(self.cols):
+            for row in range(self.rows):
+                self.tile_grid[col][row].num_neighbors = sum(
+                    self.tile_grid[col + col_change][row + row_change].has_bomb
+                    for col_change in range(-1, 2)
+                    for row_change in range(-1, 2)
+                    if (col_change or row_change)
+                    and 0 <= col + col_change < self.cols
+                    and 0 <= row + row_change < self.rows
+                )
+
+        num_of_bombs = bombs.count(1)
+        self.remaining_tiles_to_reveal = self.cols * self.rows - num_of_bombs
+        self.flags_remaining = num_of_bombs
+        self.game_was_won = False
+        self.game_was_lost = False
+
+    def reveal_click(self, col_row: tuple[int, int]) -> bool:
+        if self.game_was_won or self.game_was_lost:
+            return not self.game_was_lost
+
+        col, row = col_row
+        tile = self.tile_grid[col][row]
+        if tile.has_flag() or tile.was_clicked:
+            return True
+
+        elif tile.has_bomb:
+            tile.reveal()
+            self.game_was_lost = True
+            return False
+
+        elif tile.num_neighbors == 0:
+            self.remaining_tiles_to_reveal -= self.flood_tiles(col_row)
+
+        else:
+            tile.reveal()
+            self.remaining_tiles_to_reveal -= 1
+
+        if self.remaining_tiles_to_reveal <= 0:
+            self.game_was_won = True
+
+        return True
+
+    def flag_click(self, col_row: tuple[int, int]):
+        if self.game_was_won or self.game_was_lost:
+            return
+
+        col, row = col_row
+        update_flag_count, tile_now_has_flag = self.tile_grid[col][row].cycle_flag()
+        if update_flag_count:
+            self.flags_remaining += -1 if tile_now_has_flag else 1
+
+    def flood_tiles(self, first_tile: tuple[int, int]) -> int:
+        num_revealed_tiles = 0
+        to_visit_list = [first_tile]
+        while to_visit_list:
+            col, row = to_visit_list.pop()
+            tile = self.tile_grid[col][row]
+            if tile.has_flag():
+                self.flags_remaining += 1
+            tile.reveal()
+            num_revealed_tiles += 1
+
+            if tile.num_neighbors != 0:
+                continue
+
+            for col_change in range(-1, 2):
+                for row_change in range(-1, 2):
+                    check_col, check_row = col + col_change, row + row_change
+                    if col_change == 0 and row_change == 0:
+                        continue
+                    if not (0 <= check_col < self.cols and 0 <= check_row < self.rows):
+                        continue
+                    if (check_col, check_row) in to_visit_list:
+                        continue
+                    if self.tile_grid[check_col][check_row].was_clicked:
+                        continue
+                    to_visit_list.append((check_col, check_row))
+
+        return num_revealed_tiles
+
+    def tile_types(self) -> list[TileType]:
+        return [
+            self.tile_grid[col][row].tile_type
+            for row in range(self.rows)
+            for col in range(self.cols)
+        ]
+
+
+def random_board(seed: int, max_size: int = 30) -> Board:
+    rng = random.Random(seed)
+    grid_size = (rng.randint(1, max_size), rng.randint(1, max_size))
+    num_of_bombs = rng.randint(0, grid_size[0] * grid_size[1] // 4)
+    return Board(grid_size, num_of_bombs, random.Random(seed))
+
+
+def board_tile_types(board: Board) -> list[TileType]:
+    return [
+        board.tile_type((col, row))
+        for row in range(board.rows)
+        for col in range(board.cols)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_board_matches_reference_grid(seed):
+    board = random_board(seed)
+    reference = ReferenceGrid(board.grid_size, board.bombs)
+    rng = random.Random(seed + 1)
+
+    for _ in range(40):
+        col_row = (rng.randrange(board.cols), rng.randrange(board.rows))
+        if rng.random() < 0.25:
+            board.flag_click(col_row)
+            reference.flag_click(col_row)
+        else:
+            assert board.reveal_click(col_row) == reference.reveal_click(col_row)
+
+        assert board_tile_types(board) == reference.tile_types()
+        assert board.remaining_tiles_to_reveal == reference.remaining_tiles_to_reveal
+        assert board.flags_remaining == reference.flags_remaining
+        assert board.game_was_won == reference.game_was_won
+        assert board.game_was_lost == reference.game_was_lost
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_sparse_flood_matches_reference_grid(seed):
+    # Few bombs make floods of long spans, broken up by the numbers around each bomb
+    rng = random.Random(seed)
+    board = Board((48, 32), rng.randint(1, 15), random.Random(seed))
+    reference = ReferenceGrid(board.grid_size, board.bombs)
+    board.flag_click((rng.randrange(48), rng.randrange(32)))
+    reference.flag_click(board.col_row(board.last_changed[0]))
+
+    for index in range(board.num_cells):
+        if board.neighbors[index] == 0 and not board.bombs[index]:
+            board.reveal_click(board.col_row(index))
+            reference.reveal_click(board.col_row(index))
+            break
+
+    assert board_tile_types(board) == reference.tile_types()
+    assert board.remaining_tiles_to_reveal == reference.remaining_tiles_to_reveal
+    assert board.flags_remaining == reference.flags_remaining
+
+
+def test_flood_reports_the_cells_it_revealed():
+    board = Board((40, 30), 0, random.Random(1))
+
+    board.reveal_click((5, 5))
+
+    assert sorted(board.last_changed) == list(range(board.num_cells))
+    assert board.revealed.count(1) == board.num_cells
+    assert board.game_was_won
+
+
+def test_flood_gives_back_the_flags_it_reveals():
+    board = Board((10, 10), 0, random.Random(1))
+    board.flag_click((9, 9))
+    assert board.flags_remaining == -1
+
+    board.reveal_click((0, 0))
+
+    assert board.flags_remaining == 0
+    assert board.flags.count(CERTAIN_FLAG) == 0
+
+
+def test_nothing_changes_once_the_game_is_lost():
+    board = Board((10, 10), 10, random.Random(2))
+    bomb = board.col_row(board.bombs.index(1))
+    assert not board.reveal_click(bomb)
+    tile_types = bytes(board.tile_types)
+
+    for index in range(board.num_cells):
+        board.reveal_click(board.col_row(index))
+        assert board.last_changed == []
+        board.flag_click(board.col_row(index))
+        assert board.last_changed == []
+
+    assert board.tile_types == tile_types
+
+
+@pytest.mark.parametrize("placement", list(PlacementMode))
+@pytest.mark.parametrize("num_of_bombs", [0, 1, 50, 150, 199, 200])
+def test_board_places_every_bomb(placement, num_of_bombs):
+    board = Board((20, 10), num_of_bombs, random.Random(1), placement=placement)
+
+    assert board.bombs.count(1) == num_of_bombs
+    assert board.remaining_tiles_to_reveal == 200 - num_of_bombs
+    assert board.flags_remaining == num_of_bombs
+
+
+def test_placement_is_the_same_for_a_seed():
+    first = Board((50, 50), 400, random.Random(7))
+    second = Board((50, 50), 400, random.Random(7))
+
+    assert first.bombs == second.bombs
+
+
+def test_more_bombs_than_cells_raises():
+    with pytest.raises(ValueError):
+        Board((5, 5), 26, random.Random(1))
+
+
+@pytest.mark.parametrize("first_click", [FirstClickMode.DEFER, FirstClickMode.RELOCATE])
+@pytest.mark.parametrize("seed", range(30))
+def test_first_reveal_opens_a_safe_area(first_click, seed):
+    board = Board((16, 16), 60, random.Random(seed), first_click=first_click)
+    rng = random.Random(seed)
+    col, row = rng.randrange(board.cols), rng.randrange(board.rows)
+
+    assert board.reveal_click((col, row))
+
+    assert board.bombs.count(1) == 60
+    assert board.neighbors == count_all_neighbors(board.bombs, board.cols, board.rows)
+    assert board.num_neighbors((col, row)) == 0
+
+
+@pytest.mark.parametrize("first_click", [FirstClickMode.DEFER, FirstClickMode.RELOCATE])
+def test_first_reveal_on_a_crowded_board_only_keeps_the_cell_clear(first_click):
+    board = Board((5, 5), 20, random.Random(3), first_click=first_click)
+
+    assert board.reveal_click((2, 2))
+
+    assert board.bombs.count(1) == 20
+    assert not board.has_bomb((2, 2))
@@ -0,0 +1,43 @@
+import time
+import random
+import multiprocessing
+from board_builder import BoardBuilder
+
+
+def test_worker_builds_the_same_board_as_the_job_thread():
+    builder = BoardBuilder((30, 16), 99)
+    try:
+        board, _ = builder.build_in_worker(5).result()
+    finally:
+        builder.close()
+
+    expected, _ = builder.build(random.Random(5)).result()
+    assert board.bombs == expected.bombs
+
+
+def test_worker_searches_the_same_no_guess_board_as_the_job_thread():
+    builder = BoardBuilder((9, 9), 10, no_guess=True)
+    try:
+        board, board_seed = builder.build_in_worker(5).result()
+    finally:
+        builder.close()
+
+    expected, expected_seed = builder.build(random.Random(5)).result()
+    assert board_seed == expected_seed
+    assert board.bombs == expected.bombs
+
+
+def test_close_terminates_the_worker_in_the_middle_of_a_board(screen):
+    # The worker is forked after pygame is started, as in the game, where pygame handles SIGTERM itself. No board
+    # this crowded can be solved without guessing, so the search would go on for seconds
+    builder = BoardBuilder((30, 16), 200, no_guess=True)
+    job = builder.build_in_worker(1)
+    time.sleep(0.2)
+    assert multiprocessing.active_children()
+
+    closed_at = time.perf_counter()
+    builder.close()
+
+    assert time.perf_counter() - closed_at < 1
+    assert not multiprocessing.active_children()
+    assert not job.done()
@@ -0,0 +1,109 @@
+import random
+import pytest
+import board
+import board_save
+from board import Board, FirstClickMode
+from board_save import save_board, load_board, read_header
+
+SAVED_STATE = (
+    "grid_size",
+    "bombs",
+    "revealed",
+    "flags",
+    "neighbors",
+    "tile_types",
+    "remaining_tiles_to_reveal",
+    "flags_remaining",
+    "game_was_won",
+    "game_was_lost",
+)
+
+
+def played_board(seed: int) -> Board:
+    rng = random.Random(seed)
+    grid_size = (rng.randint(1, 40), rng.randint(1, 40))
+    num_of_bombs = rng.randint(0, grid_size[0] * grid_size[1] // 3)
+    played = Board(grid_size, num_of_bombs, random.Random(seed))
+
+    for _ in range(rng.randint(0, 30)):
+        if played.game_was_won or played.game_was_lost:
+            break
+        col_row = (rng.randrange(played.cols), rng.randrange(played.rows))
+        if rng.random() < 0.4:
+            played.flag_click(col_row)
+        else:
+            played.reveal_click(col_row)
+
+    return played
+
+
+def assert_same_state(loaded: Board, saved: Board):
+    for name in SAVED_STATE:
+        assert getattr(loaded, name) == getattr(saved, name), name
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_save_round_trip(tmp_path, seed):
+    path = tmp_path / "board.bfs"
+    saved = played_board(seed)
+
+    save_board(path, saved, seed)
+    loaded, loaded_seed = load_board(path)
+
+    assert loaded_seed == seed
+    assert_same_state(loaded, saved)
+
+    # Both boards carry on playing the same
+    rng = random.Random(seed + 1)
+    for _ in range(20):
+        col_row = (rng.randrange(saved.cols), rng.randrange(saved.rows))
+        assert loaded.reveal_click(col_row) == saved.reveal_click(col_row)
+        assert_same_state(loaded, saved)
+
+
+def test_save_round_trip_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(board_save, "UNPACK_CHUNK_BYTES", 3)
+    monkeypatch.setattr(board, "RESTORE_CHUNK_CELLS", 7)
+    path = tmp_path / "board.bfs"
+
+    for seed in range(20):
+        saved = played_board(seed)
+        save_board(path, saved, seed)
+        loaded, _ = load_board(path)
+        assert_same_state(loaded, saved)
+
+
+def test_save_keeps_a_pending_safe_first_click(tmp_path):
+    path = tmp_path / "board.bfs"
+    saved = Board((20, 20), 150, random.Random(3), first_click=FirstClickMode.RELOCATE)
+
+    save_board(path, saved, 3)
+    assert read_header(path)["first_click"] == FirstClickMode.RELOCATE
+    loaded, _ = load_board(path)
+
+    assert loaded.pending_first_click == FirstClickMode.RELOCATE
+    for index in range(saved.num_cells):
+        assert loaded.reveal_click(loaded.col_row(index))
+        loaded, _ = load_board(path)
+
+
+def test_load_rejects_a_truncated_save(tmp_path):
+    path = tmp_path / "board.bfs"
+    save_board(path, played_board(1), 1)
+    path.write_bytes(path.read_bytes()[:-1])
+
+    with pytest.raises(ValueError):
+        load_board(path)
+
+
+def test_read_header_without_the_cells(tmp_path):
+    path = tmp_path / "board.bfs"
+    saved = played_board(2)
+    save_board(path, saved, 2)
+
+    header = read_header(path)
+
+    assert header["grid_size"] == saved.grid_size
+    assert header["seed"] == 2
+    assert header["num_of_bombs"] == saved.bombs.count(1)
+    assert header["game_was_lost"] == saved.game_was_lost
@@ -0,0 +1,122 @@
+import random
+import asyncio
+from board import Action, Board
+from board_server import (
+    BoardClient,
+    BoardServer,
+    MAX_RUN_LENGTH,
+    encode_delta,
+    encode_snapshot,
+    load_test,
+)
+
+
+async def decode(messages: list[bytes]) -> BoardClient:
+    """
+    Apply messages to a client, as if the server had sent them.
+    """
+
+    reader = asyncio.StreamReader()
+    for message in messages:
+        reader.feed_data(message)
+    client = BoardClient(reader, None)
+    for _ in messages:
+        await client.receive()
+
+    return client
+
+
+def test_snapshot_then_deltas_match_the_board():
+    board = Board((60, 40), 300, random.Random(4))
+    messages = [encode_snapshot(board, 0)]
+    rng = random.Random(5)
+
+    sequence = 0
+    for _ in range(200):
+        col_row = (rng.randrange(board.cols), rng.randrange(board.rows))
+        board.apply(Action.FLAG if rng.random() < 0.3 else Action.REVEAL, col_row)
+        if board.last_changed:
+            sequence += 1
+            messages.append(encode_delta(board, sequence, board.last_changed))
+
+    client = asyncio.run(decode(messages))
+
+    assert client.sequence == sequence
+    assert (client.cols, client.rows, client.num_of_bombs) == (60, 40, 300)
+    assert client.tile_types == board.tile_types
+    assert client.flags_remaining == board.flags_remaining
+
+
+def test_delta_splits_runs_longer_than_a_run_can_hold():
+    board = Board((400, 400), 0, random.Random(1))
+    snapshot = encode_snapshot(board, 0)
+
+    board.reveal_click((0, 0))
+    delta = encode_delta(board, 1, board.last_changed)
+
+    assert board.num_cells > MAX_RUN_LENGTH
+    client = asyncio.run(decode([snapshot, delta]))
+    assert client.tile_types == board.tile_types
+    assert client.game_state == 1
+
+
+def test_clients_over_localhost_end_on_the_server_board():
+    rng = random.Random(6)
+
+    async def run() -> dict:
+        server = BoardServer(
+            Board((50, 50), 300, rng),
+            client_queue_size=1024,
+            new_board=lambda: Board((50, 50), 300, rng),
+        )
+        await server.start(port=0)
+        try:
+            return await load_test(
+                server, num_clients=20, num_players=4, num_actions=50
+            )
+        finally:
+            await server.close()
+
+    result = asyncio.run(run())
+
+    assert result["matching"] == result["clients"]
+    # Players only pick safe cells, so most actions change the board, and every client is sent each change
+    assert result["deltas"] >= result["actions"] // 2
+    assert result["min_client_deltas"] >= result["deltas"] // 2
+
+
+def test_new_game_sends_every_client_a_snapshot():
+    rng = random.Random(7)
+
+    async def run() -> tuple[BoardServer, list[BoardClient]]:
+        server = BoardServer(
+            Board((20, 20), 40, rng), new_board=lambda: Board((20, 20), 40, rng)
+        )
+        await server.start(port=0)
+        try:
+            clients = [await BoardClient.connect(port=server.port) for _ in range(3)]
+            await clients[0].send(Action.FLAG, (1, 1))
+            for client in clients:
+                await client.receive()
+            assert all(client.flags_remaining == 39 for client in clients)
+
+            old_board = server.board
+            await clients[1].new_game()
+            for client in clients:
+                await client.receive()
+
+            assert server.board is not old_board
+            for client in clients:
+                await client.close()
+            return server, clients
+        finally:
+            await server.close()
+
+    server, clients = asyncio.run(run())
+
+    assert server.games_started == 2
+    for client in clients:
+        assert client.snapshots_received == 2
+        assert client.sequence == server.sequence
+        assert client.tile_types == server.board.tile_types
+        assert client.flags_remaining == 40
@@ -0,0 +1,20 @@
+from endless_board import CHUNK_SIZE, MAX_COLD_CHUNKS, EndlessBoard
+
+
+def test_chunk_with_a_revealed_bomb_is_never_evicted():
+    board = EndlessBoard(1, 0.2)
+    bomb = next(
+        (col, row)
+        for row in range(CHUNK_SIZE)
+        for col in range(CHUNK_SIZE)
+        if board.has_bomb((col, row))
+    )
+
+    assert not board.reveal_click(bomb)
+    assert board.flags_remaining == board.bombs_per_chunk
+
+    # Querying more chunks than are kept untouched evicts every chunk that can be created again
+    for chunk_col in range(1, MAX_COLD_CHUNKS + 2):
+        board.has_bomb((chunk_col * CHUNK_SIZE, 0))
+
+    assert board.was_revealed(bomb)
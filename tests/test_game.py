@@ -0,0 +1,129 @@
+import random
+import pytest
+import pygame as pg
+from board import Board
+from board_save import save_board
+from font_loader import LazyFont
+from game import Game
+from grid import Grid
+
+# Frames played before the window is closed, if the game has not gone idle by then
+MAX_FRAMES = 30
+
+
+class ScriptedInput:
+    """
+    Stands in for the mouse and event queue, giving the game the events and mouse state of each frame in turn.
+    Once the script has run out, the game is closed the next time it waits for an event.
+    """
+
+    def __init__(
+        self, frames: list[tuple[tuple[int, int], bool, list[pg.event.Event]]]
+    ):
+        self.frames = frames
+        self.frame = -1
+        self.num_waits = 0
+
+    def get(self) -> list[pg.event.Event]:
+        self.frame += 1
+        if self.frame >= MAX_FRAMES:
+            return [pg.event.Event(pg.QUIT)]
+        if self.frame < len(self.frames):
+            return list(self.frames[self.frame][2])
+        return []
+
+    def wait(self, timeout: int = 0) -> pg.event.Event:
+        self.num_waits += 1
+        return pg.event.Event(pg.QUIT)
+
+    def get_pos(self) -> tuple[int, int]:
+        return self.frames[min(self.frame + 1, len(self.frames) - 1)][0]
+
+    def get_pressed(self, num_buttons: int = 3) -> tuple[bool, bool, bool]:
+        return (self.frames[min(self.frame + 1, len(self.frames) - 1)][1], False, False)
+
+
+@pytest.fixture
+def game(screen, tileset) -> Game:
+    board = Board((5, 5), 0, random.Random(1))
+    return Game(
+        tileset,
+        tileset.tile_render_size,
+        screen,
+        0,
+        random.Random(1),
+        LazyFont("", 30),
+        (5, 5),
+        idle_mode=True,
+        board=board,
+    )
+
+
+def play(game: Game, script: ScriptedInput, monkeypatch) -> list:
+    """
+    Play the game with scripted input, returning the tile shown as pressed on each frame.
+    """
+
+    shown_pressed_tiles = []
+    set_pressed_tile = Grid.set_pressed_tile
+
+    def record_pressed_tile(grid, col_row):
+        shown_pressed_tiles.append(col_row)
+        set_pressed_tile(grid, col_row)
+
+    monkeypatch.setattr(Grid, "set_pressed_tile", record_pressed_tile)
+    monkeypatch.setattr(pg.event, "get", script.get)
+    monkeypatch.setattr(pg.event, "wait", script.wait)
+    monkeypatch.setattr(pg.mouse, "get_pos", script.get_pos)
+    monkeypatch.setattr(pg.mouse, "get_pressed", script.get_pressed)
+    game.start_game(pg.time.Clock(), 1000)
+    return shown_pressed_tiles
+
+
+def test_release_outside_the_grid_clears_the_pressed_tile(game, monkeypatch):
+    inside, outside = (10, 10), (700, 700)
+    script = ScriptedInput(
+        [
+            (inside, True, [pg.event.Event(pg.MOUSEBUTTONDOWN, button=1)]),
+            (outside, True, []),
+            (outside, False, [pg.event.Event(pg.MOUSEBUTTONUP, button=1)]),
+            (inside, False, []),
+        ]
+    )
+
+    shown_pressed_tiles = play(game, script, monkeypatch)
+
+    assert shown_pressed_tiles[0] == (0, 0)
+    assert shown_pressed_tiles[-1] is None
+    # Nothing is pressed once the button is let go, so the game goes idle
+    assert script.num_waits == 1
+    assert not game.board.revealed.count(1)
+
+
+def test_a_save_is_loaded_behind_the_loading_screen(
+    screen, tileset, tmp_path, monkeypatch
+):
+    path = tmp_path / "board.bfs"
+    saved = Board((30, 20), 60, random.Random(2))
+    saved.reveal_click((0, 0))
+    save_board(path, saved, 2)
+    game = Game(
+        tileset,
+        tileset.tile_render_size,
+        screen,
+        60,
+        random.Random(1),
+        LazyFont("", 30),
+        (30, 20),
+        idle_mode=True,
+        save_path=str(path),
+    )
+    assert game.board is None
+
+    # The game is closed once it goes idle on the loaded board
+    script = ScriptedInput([((0, 0), False, [])])
+    play(game, script, monkeypatch)
+
+    assert script.num_waits == 1
+
+    assert game.board.tile_types == saved.tile_types
@@ -0,0 +1,69 @@
+import random
+import pytest
+import pygame as pg
+from board import Board
+from camera import Camera
+from font_loader import LazyFont
+from grid import Grid
+from tile_type import TileType
+
+
+def make_grid(tileset, screen: pg.Surface, board: Board, **kwargs) -> Grid:
+    return Grid(
+        tileset,
+        tileset.tile_render_size,
+        screen,
+        board.bombs.count(1),
+        random.Random(1),
+        LazyFont("", 30),
+        board.grid_size,
+        (0, 0),
+        board=board,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("no_op_click", ["reveal", "flag"])
+def test_clicks_that_change_nothing_keep_the_redo(tileset, screen, no_op_click):
+    board = Board((10, 10), 10, random.Random(3))
+    grid = make_grid(tileset, screen, board)
+    empty = board.col_row(board.neighbors.index(0))
+    number = next(
+        board.col_row(index)
+        for index in range(board.num_cells)
+        if board.neighbors[index] and not board.bombs[index]
+    )
+    grid.reveal_click(number)
+    grid.reveal_click(empty)
+    tile_types = bytes(board.tile_types)
+
+    assert grid.undo()
+    assert grid.history.can_redo
+
+    # Revealing or flagging a revealed tile changes nothing
+    if no_op_click == "reveal":
+        grid.reveal_click(number)
+    else:
+        grid.flag_click(number)
+
+    assert grid.history.can_redo
+    assert grid.redo()
+    assert board.tile_types == tile_types
+
+
+def test_pressing_a_tile_out_of_view_creates_no_sprite(tileset, screen):
+    board = Board((100, 100), 0, random.Random(1))
+    grid = make_grid(tileset, screen, board)
+    camera = Camera(screen.get_size(), grid.world_rect())
+    grid.draw(screen, camera)
+    num_sprites = len(grid.all_tiles)
+
+    grid.set_pressed_tile((90, 90))
+
+    assert len(grid.all_tiles) == num_sprites
+
+    # Once the camera reaches the pressed tile, its sprite is shown pressed
+    camera.pan(grid.world_rect().size)
+    grid.draw(screen, camera)
+    pressed_tile = tileset.get_tile(TileType.CLICKED_EMPTY)
+    assert sum(tile.image is pressed_tile for tile in grid.all_tiles) == 1
@@ -0,0 +1,102 @@
+import random
+import pytest
+from board import Action, Board, FirstClickMode
+from history import History
+
+
+def board_state(board: Board) -> tuple:
+    return (
+        bytes(board.revealed),
+        bytes(board.flags),
+        bytes(board.tile_types),
+        board.remaining_tiles_to_reveal,
+        board.flags_remaining,
+        board.game_was_won,
+        board.game_was_lost,
+    )
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_undo_and_redo_round_trip(seed):
+    rng = random.Random(seed)
+    grid_size = (rng.randint(1, 30), rng.randint(1, 30))
+    num_of_bombs = rng.randint(0, grid_size[0] * grid_size[1] // 5)
+    board = Board(
+        grid_size,
+        num_of_bombs,
+        random.Random(seed),
+        first_click=FirstClickMode.RELOCATE,
+    )
+    history = History(board)
+
+    # The state after each action still done, and the state each undone action led to
+    states = [board_state(board)]
+    undone_states = []
+    for _ in range(60):
+        choice = rng.random()
+        if choice < 0.2 and history.can_undo:
+            history.undo()
+            undone_states.append(states.pop())
+            assert board_state(board) == states[-1]
+        elif choice < 0.3 and history.can_redo:
+            history.redo()
+            states.append(undone_states.pop())
+            assert board_state(board) == states[-1]
+        elif not (board.game_was_won or board.game_was_lost):
+            col_row = (rng.randrange(board.cols), rng.randrange(board.rows))
+            action = Action.FLAG if rng.random() < 0.35 else Action.REVEAL
+            board.apply(action, col_row)
+            if board.last_changed:
+                history.record(action, col_row)
+                states.append(board_state(board))
+                undone_states.clear()
+
+    while history.can_undo:
+        history.undo()
+        states.pop()
+        assert board_state(board) == states[-1]
+
+
+def test_history_drops_the_oldest_actions_past_its_size():
+    board = Board((30, 30), 0, random.Random(1))
+    history = History(board, max_bytes=2000)
+
+    for index in range(board.num_cells):
+        board.flag_click(board.col_row(index))
+        history.record(Action.FLAG, board.col_row(index))
+
+    assert history.num_bytes <= 2000
+    num_undone = 0
+    while history.undo():
+        num_undone += 1
+    assert 0 < num_undone < board.num_cells
+
+
+def test_undo_puts_back_the_flags_a_flood_removed():
+    board = Board((20, 20), 0, random.Random(1))
+    history = History(board)
+    for col_row in [(3, 3), (4, 3), (5, 3)]:
+        board.flag_click(col_row)
+        history.record(Action.FLAG, col_row)
+    board.flag_click((4, 3))
+    history.record(Action.FLAG, (4, 3))
+    flags, flags_remaining = bytes(board.flags), board.flags_remaining
+
+    board.reveal_click((0, 0))
+    history.record(Action.REVEAL, (0, 0))
+    assert board.flags.count(0) == board.num_cells
+
+    history.undo()
+
+    assert board.flags == flags
+    assert board.flags_remaining == flags_remaining
+
+
+def test_history_size_follows_the_cells_changed_not_the_board():
+    board = Board((1000, 1000), 0, random.Random(1))
+    history = History(board)
+
+    board.flag_click((0, 0))
+    history.record(Action.FLAG, (0, 0))
+
+    assert history.num_bytes < 1000
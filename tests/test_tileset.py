@@ -0,0 +1,28 @@
+import pytest
+from conftest import TILE_PATH, TILE_SIZE
+from tileset import Tileset
+from tile_type import TileType
+
+
+@pytest.mark.parametrize("scale", [1.5, 2.0, 2.75])
+def test_tiles_start_at_any_scale(screen, scale):
+    tileset = Tileset(TILE_PATH, TILE_SIZE, scale)
+    whole_scale = Tileset(TILE_PATH, TILE_SIZE, 1)
+
+    size = (round(TILE_SIZE[0] * scale), round(TILE_SIZE[1] * scale))
+    assert tileset.tile_render_size == size
+    assert len(tileset.get_tiles()) == len(whole_scale.get_tiles())
+    assert all(tile.get_size() == size for tile in tileset.get_tiles())
+
+
+def test_starting_at_a_scale_matches_zooming_to_it(screen):
+    started = Tileset(TILE_PATH, TILE_SIZE, 1.5)
+    zoomed = Tileset(TILE_PATH, TILE_SIZE, 1)
+    zoomed.set_scale(1.5)
+
+    for tile_type in TileType:
+        started_tile = started.get_tile(tile_type)
+        zoomed_tile = zoomed.get_tile(tile_type)
+        assert [started_tile.get_at((x, y)) for x in range(24) for y in range(24)] == [
+            zoomed_tile.get_at((x, y)) for x in range(24) for y in range(24)
+        ]
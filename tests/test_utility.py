@@ -0,0 +1,21 @@
+import random
+import pytest
+from utility import calculate_neighbors, count_all_neighbors
+
+
+@pytest.mark.parametrize(
+    "grid_size", [(1, 1), (1, 7), (7, 1), (2, 2), (8, 5), (31, 17), (64, 64)]
+)
+@pytest.mark.parametrize("density", [0.0, 0.2, 0.6, 1.0])
+def test_count_all_neighbors_matches_calculate_neighbors(grid_size, density):
+    cols, rows = grid_size
+    rng = random.Random(cols * 1000 + rows)
+    bombs = bytearray(rng.random() < density for _ in range(cols * rows))
+
+    neighbors = count_all_neighbors(bombs, cols, rows)
+
+    assert neighbors == bytearray(
+        calculate_neighbors((col, row), cols, rows, bombs)
+        for row in range(rows)
+        for col in range(cols)
+    )